@@ -312,7 +312,7 @@ db.createCollection(
 
 db.alcohols.createIndex({barcode: 1})
 
-db.alcohols.createIndex({name: 1})
+db.alcohols.createIndex({name: 1, _id: 1})
 db.alcohols.createIndex({kind: 1})
 db.alcohols.createIndex({type: 1})
 db.alcohols.createIndex({color: 1})
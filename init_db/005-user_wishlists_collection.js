@@ -27,6 +27,7 @@ db.createCollection(
 )
 
 db.user_wishlist.createIndex({user_id: 1})
+db.user_wishlist.createIndex({alcohols: 1})
 
 db.user_wishlist.insertMany(
     [
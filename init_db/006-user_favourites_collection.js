@@ -27,6 +27,7 @@ db.createCollection(
 )
 
 db.user_favourites.createIndex({user_id: 1})
+db.user_favourites.createIndex({alcohols: 1})
 
 db.user_favourites.insertMany(
     [
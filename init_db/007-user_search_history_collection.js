@@ -36,6 +36,7 @@ db.createCollection(
 )
 
 db.user_search_history.createIndex({user_id: 1})
+db.user_search_history.createIndex({'alcohols.alcohol_id': 1})
 
 db.user_search_history.insertMany(
     [
@@ -43,14 +44,14 @@ db.user_search_history.insertMany(
             _id: ObjectId('6288e2fdd5ab6070dde8db8b'),
             user_id: ObjectId('6288e2fdd5ab6070dde8db8b'),
             alcohols: [
-                {
-                    alcohol_id: ObjectId('6288e32dd5ab6070dde8db8a'),
-                    search_date: new ISODate('2022-03-21T19:13:25Z')
-                },
                 {
                     alcohol_id: ObjectId('6288e32dd5ab6070dde8db8b'),
                     search_date: new ISODate('2022-07-25T19:13:25Z')
                 },
+                {
+                    alcohol_id: ObjectId('6288e32dd5ab6070dde8db8a'),
+                    search_date: new ISODate('2022-03-21T19:13:25Z')
+                },
                 {
                     alcohol_id: ObjectId('6288e32dd5ab6070dde8db8c'),
                     search_date: new ISODate('2022-02-21T19:13:25Z')
@@ -61,13 +62,13 @@ db.user_search_history.insertMany(
             _id: ObjectId('6288e2fdd5ab6070dde8db8c'),
             user_id: ObjectId('6288e2fdd5ab6070dde8db8c'),
             alcohols: [
-                {
-                    alcohol_id: ObjectId('6288e32dd5ab6070dde8db8a'),
-                    search_date: new ISODate('2022-04-25T19:13:25Z')
-                },
                 {
                     alcohol_id: ObjectId('6288e32dd5ab6070dde8db8b'),
                     search_date: new ISODate('2022-07-21T19:13:25Z')
+                },
+                {
+                    alcohol_id: ObjectId('6288e32dd5ab6070dde8db8a'),
+                    search_date: new ISODate('2022-04-25T19:13:25Z')
                 }]
         },
         {
@@ -31,6 +31,7 @@ db.createCollection(
 )
 
 db.user_tags.createIndex({user_id: 1})
+db.user_tags.createIndex({alcohols: 1})
 
 db.user_tags.insertMany(
     [
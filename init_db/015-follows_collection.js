@@ -0,0 +1,62 @@
+let follow_edge = {
+    $jsonSchema: {
+        bsonType: 'object',
+        required: ['follower_id', 'followee_id'],
+        properties: {
+            follower_id: {
+                bsonType: 'objectId',
+                description: 'must be an objectId'
+            },
+            followee_id: {
+                bsonType: 'objectId',
+                description: 'must be an objectId'
+            }
+        }
+    }
+}
+
+
+db.createCollection(
+    'follows',
+    {
+        validator: follow_edge
+    }
+)
+
+
+db.follows.createIndex({follower_id: 1, followee_id: 1}, {unique: true})
+db.follows.createIndex({followee_id: 1, follower_id: 1})
+
+
+db.follows.insertMany(
+    [
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8b'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8c')
+        },
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8b'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8d')
+        },
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8c'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8b')
+        },
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8c'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8d')
+        },
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8d'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8b')
+        },
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8d'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8c')
+        },
+        {
+            follower_id: ObjectId('6288e2fdd5ab6070dde8db8e'),
+            followee_id: ObjectId('6288e2fdd5ab6070dde8db8b')
+        }
+    ]
+)
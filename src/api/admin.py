@@ -1,31 +1,38 @@
-import cloudinary
-import cloudinary.api
-import cloudinary.uploader
 from datetime import datetime
-from pymongo.database import Database
 from pymongo.errors import OperationFailure
 from src.domain.review import ReportedReview
-from src.domain.alcohol import PaginatedAlcohol
+from src.domain.common import CursorPageInfo
 from src.domain.common.page_info import PageInfo
 from src.domain.banned_review import BannedReview
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from src.domain.alcohol_filter import AlcoholFilters
 from src.domain.banned_review.review_ban import ReviewBan
 from src.domain.alcohol_suggestion import AlcoholSuggestion
 from src.infrastructure.common.file_utils import image_size
+from src.infrastructure.auth.user_cache import user_cache
 from src.infrastructure.auth.auth_utils import get_valid_user
 from src.infrastructure.database.database_config import get_db
+from src.infrastructure.alcohol.facet_index import facet_index
 from src.infrastructure.auth.auth_utils import admin_permission
 from src.domain.user import UserAdminInfo, PaginatedUserAdminInfo
+from src.infrastructure.images.image_resizer import image_formats
 from src.infrastructure.database.models.user import User as UserDb
+from src.infrastructure.alcohol.category_cache import category_cache
 from src.domain.alcohol import AlcoholCreate, Alcohol, AlcoholUpdate
+from src.domain.alcohol import PaginatedAlcohol, CursorPaginatedAlcohol
 from src.infrastructure.database.models.user import UserDatabaseHandler
+from src.infrastructure.alcohol.filters_snapshot import filters_snapshot
+from src.infrastructure.search.local_search_index import local_search_index
 from src.infrastructure.common.validate_object_id import validate_object_id
 from src.infrastructure.database.models.review import ReviewDatabaseHandler
 from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+from src.infrastructure.database.models.user_tag import UserTagDatabaseHandler
 from src.domain.review.paginated_reported_review import PaginatedReportedReview
+from src.infrastructure.images.image_storage import ImageStorage, image_storage
 from src.domain.reported_errors import ReportedError, PaginatedReportedErrorInfo
 from src.infrastructure.exceptions.users_exceptions import UserNotFoundException
 from src.infrastructure.alcohol.alcohol_mappers import map_alcohols, map_alcohol
+from src.infrastructure.search.search_backend import SearchBackend, search_backend
 from src.domain.banned_review.paginated_banned_review import PaginatedBannedReview
 from src.infrastructure.config.app_config import get_settings, ApplicationSettings
 from src.infrastructure.exceptions.review_exceptions import ReviewNotFoundException
@@ -35,15 +42,21 @@ from src.infrastructure.database.models.reported_error import ReportedErrorDatab
 from src.infrastructure.database.models.alcohol_filter import AlcoholFilterDatabaseHandler
 from src.infrastructure.database.models.alcohol_category import AlcoholCategoryDatabaseHandler
 from src.infrastructure.database.models.alcohol_category.mappers import map_to_alcohol_category
+from src.infrastructure.images.alcohol_images import read_source_image, store_alcohol_images, \
+    delete_alcohol_images
+from fastapi import APIRouter, Depends, status, HTTPException, Response, UploadFile, Body, Query
 from src.domain.alcohol_suggestion.paginated_alcohol_suggestion import PaginatedAlcoholSuggestion
 from src.infrastructure.exceptions.reported_error_exceptions import ReportedErrorNotFoundException
 from src.infrastructure.exceptions.alcohol_suggestion_exception import SuggestionNotFoundException
-from fastapi import APIRouter, Depends, status, HTTPException, Response, File, UploadFile, Body, Query
+from src.infrastructure.database.models.user_list.wishlist_database_handler import UserWishlistHandler
+from src.infrastructure.database.models.user_list.favourites_database_handler import UserFavouritesHandler
 from src.domain.alcohol_category import AlcoholCategory, AlcoholCategoryUpdate, PaginatedAlcoholCategories
+from src.infrastructure.database.models.user_list.search_history_database_handler import SearchHistoryHandler
+from src.infrastructure.database.models.alcohol.alcohol_image_database_handler import AlcoholImageDatabaseHandler
 from src.infrastructure.exceptions.alcohol_categories_exceptions import AlcoholCategoryExistsException, \
     AlcoholCategoryNotFoundException, PropertiesAlreadyExistException, PropertiesNotExistException
 from src.infrastructure.exceptions.alcohol_exceptions import AlcoholExistsException, WrongFileTypeException, \
-    FileTooBigException
+    FileTooBigException, MissingImageException
 from src.infrastructure.database.models.alcohol_suggestion.alcohol_suggestion_database_handler import \
     AlcoholSuggestionDatabaseHandler
 
@@ -61,7 +74,7 @@ async def search_users(
         limit: int = 10,
         offset: int = 0,
         username: str = '',
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Search for users with pagination by optional username
@@ -87,7 +100,7 @@ async def search_users(
 )
 async def get_user(
         user_id: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Read user information
@@ -108,7 +121,7 @@ async def get_user(
 async def ban_user(
         user_id: str,
         to_ban: bool = True,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Ban user by id.
@@ -119,6 +132,7 @@ async def ban_user(
         await UserDatabaseHandler.ban_user(db.users, user_id)
     else:
         await UserDatabaseHandler.unban_user(db.users, user_id)
+    user_cache.invalidate_user_id(user_id)
 
 
 @router.get(
@@ -128,7 +142,7 @@ async def ban_user(
     summary='Read full reported error information',
     response_model_by_alias=False
 )
-async def get_error(error_id: str, db: Database = Depends(get_db)):
+async def get_error(error_id: str, db: AsyncIOMotorDatabase = Depends(get_db)):
     """
     Read reported error by id
     """
@@ -150,7 +164,7 @@ async def get_errors(
         limit: int = 10,
         offset: int = 0,
         user_id: str = None,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedReportedErrorInfo:
     """
     Search reported errors with pagination.
@@ -180,7 +194,7 @@ async def get_errors(
 )
 async def delete_error(
         error_id: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete reported error by reported error id
@@ -197,8 +211,9 @@ async def delete_error(
 )
 async def delete_alcohol(
         alcohol_id: str,
-        db: Database = Depends(get_db),
-        settings: ApplicationSettings = Depends(get_settings)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings),
+        storage: ImageStorage = Depends(image_storage)
 ) -> None:
     """
     Delete alcohol by id
@@ -206,10 +221,22 @@ async def delete_alcohol(
     alcohol_id = validate_object_id(alcohol_id)
     alcohol = await AlcoholDatabaseHandler.get_alcohol_by_id(db.alcohols, alcohol_id)
     await AlcoholDatabaseHandler.delete_alcohol(db.alcohols, alcohol_id)
-    image_name = alcohol['_id']
-    image_path = f'{settings.ALCOHOL_IMAGES_DIR}/{image_name}'
-    cloudinary.uploader.destroy(f'{image_path}_md', invalidate=True)
-    cloudinary.uploader.destroy(f'{image_path}_sm', invalidate=True)
+    user_ids = await UserWishlistHandler.delete_alcohol_from_all_wishlists(db.user_wishlist, alcohol_id)
+    await UserDatabaseHandler.remove_from_wishlist_counters(db.users, user_ids)
+    user_ids = await UserFavouritesHandler.delete_alcohol_from_all_favourites(db.user_favourites, alcohol_id)
+    await UserDatabaseHandler.remove_from_favourite_counters(db.users, user_ids)
+    await UserTagDatabaseHandler.remove_alcohol_from_all_tags(db.user_tags, alcohol_id)
+    await SearchHistoryHandler.delete_alcohol_from_all_search_histories(db.user_search_history, alcohol_id)
+    filters_snapshot.invalidate()
+    facet_index.remove_alcohol(alcohol)
+    local_search_index.remove_alcohol(alcohol)
+    await delete_alcohol_images(
+        db.alcohol_images,
+        storage,
+        alcohol['_id'],
+        settings.ALCOHOL_IMAGES_DIR,
+        image_formats(settings.ALCOHOL_IMAGE_FORMATS)
+    )
 
 
 @router.put(
@@ -222,13 +249,16 @@ async def delete_alcohol(
 async def update_alcohol(
         alcohol_id: str,
         payload: AlcoholUpdate = Body(...),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings),
+        storage: ImageStorage = Depends(image_storage),
+        image: UploadFile | None = None,
         sm: UploadFile | None = None,
         md: UploadFile | None = None
 ):
     """
-    Update alcohol by id
+    Update alcohol by id. A single `image` is resized to the sm and md variants,
+    pre-sized `sm` and `md` images are still accepted instead.
     """
     alcohol_id = validate_object_id(alcohol_id)
     if (
@@ -240,6 +270,7 @@ async def update_alcohol(
     if alcohol := await AlcoholDatabaseHandler.get_alcohol_by_name(db.alcohols, payload.name):
         if not alcohol['_id'] == alcohol_id:
             raise AlcoholExistsException()
+    previous_alcohol = await AlcoholDatabaseHandler.get_alcohol_by_id(db.alcohols, alcohol_id)
     db_alcohol = await AlcoholDatabaseHandler.update_alcohol(db.alcohols, alcohol_id, payload)
     await AlcoholFilterDatabaseHandler.update_filters(
         db.alcohol_filters,
@@ -251,33 +282,41 @@ async def update_alcohol(
         db_alcohol['taste'],
         db_alcohol['aroma']
     )
+    filters_snapshot.add_alcohol(db_alcohol)
+    facet_index.remove_alcohol(previous_alcohol)
+    facet_index.add_alcohol(db_alcohol)
+    local_search_index.add_alcohol(db_alcohol)
 
-    if sm and md:
+    if image:
+        source = await read_source_image(image)
+        try:
+            await store_alcohol_images(
+                db.alcohol_images,
+                storage,
+                alcohol_id,
+                settings.ALCOHOL_IMAGES_DIR,
+                source,
+                image_formats(settings.ALCOHOL_IMAGE_FORMATS),
+                overwrite=True
+            )
+        except HTTPException:
+            raise
+        except Exception as error:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+    elif sm and md:
         if sm.content_type not in ['image/png', 'image/jpeg'] or md.content_type not in ['image/png', 'image/jpeg']:
             raise WrongFileTypeException()
         try:
-            sm_name = f'{alcohol_id}_sm'
-            md_name = f'{alcohol_id}_md'
-            cloudinary.uploader.upload(
-                sm.file,
-                folder=settings.ALCOHOL_IMAGES_DIR,
-                public_id=sm_name,
-                resource_type='image',
-                overwrite=True,
-                invalidate=True
-            )
-            cloudinary.uploader.upload(
-                md.file,
+            await storage.upload_many(
+                {f'{alcohol_id}_sm': sm.file, f'{alcohol_id}_md': md.file},
                 folder=settings.ALCOHOL_IMAGES_DIR,
-                public_id=md_name,
-                resource_type='image',
-                overwrite=True,
-                invalidate=True
+                overwrite=True
             )
         except Exception as error:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
+        await AlcoholImageDatabaseHandler.delete_digests(db.alcohol_images, alcohol_id)
 
-    return map_alcohol(db_alcohol, db.alcohol_categories)
+    return await map_alcohol(db_alcohol, db.alcohol_categories)
 
 
 @router.post(
@@ -289,13 +328,16 @@ async def update_alcohol(
 async def create_alcohol(
         payload: AlcoholCreate = Body(...),
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db),
-        sm: UploadFile = File(...),
-        md: UploadFile = File(...),
-        settings: ApplicationSettings = Depends(get_settings)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        image: UploadFile | None = None,
+        sm: UploadFile | None = None,
+        md: UploadFile | None = None,
+        settings: ApplicationSettings = Depends(get_settings),
+        storage: ImageStorage = Depends(image_storage)
 ):
     """
-    Create alcohol
+    Create alcohol. A single `image` is resized to the sm and md variants,
+    pre-sized `sm` and `md` images are still accepted instead.
     """
     if (
             await AlcoholDatabaseHandler.get_alcohol_by_barcode(db.alcohols, payload.barcode)
@@ -308,7 +350,11 @@ async def create_alcohol(
             detail='Alcohol category does not exist. Create one first!'
         )
 
-    if sm.content_type not in ['image/png', 'image/jpeg'] or md.content_type not in ['image/png', 'image/jpeg']:
+    if image:
+        source = await read_source_image(image)
+    elif not sm or not md:
+        raise MissingImageException()
+    elif sm.content_type not in ['image/png', 'image/jpeg'] or md.content_type not in ['image/png', 'image/jpeg']:
         await AlcoholDatabaseHandler.revert_by_removal(db.alcohols, payload.name)
         raise WrongFileTypeException()
 
@@ -319,29 +365,30 @@ async def create_alcohol(
     )
 
     alcohol = await AlcoholDatabaseHandler.add_alcohol(db.alcohols, payload)
-    if image_size(sm.file) > 1000000 and image_size(md.file) > 1000000:
+    if not image and image_size(sm.file) > 1000000 and image_size(md.file) > 1000000:
         await AlcoholDatabaseHandler.revert_by_removal(db.alcohols, payload.name)
         raise FileTooBigException()
 
     try:
-        sm_name = f'{alcohol.inserted_id}_sm'
-        md_name = f'{alcohol.inserted_id}_md'
-        cloudinary.uploader.upload(
-            sm.file,
-            folder=settings.ALCOHOL_IMAGES_DIR,
-            public_id=sm_name,
-            resource_type='image',
-            overwrite=False,
-            invalidate=True
-        )
-        cloudinary.uploader.upload(
-            md.file,
-            folder=settings.ALCOHOL_IMAGES_DIR,
-            public_id=md_name,
-            resource_type='image',
-            overwrite=False,
-            invalidate=True
-        )
+        if image:
+            await store_alcohol_images(
+                db.alcohol_images,
+                storage,
+                alcohol.inserted_id,
+                settings.ALCOHOL_IMAGES_DIR,
+                source,
+                image_formats(settings.ALCOHOL_IMAGE_FORMATS),
+                overwrite=False
+            )
+        else:
+            await storage.upload_many(
+                {f'{alcohol.inserted_id}_sm': sm.file, f'{alcohol.inserted_id}_md': md.file},
+                folder=settings.ALCOHOL_IMAGES_DIR,
+                overwrite=False
+            )
+    except HTTPException:
+        await AlcoholDatabaseHandler.revert_by_removal(db.alcohols, payload.name)
+        raise
     except Exception as error:
         await AlcoholDatabaseHandler.revert_by_removal(db.alcohols, payload.name)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
@@ -356,6 +403,9 @@ async def create_alcohol(
         payload.taste,
         payload.aroma
     )
+    facet_index.add_alcohol(payload.dict())
+    local_search_index.add_alcohol(payload.dict() | {'_id': alcohol.inserted_id})
+    filters_snapshot.add_alcohol(payload.dict())
 
 
 @router.put(
@@ -368,7 +418,7 @@ async def create_alcohol(
 async def add_category_traits(
         category_id: str,
         payload: AlcoholCategoryUpdate,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     category_id = validate_object_id(category_id)
     db_category = await AlcoholCategoryDatabaseHandler.get_category_by_id(db.alcohol_categories, category_id)
@@ -381,6 +431,9 @@ async def add_category_traits(
             db.alcohol_categories, db_category, payload
         )
         await AlcoholDatabaseHandler.update_validation(db)
+        category_cache.invalidate()
+        filters_snapshot.invalidate()
+        facet_index.invalidate()
         return map_to_alcohol_category(updated_category)
     except OperationFailure as ex:
         await AlcoholCategoryDatabaseHandler.revert(db.alcohol_categories, db_category)
@@ -397,7 +450,7 @@ async def add_category_traits(
 async def remove_category_traits(
         category_id: str,
         payload: AlcoholCategoryDelete,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     category_id = validate_object_id(category_id)
     db_category = await AlcoholCategoryDatabaseHandler.get_category_by_id(db.alcohol_categories, category_id)
@@ -413,6 +466,9 @@ async def remove_category_traits(
         await AlcoholDatabaseHandler.remove_fields_for_kind(
             db.alcohols, updated_category['title'], payload.properties
         )
+        category_cache.invalidate()
+        filters_snapshot.invalidate()
+        facet_index.invalidate()
         return map_to_alcohol_category(updated_category)
     except OperationFailure as ex:
         await AlcoholCategoryDatabaseHandler.revert(db.alcohol_categories, db_category)
@@ -428,7 +484,7 @@ async def remove_category_traits(
 )
 async def add_category(
         payload: AlcoholCategoryCreate,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     if await AlcoholCategoryDatabaseHandler.check_if_category_exist(db.alcohol_categories, payload.title):
         raise AlcoholCategoryExistsException()
@@ -436,6 +492,9 @@ async def add_category(
         await AlcoholCategoryDatabaseHandler.add_category(db.alcohol_categories, payload)
         await AlcoholDatabaseHandler.update_validation(db)
         await AlcoholFilterDatabaseHandler.create_init_entry(db.alcohol_filters, payload.title)
+        category_cache.invalidate()
+        filters_snapshot.invalidate()
+        facet_index.invalidate()
     except OperationFailure as ex:
         await AlcoholCategoryDatabaseHandler.revert_by_removal(db.alcohol_categories, payload.title)
         raise ValidationErrorException(ex.args[0])
@@ -452,7 +511,7 @@ async def search_alcohol_categories_by_phrase(
         limit: int = 10,
         offset: int = 0,
         phrase: str = Query(default='', min_length=3),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
 ) -> PaginatedAlcoholCategories:
     """
        Search for categories with pagination. Query params:
@@ -477,7 +536,7 @@ async def search_alcohol_categories_by_phrase(
 
 @router.post(
     path='/alcohols/search',
-    response_model=PaginatedAlcohol,
+    response_model=PaginatedAlcohol | CursorPaginatedAlcohol,
     status_code=status.HTTP_200_OK,
     summary='Search for alcohols by phrase',
     response_model_by_alias=False,
@@ -486,17 +545,33 @@ async def search_alcohols(
         limit: int = 10,
         offset: int = 0,
         filters: AlcoholFilters | None = None,
+        cursor: str | None = Query(default=None),
         phrase: str | None = '',
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        search: SearchBackend = Depends(search_backend)
 ):
     """
     Search for alcohols with pagination. Query params:
     - **limit**: int - default 10
     - **offset**: int - default 0
+    - **cursor**: str - default None, opts in to keyset pagination, pass an empty cursor for the first page
+    and `next_cursor` of the previous page afterwards, `offset` is then ignored and `total` is only
+    returned for the first page
     - **phrase**: str - default ''
     """
-    alcohols, total = await AlcoholDatabaseHandler.search_alcohols(db.alcohols, limit, offset, phrase, filters)
-    alcohols = map_alcohols(alcohols, db.alcohol_categories)
+    if cursor is not None:
+        alcohols, next_cursor, total = await search.search_alcohols_after(db.alcohols, limit, cursor, phrase, filters)
+        alcohols = await map_alcohols(alcohols, db.alcohol_categories)
+        return CursorPaginatedAlcohol(
+            alcohols=alcohols,
+            page_info=CursorPageInfo(
+                limit=limit,
+                next_cursor=next_cursor,
+                total=total
+            )
+        )
+    alcohols, total = await search.search_alcohols(db.alcohols, limit, offset, phrase, filters)
+    alcohols = await map_alcohols(alcohols, db.alcohol_categories)
     return PaginatedAlcohol(
         alcohols=alcohols,
         page_info=PageInfo(
@@ -517,7 +592,7 @@ async def search_alcohols(
 async def get_suggestions(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     suggestions = await AlcoholSuggestionDatabaseHandler.get_suggestions(db.alcohol_suggestion, limit, offset)
     total = await AlcoholSuggestionDatabaseHandler.count_suggestions(db.alcohol_suggestion, '')
@@ -539,7 +614,7 @@ async def get_suggestions(
     response_model_by_alias=False
 )
 async def get_suggestions(
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> int:
     total = await AlcoholSuggestionDatabaseHandler.count_suggestions(db.alcohol_suggestion, '')
     return total
@@ -556,7 +631,7 @@ async def search_suggestions_by_phrase(
         limit: int = 10,
         offset: int = 0,
         phrase: str = Query(default='', min_length=3),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     """
     Search for suggestions with pagination. Query params:
@@ -586,7 +661,7 @@ async def search_suggestions_by_phrase(
 )
 async def get_suggestion_by_id(
         suggestion_id: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> AlcoholSuggestion:
     suggestion_id = validate_object_id(suggestion_id)
     db_suggestions = await AlcoholSuggestionDatabaseHandler.get_suggestion_by_id(db.alcohol_suggestion,
@@ -604,8 +679,9 @@ async def get_suggestion_by_id(
 )
 async def delete_suggestion(
         suggestion_id: str,
-        db: Database = Depends(get_db),
-        settings: ApplicationSettings = Depends(get_settings)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings),
+        storage: ImageStorage = Depends(image_storage)
 ) -> None:
     """
     Delete alcohol suggestion by suggestion id
@@ -615,7 +691,7 @@ async def delete_suggestion(
     await AlcoholSuggestionDatabaseHandler.delete_suggestion(db.alcohol_suggestion, suggestion_id)
     image_prefix = suggestion['barcode'] + '_'
     image_path = f'{settings.ALCOHOL_SUGGESTION_IMAGES_DIR}/{image_prefix}'
-    cloudinary.api.delete_resources_by_prefix(prefix=f'{image_path}')
+    await storage.delete_prefix(image_path)
 
 
 @router.delete(
@@ -627,7 +703,7 @@ async def delete_suggestion(
 )
 async def delete_review(
         review_id: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete review by id
@@ -651,7 +727,7 @@ async def delete_review(
 async def get_reported_reviews(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedReportedReview:
     db_reported_reviews = await ReviewDatabaseHandler.get_reported_reviews(db.reviews, limit, offset)
     total = await ReviewDatabaseHandler.count_reported_reviews(db.reviews)
@@ -676,7 +752,7 @@ async def get_reported_reviews(
 async def get_reported_reviews_by_phrase(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         phrase: str = Query(default='', min_length=3),
 ) -> PaginatedReportedReview:
     db_reported_reviews = await ReviewDatabaseHandler.get_reported_reviews_by_phrase(db.reviews, phrase, limit, offset)
@@ -701,7 +777,7 @@ async def get_reported_reviews_by_phrase(
 )
 async def get_reported_review(
         review_id: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> ReportedReview:
     review_id = validate_object_id(review_id)
     db_reported_review = await ReviewDatabaseHandler.get_review_by_id(db.reviews, review_id)
@@ -720,7 +796,7 @@ async def get_reported_review(
 async def ban_review(
         review_id: str,
         reason_payload: ReviewBan,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     review_id = validate_object_id(review_id)
     db_review = await ReviewDatabaseHandler.get_review_by_id(db.reviews, review_id)
@@ -753,7 +829,7 @@ async def get_user_banned_reviews(
         user_id: str,
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedBannedReview:
     user_id = validate_object_id(user_id)
     if not await UserDatabaseHandler.check_if_user_exists(
@@ -788,7 +864,7 @@ async def get_alcohols_created_by_user(
         username: str,
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedAlcohol:
 
     db_alcohols = await AlcoholDatabaseHandler.get_alcohols_created_by_user(db.alcohols, limit, offset, username)
@@ -813,6 +889,6 @@ async def get_alcohols_created_by_user(
 )
 async def get_alcohols_created_by_user(
         username: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> int:
     return await AlcoholDatabaseHandler.count_alcohols_created_by_user(db.alcohols, username)
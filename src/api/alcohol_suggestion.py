@@ -1,18 +1,18 @@
-import cloudinary
-import cloudinary.uploader
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import APIRouter, Depends, status, Response, UploadFile, File, HTTPException, Form
 
 from src.infrastructure.database.models.user import User
 from src.infrastructure.common.file_utils import image_size
 from src.infrastructure.auth.auth_utils import get_valid_user
 from src.infrastructure.database.database_config import get_db
+from src.infrastructure.config.patterns import image_name_pattern
 from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+from src.infrastructure.images.image_storage import ImageStorage, image_storage
 from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 from src.infrastructure.exceptions.alcohol_exceptions import AlcoholExistsException
 from src.domain.alcohol_suggestion.alcohol_suggestion_create import AlcoholSuggestionCreate
 from src.infrastructure.exceptions.alcohol_suggestion_exception import SuggestionAlreadyMadeException, \
-    SuggestionFileTooBigException, WrongSuggestionFileTypeException
+    SuggestionFileTooBigException, WrongSuggestionFileTypeException, InvalidSuggestionImageNameException
 from src.infrastructure.database.models.alcohol_suggestion import AlcoholSuggestionDatabaseHandler as DatabaseHandler, \
     AlcoholSuggestionDatabaseHandler
 
@@ -28,7 +28,7 @@ router = APIRouter(prefix='/suggestions', tags=['alcohol_suggestions'])
 async def create_suggestion(
         payload: AlcoholSuggestionCreate,
         current_user: User = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     if (
             await AlcoholDatabaseHandler.get_alcohol_by_barcode(db.alcohols, list(payload.barcode))
@@ -60,7 +60,11 @@ async def create_suggestion(
 async def upload_suggestion_image(
         image_name: str = Form(...),
         file: UploadFile = File(...),
-        settings: ApplicationSettings = Depends(get_settings)):
+        settings: ApplicationSettings = Depends(get_settings),
+        storage: ImageStorage = Depends(image_storage)):
+
+    if not image_name_pattern.fullmatch(image_name):
+        raise InvalidSuggestionImageNameException()
 
     if file.content_type not in ['image/png', 'image/jpeg']:
         raise WrongSuggestionFileTypeException()
@@ -69,13 +73,6 @@ async def upload_suggestion_image(
         raise SuggestionFileTooBigException()
 
     try:
-        cloudinary.uploader.upload(
-            file.file,
-            folder=settings.ALCOHOL_SUGGESTION_IMAGES_DIR,
-            public_id=image_name,
-            resource_type='image',
-            overwrite=False,
-            invalidate=True
-        )
+        await storage.upload(file.file, settings.ALCOHOL_SUGGESTION_IMAGES_DIR, image_name, overwrite=False)
     except Exception as error:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(error))
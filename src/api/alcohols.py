@@ -1,38 +1,32 @@
 from bson import ObjectId
-from pymongo.database import Database
-from fastapi import APIRouter, status, Depends, Query
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, status, Depends, Query, Header, Response
 
-from src.domain.common import PageInfo
 from src.domain.alcohol_filter import AlcoholFilters
+from src.domain.common import PageInfo, CursorPageInfo
 from src.domain.alcohol_filter import AlcoholFiltersMetadata
 from src.infrastructure.database.database_config import get_db
+from src.infrastructure.alcohol.facet_index import facet_index
+from src.infrastructure.common.fast_json import fast_json_response
 from src.domain.alcohol_category import PaginatedAlcoholCategories
+from src.infrastructure.alcohol.filters_snapshot import filters_snapshot
 from src.infrastructure.common.validate_object_id import validate_object_id
 from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
-from src.domain.alcohol import Alcohol, PaginatedAlcohol, AlcoholRecommendation
 from src.infrastructure.alcohol.alcohol_mappers import map_alcohols, map_alcohol
+from src.infrastructure.search.search_backend import SearchBackend, search_backend
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 from src.infrastructure.exceptions.alcohol_exceptions import AlcoholNotFoundException
-from src.infrastructure.database.models.alcohol_filter import AlcoholFilterDatabaseHandler
 from src.infrastructure.database.models.alcohol_category import AlcoholCategoryDatabaseHandler
 from src.infrastructure.database.models.alcohol_category.mappers import map_to_alcohol_category
 from src.infrastructure.recommender.recommender_client import RecommenderClient, recommender_client
+from src.domain.alcohol import Alcohol, PaginatedAlcohol, AlcoholRecommendation, CursorPaginatedAlcohol
 
 router = APIRouter(prefix='/alcohols', tags=['alcohol'])
 
-translate = {
-    'color': 'kolor',
-    'kind': 'kategoria',
-    'country': 'kraj',
-    'type': 'typ',
-    'food': 'jedzenie',
-    'aroma': 'aromat',
-    'taste': 'smak'
-}
-
 
 @router.post(
     path='',
-    response_model=PaginatedAlcohol,
+    response_model=PaginatedAlcohol | CursorPaginatedAlcohol,
     status_code=status.HTTP_200_OK,
     summary='Search for alcohols by phrase',
     response_model_by_alias=False,
@@ -41,25 +35,48 @@ async def search_alcohols(
         limit: int = 10,
         offset: int = 0,
         filters: AlcoholFilters | None = None,
+        cursor: str | None = Query(default=None),
         phrase: str | None = Query(default=None, min_length=3),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        search: SearchBackend = Depends(search_backend),
+        settings: ApplicationSettings = Depends(get_settings)
 ):
     """
     Search for alcohols with pagination. Query params:
     - **limit**: int - default 10
     - **offset**: int - default 0
+    - **cursor**: str - default None, opts in to keyset pagination, pass an empty cursor for the first page
+    and `next_cursor` of the previous page afterwards, `offset` is then ignored and `total` is only
+    returned for the first page
     - **phrase**: str - default None, if given then phrase needs to have min 3 characters
     """
-    alcohols, total = await AlcoholDatabaseHandler.search_alcohols(db.alcohols, limit, offset, phrase, filters)
-    alcohols = map_alcohols(alcohols, db.alcohol_categories)
-    return PaginatedAlcohol(
-        alcohols=alcohols,
-        page_info=PageInfo(
+    if cursor is not None:
+        alcohols, next_cursor, total = await search.search_alcohols_after(db.alcohols, limit, cursor, phrase, filters)
+        alcohols = await map_alcohols(alcohols, db.alcohol_categories)
+        page = {
+            'alcohols': alcohols,
+            'page_info': CursorPageInfo(
+                limit=limit,
+                next_cursor=next_cursor,
+                total=total
+            )
+        }
+        if settings.FAST_JSON_RESPONSES:
+            return fast_json_response(CursorPaginatedAlcohol, page)
+        return CursorPaginatedAlcohol(**page)
+    alcohols, total = await search.search_alcohols(db.alcohols, limit, offset, phrase, filters)
+    alcohols = await map_alcohols(alcohols, db.alcohol_categories)
+    page = {
+        'alcohols': alcohols,
+        'page_info': PageInfo(
             limit=limit,
             offset=offset,
             total=total
         )
-    )
+    }
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(PaginatedAlcohol, page)
+    return PaginatedAlcohol(**page)
 
 
 @router.get(
@@ -69,44 +86,19 @@ async def search_alcohols(
     status_code=status.HTTP_200_OK,
     summary='Read alcohol filters'
 )
-async def get_alcohol_filters(db: Database = Depends(get_db)):
-    db_filters = await AlcoholFilterDatabaseHandler.get_all_filters(db.alcohol_filters)
-    filters = []
-    categories = await AlcoholCategoryDatabaseHandler.get_categories(db.alcohol_categories, 0, 0)
-    for db_filter in db_filters:
-        filter_dict = {
-            'name': 'kind',
-            'display_name': translate['kind'],
-            'value': db_filter.pop('_id'),
-            'filters': []
-        }
-        for key, values in sorted(db_filter.items()):
-            values.sort(key=str.lower)
-            filter_dict['filters'].append({
-                'name': key,
-                'display_name': translate[key],
-                'values': [value for value in values if value != '']
-            })
-        for category in categories:
-            if category['title'] == filter_dict['value']:
-                properties = category['properties']
-                for kind_property in properties:
-                    if kind_property != 'kind' and \
-                            any(x in properties[kind_property]['bsonType'] for x in ['array', 'string']):
-                        if kind_property != "temperature":
-                            values = await AlcoholDatabaseHandler.search_values(
-                                    kind_property, db.alcohols, 0, 0, ""
-                                )
-                            values.sort(key=str.lower)
-                            filter_dict['filters'].append({
-                                'name': kind_property,
-                                'display_name': properties[kind_property]['title'],
-                                'values': [value for value in values if value != '']
-                            })
-        filters.append(filter_dict)
-    return AlcoholFiltersMetadata(
-        filters=filters
-    )
+async def get_alcohol_filters(
+        if_none_match: str | None = Header(default=None),
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
+):
+    """
+    Read filters of every alcohol kind, served from a snapshot kept in memory.
+    Responds with 304 when `If-None-Match` carries the current ETag.
+    """
+    body, etag = await filters_snapshot.get(db, settings.ALCOHOL_FILTERS_MAX_AGE)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(content=body, media_type='application/json', headers={'ETag': etag})
 
 
 @router.get(
@@ -116,14 +108,14 @@ async def get_alcohol_filters(db: Database = Depends(get_db)):
     status_code=status.HTTP_200_OK,
     summary='Read alcohol information by barcode'
 )
-async def get_alcohol_by_barcode(barcode: str, db: Database = Depends(get_db)):
+async def get_alcohol_by_barcode(barcode: str, db: AsyncIOMotorDatabase = Depends(get_db)):
     """
     Read alcohol by barcode
     """
     db_alcohol = await AlcoholDatabaseHandler.get_alcohol_by_barcode(db.alcohols, [barcode])
     if not db_alcohol:
         raise AlcoholNotFoundException()
-    return map_alcohol(db_alcohol, db.alcohol_categories)
+    return await map_alcohol(db_alcohol, db.alcohol_categories)
 
 
 @router.get(
@@ -136,7 +128,7 @@ async def get_alcohol_by_barcode(barcode: str, db: Database = Depends(get_db)):
 async def get_schemas(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     alcohol_categories = [
         map_to_alcohol_category(db_alcohol_category) for db_alcohol_category in
@@ -163,12 +155,12 @@ async def get_schemas(
 async def get_similar(
         alcohol_id: str,
         client: RecommenderClient = Depends(recommender_client),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     alcohol_id = str(validate_object_id(alcohol_id))
     similar = [
         ObjectId(alcohol_id) for alcohol_id in
-        client.fetch_similar_alcohols(alcohol_id)['similar']
+        (await client.fetch_similar_alcohols(alcohol_id))['similar']
     ]
     similar = await AlcoholDatabaseHandler.get_alcohols_by_ids(db.alcohols, similar)
     return AlcoholRecommendation(
@@ -186,7 +178,8 @@ async def search_values(
         phrase: str | None = Query(default=None),
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> list[str]:
     """
     Search for values Query params:
@@ -194,4 +187,6 @@ async def search_values(
     - **offset**: int - default 0
     - **phrase**: str - default None return all values
     """
-    return await AlcoholDatabaseHandler.search_values(field_name, db.alcohols, limit, offset, phrase)
+    return await facet_index.search(
+        db, field_name, limit, offset, phrase, settings.ALCOHOL_FACETS_MAX_AGE
+    )
@@ -1,25 +1,27 @@
 from datetime import datetime
 from operator import itemgetter
-from pymongo.database import Database
 from async_fastapi_jwt_auth import AuthJWT
 from starlette.responses import RedirectResponse
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import APIRouter, Depends, status, Response, Header, HTTPException, Request
 
 from src.domain.token import Token
 from src.domain.user import UserCreate
 from src.domain.user.user_email import UserEmail
+from src.infrastructure.auth.user_cache import user_cache
 from src.infrastructure.database.database_config import get_db
 from src.domain.user.user_change_password import UserChangePassword
 from src.infrastructure.database.models.user import UserDatabaseHandler
+from src.infrastructure.socials.social_graph import SocialGraph, social_graph
 from src.infrastructure.auth.auth_utils import generate_tokens, get_valid_token
+from src.infrastructure.auth.token_blacklist_cache import token_blacklist_cache
 from src.infrastructure.database.models.token import TokenBlacklistDatabaseHandler
 from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 from src.infrastructure.exceptions.users_exceptions import UserExistsException, UserNotFoundException
-from src.infrastructure.database.models.socials.followers_database_handler import FollowersDatabaseHandler
 from src.infrastructure.exceptions.auth_exceptions \
     import UserBannedException, TokenRevokedException, CredentialsException, InsufficientPermissionsException, \
-    EmailNotVerifiedException, SendingEmailError, InvalidVerificationCode
+    EmailNotVerifiedException, SendingEmailError, InvalidVerificationCode, AccountDeletionPendingException
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
@@ -33,7 +35,7 @@ router = APIRouter(prefix='/auth', tags=['auth'])
 async def login(
         form_data: OAuth2PasswordRequestForm = Depends(),
         authorize: AuthJWT = Depends(),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ):
     user = await UserDatabaseHandler.authenticate_user(db.users, form_data.username, form_data.password, True)
@@ -49,7 +51,7 @@ async def login(
 async def admin_login(
         form_data: OAuth2PasswordRequestForm = Depends(),
         authorize: AuthJWT = Depends(),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ):
     user = await UserDatabaseHandler.authenticate_user(db.users, form_data.username, form_data.password, True)
@@ -66,7 +68,7 @@ async def admin_login(
 )
 async def refresh(
         authorize: AuthJWT = Depends(),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ):
     await authorize.jwt_refresh_token_required()
@@ -81,6 +83,8 @@ async def refresh(
         raise CredentialsException()
     if db_user['is_banned']:
         raise UserBannedException()
+    if db_user.get('deletion_pending'):
+        raise AccountDeletionPendingException()
 
     return await generate_tokens(current_user, authorize, settings)
 
@@ -92,8 +96,9 @@ async def refresh(
 )
 async def register(
         user_create_payload: UserCreate,
-        db: Database = Depends(get_db),
-        settings: ApplicationSettings = Depends(get_settings)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings),
+        graph: SocialGraph = Depends(social_graph)
 ) -> None:
     """
     Send verification email to given email address.
@@ -113,14 +118,13 @@ async def register(
 
     user = await UserDatabaseHandler.create_user(db.users, user_create_payload)
     try:
-        await UserDatabaseHandler.send_verification_mail(db.users, user, settings)
+        await UserDatabaseHandler.send_verification_mail(db.users, db.email_queue, user, settings)
     except Exception:
         await UserDatabaseHandler.delete_user_by_id(user['_id'], db.users)
         raise SendingEmailError()
     await UserDatabaseHandler.create_user_lists(db.users, user_create_payload.username, db.user_wishlist,
                                                 db.user_favourites, db.user_search_history)
-    await FollowersDatabaseHandler.create_followers_and_following_lists(db.users, user_create_payload.username,
-                                                                        db.followers, db.following)
+    await graph.create_user(db, user_create_payload.username)
 
 
 @router.post(
@@ -132,7 +136,7 @@ async def logout(
         access_token: str = Depends(get_valid_token),
         authorization_refresh: str | None = Header(default=None),
         authorize: AuthJWT = Depends(AuthJWT),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Logout endpoint. This endpoint requires two tokens to be sent.
@@ -158,13 +162,17 @@ async def logout(
             token_type='Refresh'
         )
 
+    access_token_expiration = datetime.utcfromtimestamp(access_token_exp)
     await TokenBlacklistDatabaseHandler.add_token_to_blacklist(
-        db.tokens_blacklist, token_jti=access_token_jti, expiration_date=datetime.fromtimestamp(access_token_exp)
+        db.tokens_blacklist, token_jti=access_token_jti, expiration_date=access_token_expiration
     )
+    token_blacklist_cache.add(access_token_jti, access_token_expiration)
 
+    refresh_token_expiration = datetime.utcfromtimestamp(refresh_token_exp)
     await TokenBlacklistDatabaseHandler.add_token_to_blacklist(
-        db.tokens_blacklist, token_jti=refresh_token_jti, expiration_date=datetime.fromtimestamp(refresh_token_exp)
+        db.tokens_blacklist, token_jti=refresh_token_jti, expiration_date=refresh_token_expiration
     )
+    token_blacklist_cache.add(refresh_token_jti, refresh_token_expiration)
 
 
 @router.get(
@@ -174,14 +182,15 @@ async def logout(
 )
 async def verify_email(
         token: str,
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ):
     try:
-        await UserDatabaseHandler.verify_email(token, db.users)
+        user = await UserDatabaseHandler.verify_email(token, db.users)
     except InvalidVerificationCode:
         url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/invalid_email_verification'
         return RedirectResponse(url=url)
+    user_cache.invalidate(user['username'])
     url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/valid_email_verification'
     return RedirectResponse(url=url)
 
@@ -194,7 +203,7 @@ async def verify_email(
 )
 async def request_password_reset(
         payload: UserEmail,
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ) -> None:
     """
@@ -206,7 +215,7 @@ async def request_password_reset(
     db_user = await UserDatabaseHandler.get_user_by_email(db.users, payload.email)
     if not db_user['is_verified']:
         raise EmailNotVerifiedException()
-    await UserDatabaseHandler.send_password_reset_request(payload, db.users, db_user, settings)
+    await UserDatabaseHandler.send_password_reset_request(payload, db.users, db.email_queue, db_user, settings)
 
 
 @router.post(
@@ -217,7 +226,7 @@ async def request_password_reset(
 )
 async def reset_password(
         payload: UserChangePassword,
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ):
     """
@@ -227,6 +236,7 @@ async def reset_password(
     if not await UserDatabaseHandler.check_reset_token(payload.token, db.users):
         url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/invalid_password_change'
         return RedirectResponse(url=url, status_code=200)
-    await UserDatabaseHandler.change_password(payload.new_password, payload.token, db.users)
+    if user := await UserDatabaseHandler.change_password(payload.new_password, payload.token, db.users):
+        user_cache.invalidate(user['username'])
     url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/valid_password_change'
     return RedirectResponse(url=url, status_code=200)
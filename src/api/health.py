@@ -0,0 +1,148 @@
+from pymongo.errors import PyMongoError
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, Depends, status, Response
+from asyncio import wait_for, TimeoutError as PingTimeoutError
+
+from src.infrastructure.auth.user_cache import user_cache
+from src.infrastructure.email.mail_queue import mail_queue
+from src.infrastructure.auth.auth_utils import admin_permission
+from src.infrastructure.auth.password_hasher import password_hasher
+from src.infrastructure.database.pool_monitor import ConnectionPoolMonitor
+from src.infrastructure.database.database_config import get_db, get_pool_monitor
+from src.infrastructure.hate_speech_detection.review_screening import review_screener
+from src.infrastructure.recommender.recommender_client import similar_alcohols_cache, recommendations_cache
+from src.domain.health import DatabaseHealth, ConnectionPoolInfo, CacheInfo, PasswordHashingInfo, ReviewScreeningInfo, \
+    MailQueueInfo, DatabaseStatus
+
+router = APIRouter(prefix='/health', tags=['health'])
+# worker internals are only reported to admins
+admin_router = APIRouter(prefix='/health', tags=['health'], dependencies=[Depends(admin_permission)])
+
+PING_TIMEOUT_SECONDS = 5
+
+
+async def ping(db: AsyncIOMotorDatabase, response: Response) -> str:
+    try:
+        await wait_for(db.command('ping'), PING_TIMEOUT_SECONDS)
+        return 'ok'
+    except (PyMongoError, PingTimeoutError):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return 'unavailable'
+
+
+@router.get(
+    '/db',
+    response_model=DatabaseStatus,
+    status_code=status.HTTP_200_OK,
+    summary='Check database connectivity'
+)
+async def get_database_status(response: Response, db: AsyncIOMotorDatabase = Depends(get_db)):
+    return DatabaseStatus(status=await ping(db, response))
+
+
+@admin_router.get(
+    '/db/pools',
+    response_model=DatabaseHealth,
+    status_code=status.HTTP_200_OK,
+    summary='Check database connectivity and connection pool saturation'
+)
+async def get_database_health(
+        response: Response,
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        monitor: ConnectionPoolMonitor = Depends(get_pool_monitor)
+):
+    """
+    Ping the database and report usage of every connection pool.
+    Saturation is the ratio of checked out connections to the pool size.
+    """
+    database_status = await ping(db, response)
+    pools = [
+        ConnectionPoolInfo(
+            address=address,
+            max_pool_size=stats.max_pool_size,
+            min_pool_size=stats.min_pool_size,
+            open_connections=stats.open_connections,
+            in_use=stats.in_use,
+            available=stats.open_connections - stats.in_use,
+            waiting=stats.waiting,
+            wait_queue_timeouts=stats.wait_queue_timeouts,
+            saturation=stats.in_use / stats.max_pool_size if stats.max_pool_size else 0.0
+        ) for address, stats in monitor.snapshot().items()
+    ]
+    return DatabaseHealth(status=database_status, pools=pools)
+
+
+@admin_router.get(
+    '/caches',
+    response_model=list[CacheInfo],
+    status_code=status.HTTP_200_OK,
+    summary='Report hits and misses of in-memory caches of this worker'
+)
+async def get_caches_health():
+    caches = {
+        'users': user_cache,
+        similar_alcohols_cache.name: similar_alcohols_cache,
+        recommendations_cache.name: recommendations_cache
+    }
+    return [
+        CacheInfo(
+            name=name,
+            size=len(cache),
+            max_size=cache.max_size,
+            hits=cache.hits,
+            misses=cache.misses,
+            hit_ratio=cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else 0.0
+        ) for name, cache in caches.items()
+    ]
+
+
+@admin_router.get(
+    '/auth',
+    response_model=PasswordHashingInfo,
+    status_code=status.HTTP_200_OK,
+    summary='Report password hashing pool usage and login latency of this worker'
+)
+async def get_auth_health():
+    """
+    Latencies cover the last 1000 logins, from reading the user to verifying the password.
+    """
+    return PasswordHashingInfo(**vars(password_hasher.stats()))
+
+
+@admin_router.get(
+    '/screening',
+    response_model=ReviewScreeningInfo,
+    status_code=status.HTTP_200_OK,
+    summary='Report the hate speech screening queue'
+)
+async def get_screening_health(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Queue depth and dead letters are shared by all workers, the other counters cover this worker.
+    """
+    return ReviewScreeningInfo(
+        pending=await review_screener.count_pending(db),
+        dead_letters=await db.review_screening_dead_letters.estimated_document_count(),
+        screened=review_screener.screened,
+        flagged=review_screener.flagged,
+        failed=review_screener.failed,
+        dead_lettered=review_screener.dead_lettered
+    )
+
+
+@admin_router.get(
+    '/mail',
+    response_model=MailQueueInfo,
+    status_code=status.HTTP_200_OK,
+    summary='Report the outgoing email queue'
+)
+async def get_mail_health(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Queue depth and dead letters are shared by all workers, the other counters cover this worker.
+    """
+    return MailQueueInfo(
+        pending=await mail_queue.count_pending(db),
+        dead_letters=await db.email_queue_dead_letters.estimated_document_count(),
+        sent=mail_queue.sent,
+        failed=mail_queue.failed,
+        dead_lettered=mail_queue.dead_lettered
+    )
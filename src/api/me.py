@@ -1,20 +1,20 @@
 from bson import ObjectId
-from pymongo.database import Database
 from starlette.responses import RedirectResponse
-from fastapi import APIRouter, Depends, status, Response
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import APIRouter, Depends, status, Response, Query, BackgroundTasks
 
-from src.domain.common import PageInfo
 from src.domain.user_tag import UserTag
 from src.domain.review import ReviewCreate, Review
 from src.domain.user.me_user_info import MeUserInfo
 from src.domain.user_list import SearchHistoryEntry
+from src.domain.common import PageInfo, CursorPageInfo
 from src.domain.review.review_update import ReviewUpdate
 from src.domain.user.user_migration import UserMigration
 from src.domain.user_tag.user_tag_create import UserTagCreate
 from src.infrastructure.auth.auth_utils import get_valid_user
 from src.domain.user_list.list_belonging import ListsBelonging
 from src.infrastructure.database.database_config import get_db
-from src.domain.user.paginated_user_info import PaginatedUserSocial
+from src.infrastructure.common.fast_json import fast_json_response
 from src.domain.user_tag.paginated_user_tag import PaginatedUserTags
 from src.domain.alcohol import PaginatedAlcohol, AlcoholRecommendation
 from src.infrastructure.database.models.review import ReviewDatabaseHandler
@@ -25,18 +25,20 @@ from src.infrastructure.alcohol.alcohol_mappers import map_alcohols, map_alcohol
 from src.domain.user_list.paginated_search_history import PaginatedSearchHistory
 from src.infrastructure.exceptions.users_exceptions import UserNotFoundException
 from src.infrastructure.config.app_config import get_settings, ApplicationSettings
+from src.infrastructure.hate_speech_detection.review_screening import review_screener
 from src.infrastructure.exceptions.alcohol_exceptions import AlcoholNotFoundException
 from src.infrastructure.database.models.user import User as UserDb, UserDatabaseHandler
 from src.infrastructure.exceptions.list_exceptions import AlcoholAlreadyInListException
+from src.domain.user.paginated_user_info import PaginatedUserSocial, CursorPaginatedUserSocial
 from src.infrastructure.exceptions.followers_exceptions import UserAlreadyInFollowingException
+from src.infrastructure.socials.social_graph import SocialGraph, social_graph, FOLLOWERS, FOLLOWING
 from src.infrastructure.recommender.recommender_client import RecommenderClient, recommender_client
+from src.infrastructure.user.account_deletion import schedule_account_deletion, run_account_deletion
 from src.infrastructure.database.models.user_list.wishlist_database_handler import UserWishlistHandler
 from src.infrastructure.database.models.user_list.favourites_database_handler import UserFavouritesHandler
 from src.infrastructure.database.models.socials.following_database_handler import FollowingDatabaseHandler
 from src.infrastructure.database.models.socials.followers_database_handler import FollowersDatabaseHandler
 from src.infrastructure.database.models.user_list.search_history_database_handler import SearchHistoryHandler
-from src.infrastructure.hate_speech_detection.hate_speech_detection_client import hate_speech_detection_client, \
-    HateSpeechDetectionClient
 from src.infrastructure.exceptions.user_tag_exceptions import TagDoesNotBelongToUserException,\
     TagAlreadyExistsException, AlcoholIsInTagException, TagNotFoundException
 from src.infrastructure.exceptions.review_exceptions import ReviewAlreadyExistsException, \
@@ -53,8 +55,15 @@ router = APIRouter(prefix='/me', tags=['me'])
     summary='Read information about your account',
     response_model_by_alias=False
 )
-async def get_self(current_user: UserDb = Depends(get_valid_user)):
-    return current_user
+async def get_self(
+        current_user: UserDb = Depends(get_valid_user),
+        db: AsyncIOMotorDatabase = Depends(get_db)
+):
+    """
+    Counters change with every follow, review and list update, so they are read again instead of
+    being served from the cached user.
+    """
+    return await UserDatabaseHandler.get_user_by_id(db.users, current_user['_id'])
 
 
 @router.post(
@@ -65,13 +74,13 @@ async def get_self(current_user: UserDb = Depends(get_valid_user)):
 )
 async def send_delete_request(
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         settings: ApplicationSettings = Depends(get_settings)
 ):
     """
         Sends email message with deletion link to address associated with account.
     """
-    await UserDatabaseHandler.send_deletion_request(current_user, db.users, settings)
+    await UserDatabaseHandler.send_deletion_request(current_user, db.users, db.email_queue, settings)
 
 
 @router.get(
@@ -82,20 +91,25 @@ async def send_delete_request(
 )
 async def delete_self(
         token: str,
-        db: Database = Depends(get_db),
-        settings: ApplicationSettings = Depends(get_settings)
+        background_tasks: BackgroundTasks,
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings),
+        graph: SocialGraph = Depends(social_graph)
 ):
+    """
+    Schedule deletion of the account, its lists, follows and reviews are removed in the background
+    after the redirect is sent.
+    """
     user = await UserDatabaseHandler.find_user_by_deletion_code(token, db.users)
     if not user:
         url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/invalid_account_deletion'
         return RedirectResponse(url=url)
     else:
-        await UserDatabaseHandler.delete_user_lists(db.user_favourites, db.user_wishlist, db.user_search_history,
-                                                    db.user_tags, user['_id'])
-        await FollowingDatabaseHandler.delete_user_following(db.following, db.followers, db.users, user['_id'])
-        await FollowingDatabaseHandler.delete_user_followers(db.followers, db.following, db.users, user['_id'])
-        await ReviewDatabaseHandler.delete_reviews(db.reviews, db.alcohols, user['_id'])
-        await UserDatabaseHandler.delete_user(db.users, user['_id'])
+        await schedule_account_deletion(db, user['_id'])
+        background_tasks.add_task(
+            run_account_deletion, db, graph, user['_id'],
+            settings.ACCOUNT_DELETION_BATCH_SIZE, settings.ACCOUNT_DELETION_LEASE
+        )
         url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/valid_account_deletion'
     return RedirectResponse(url=url)
 
@@ -111,7 +125,7 @@ async def get_tags(
         limit: int = 10,
         offset: int = 0,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedUserTags:
     """
     Search your tags with pagination.
@@ -139,7 +153,7 @@ async def get_tags(
 async def delete_tag(
         tag_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete your tag by tag id
@@ -163,7 +177,7 @@ async def delete_tag(
 async def create_tag(
         user_tag_create_payload: UserTagCreate,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     if await UserTagDatabaseHandler.check_if_user_tag_exists(
             db.user_tags,
@@ -186,7 +200,7 @@ async def add_alcohol(
         tag_id: str,
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     tag_id = validate_object_id(tag_id)
     alcohol_id = validate_object_id(alcohol_id)
@@ -229,7 +243,7 @@ async def remove_alcohol(
         tag_id: str,
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     tag_id = validate_object_id(tag_id)
     alcohol_id = validate_object_id(alcohol_id)
@@ -255,7 +269,7 @@ async def update_tag(
         tag_id: str,
         tag_name: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     tag_id = validate_object_id(tag_id)
     if not await UserTagDatabaseHandler.check_if_tag_exists_by_id(
@@ -296,7 +310,7 @@ async def get_alcohols(
         limit: int = 10,
         offset: int = 0,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedAlcohol:
     tag_id = validate_object_id(tag_id)
     if not await UserTagDatabaseHandler.check_if_tag_exists_by_id(
@@ -311,20 +325,14 @@ async def get_alcohols(
             current_user['_id']):
         raise TagDoesNotBelongToUserException()
 
-    total = await UserTagDatabaseHandler.count_alcohols(
-        tag_id,
-        db.user_tags,
-        db.alcohols,
-    )
-
-    alcohols = await UserTagDatabaseHandler.get_tag_alcohols(
+    alcohols, total = await UserTagDatabaseHandler.get_tag_alcohols(
         tag_id,
         limit,
         offset,
         db.user_tags,
         db.alcohols,
     )
-    alcohols = map_alcohols(alcohols, db.alcohol_categories)
+    alcohols = await map_alcohols(alcohols, db.alcohol_categories)
 
     return PaginatedAlcohol(
         alcohols=alcohols,
@@ -346,26 +354,29 @@ async def get_alcohols(
 async def get_wishlist(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db),
-        current_user: UserDb = Depends(get_valid_user)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        current_user: UserDb = Depends(get_valid_user),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> PaginatedAlcohol:
     """
     Show user wishlist with pagination
     """
     user_id = current_user['_id']
-    alcohols = await UserWishlistHandler.get_user_wishlist_by_user_id(
+    alcohols, total = await UserWishlistHandler.get_user_wishlist_by_user_id(
         limit, offset, db.user_wishlist, db.alcohols, user_id
     )
-    alcohols = map_alcohols(alcohols, db.alcohol_categories)
-    total = await UserWishlistHandler.count_alcohols_in_wishlist(db.user_wishlist, db.alcohols, user_id)
-    return PaginatedAlcohol(
-        alcohols=alcohols,
-        page_info=PageInfo(
+    alcohols = await map_alcohols(alcohols, db.alcohol_categories)
+    page = {
+        'alcohols': alcohols,
+        'page_info': PageInfo(
             limit=limit,
             offset=offset,
             total=total
         )
-    )
+    }
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(PaginatedAlcohol, page)
+    return PaginatedAlcohol(**page)
 
 
 @router.get(
@@ -378,7 +389,7 @@ async def get_wishlist(
 async def get_belonging_to_lists(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> ListsBelonging:
     """
     Check if alcohol is in user's lists
@@ -404,26 +415,29 @@ async def get_belonging_to_lists(
 async def get_favourites(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db),
-        current_user: UserDb = Depends(get_valid_user)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        current_user: UserDb = Depends(get_valid_user),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> PaginatedAlcohol:
     """
     Show user favourite alcohol list with pagination
     """
     user_id = current_user['_id']
-    alcohols = await UserFavouritesHandler.get_user_favourites_by_user_id(
+    alcohols, total = await UserFavouritesHandler.get_user_favourites_by_user_id(
         limit, offset, db.user_favourites, db.alcohols, user_id
     )
-    alcohols = map_alcohols(alcohols, db.alcohol_categories)
-    total = await UserFavouritesHandler.count_alcohols_in_favourites(db.user_favourites, db.alcohols, user_id)
-    return PaginatedAlcohol(
-        alcohols=alcohols,
-        page_info=PageInfo(
+    alcohols = await map_alcohols(alcohols, db.alcohol_categories)
+    page = {
+        'alcohols': alcohols,
+        'page_info': PageInfo(
             limit=limit,
             offset=offset,
             total=total
         )
-    )
+    }
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(PaginatedAlcohol, page)
+    return PaginatedAlcohol(**page)
 
 
 @router.get(
@@ -436,23 +450,22 @@ async def get_favourites(
 async def get_search_history(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         current_user: UserDb = Depends(get_valid_user)
 ) -> PaginatedSearchHistory:
     """
     Show user search history alcohol list with pagination
     """
     user_id = current_user['_id']
-    alcohols_and_dates = await SearchHistoryHandler.get_user_search_history_user_id(
+    alcohols_and_dates, total = await SearchHistoryHandler.get_user_search_history_user_id(
         limit, offset, db.user_search_history, db.alcohols, user_id
     )
     alcohols_and_dates = [
         SearchHistoryEntry(
-            alcohol=map_alcohol(alcohol_and_date.alcohol.dict(), db.alcohol_categories),
+            alcohol=await map_alcohol(alcohol_and_date.alcohol.dict(), db.alcohol_categories),
             date=alcohol_and_date.date
         ) for alcohol_and_date in alcohols_and_dates
     ]
-    total = await SearchHistoryHandler.count_alcohols_in_search_history(db.user_search_history, db.alcohols, user_id)
     return PaginatedSearchHistory(
         alcohols=alcohols_and_dates,
         page_info=PageInfo(
@@ -472,7 +485,7 @@ async def get_search_history(
 async def delete_alcohol_from_wishlist(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete alcohol from wishlist by alcohol id
@@ -492,7 +505,7 @@ async def delete_alcohol_from_wishlist(
 async def delete_alcohol_from_favourites(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete alcohol from favourites by alcohol id
@@ -512,7 +525,7 @@ async def delete_alcohol_from_favourites(
 async def delete_alcohol_from_search_history(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete alcohol from search history by alcohol id
@@ -531,7 +544,7 @@ async def delete_alcohol_from_search_history(
 async def add_alcohol_to_wishlist(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Add alcohol to your wishlist by alcohol id
@@ -554,7 +567,7 @@ async def add_alcohol_to_wishlist(
 async def add_alcohol_to_favourites(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Add alcohol to favourites by alcohol id
@@ -577,19 +590,22 @@ async def add_alcohol_to_favourites(
 async def add_alcohol_to_search_history(
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> None:
     """
     Add alcohol to search history by alcohol id
     """
     alcohol_id = validate_object_id(alcohol_id)
     user_id = current_user['_id']
-    await SearchHistoryHandler.add_alcohol_to_search_history(db.user_search_history, user_id, alcohol_id)
+    await SearchHistoryHandler.add_alcohol_to_search_history(
+        db.user_search_history, user_id, alcohol_id, max_length=settings.SEARCH_HISTORY_MAX_LENGTH
+    )
 
 
 @router.get(
     path='/followers',
-    response_model=PaginatedUserSocial,
+    response_model=PaginatedUserSocial | CursorPaginatedUserSocial,
     status_code=status.HTTP_200_OK,
     summary='Read user followers with pagination',
     response_model_by_alias=False
@@ -597,17 +613,28 @@ async def add_alcohol_to_search_history(
 async def get_followers(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db),
-        current_user: UserDb = Depends(get_valid_user)
-) -> PaginatedUserSocial:
+        cursor: str | None = Query(default=None),
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        current_user: UserDb = Depends(get_valid_user),
+        graph: SocialGraph = Depends(social_graph)
+) -> PaginatedUserSocial | CursorPaginatedUserSocial:
     """
     Get user followers with pagination
+    - **cursor**: str - default None, opts in to keyset pagination ordered by user id, pass an empty cursor
+    for the first page and `next_cursor` of the previous page afterwards, `offset` is then ignored
     """
     user_id = current_user['_id']
-    users = await FollowersDatabaseHandler.get_followers_by_user_id(
-        limit, offset, db.followers, db.users, user_id
-    )
-    total = await FollowersDatabaseHandler.count_followers(db.followers, db.users, user_id)
+    if cursor is not None:
+        users, next_cursor, total = await graph.get_users_after(db, FOLLOWERS, user_id, limit, cursor)
+        return CursorPaginatedUserSocial(
+            users=users,
+            page_info=CursorPageInfo(
+                limit=limit,
+                next_cursor=next_cursor,
+                total=total
+            )
+        )
+    users, total = await graph.get_users(db, FOLLOWERS, user_id, limit, offset)
     return PaginatedUserSocial(
         users=users,
         page_info=PageInfo(
@@ -620,7 +647,7 @@ async def get_followers(
 
 @router.get(
     path='/following',
-    response_model=PaginatedUserSocial,
+    response_model=PaginatedUserSocial | CursorPaginatedUserSocial,
     status_code=status.HTTP_200_OK,
     summary='Read following users with pagination',
     response_model_by_alias=False
@@ -628,16 +655,28 @@ async def get_followers(
 async def get_following(
         limit: int = 10,
         offset: int = 0,
-        db: Database = Depends(get_db),
-        current_user: UserDb = Depends(get_valid_user)
-) -> PaginatedUserSocial:
+        cursor: str | None = Query(default=None),
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        current_user: UserDb = Depends(get_valid_user),
+        graph: SocialGraph = Depends(social_graph)
+) -> PaginatedUserSocial | CursorPaginatedUserSocial:
     """
     Read following users with pagination
+    - **cursor**: str - default None, opts in to keyset pagination ordered by user id, pass an empty cursor
+    for the first page and `next_cursor` of the previous page afterwards, `offset` is then ignored
     """
     user_id = current_user['_id']
-    users = await FollowingDatabaseHandler.get_following_by_user_id(limit, offset, db.following, db.users, user_id)
-    total = await FollowingDatabaseHandler.count_following(db.following, db.users, user_id)
-
+    if cursor is not None:
+        users, next_cursor, total = await graph.get_users_after(db, FOLLOWING, user_id, limit, cursor)
+        return CursorPaginatedUserSocial(
+            users=users,
+            page_info=CursorPageInfo(
+                limit=limit,
+                next_cursor=next_cursor,
+                total=total
+            )
+        )
+    users, total = await graph.get_users(db, FOLLOWING, user_id, limit, offset)
     return PaginatedUserSocial(
         users=users,
         page_info=PageInfo(
@@ -657,7 +696,8 @@ async def get_following(
 async def delete_user_from_following(
         user_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        graph: SocialGraph = Depends(social_graph)
 ) -> None:
     """
     Delete user from following by following user id
@@ -665,9 +705,8 @@ async def delete_user_from_following(
     user_id = validate_object_id(user_id)
     current_user_id = current_user['_id']
     if await UserDatabaseHandler.get_user_by_id(db.users, user_id):
-        if await FollowingDatabaseHandler.delete_user_from_following(db.following, current_user_id, user_id):
+        if await graph.unfollow(db, current_user_id, user_id):
             await FollowingDatabaseHandler.decrease_following_counter(db.users, current_user_id)
-        if await FollowersDatabaseHandler.delete_user_from_followers(db.followers, user_id, current_user_id):
             await FollowersDatabaseHandler.decrease_followers_counter(db.users, user_id)
     else:
         raise UserNotFoundException
@@ -682,23 +721,18 @@ async def delete_user_from_following(
 async def add_user_to_following(
         user_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        graph: SocialGraph = Depends(social_graph)
 ) -> None:
     """
     Add user to following by user id
     """
     user_id = validate_object_id(user_id)
     current_user_id = current_user['_id']
-    if not await FollowingDatabaseHandler.check_if_user_in_following(db.following, current_user_id, user_id):
-        await FollowingDatabaseHandler.add_user_to_following(db.following, current_user_id, user_id)
-        await FollowingDatabaseHandler.increase_following_counter(db.users, current_user_id)
-        if not await FollowersDatabaseHandler.check_if_user_in_followers(db.followers, user_id, current_user_id):
-            await FollowersDatabaseHandler.add_user_to_followers(db.followers, user_id, current_user_id)
-            await FollowersDatabaseHandler.increase_followers_counter(db.users, user_id)
-        else:
-            UserAlreadyInFollowingException()
-    else:
+    if not await graph.follow(db, current_user_id, user_id):
         raise UserAlreadyInFollowingException()
+    await FollowingDatabaseHandler.increase_following_counter(db.users, current_user_id)
+    await FollowersDatabaseHandler.increase_followers_counter(db.users, user_id)
 
 
 @router.post(
@@ -710,9 +744,8 @@ async def add_user_to_following(
 async def create_review(
         alcohol_id: str,
         review_create_payload: ReviewCreate,
-        client: HateSpeechDetectionClient = Depends(hate_speech_detection_client),
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     alcohol_id = validate_object_id(alcohol_id)
 
@@ -742,8 +775,7 @@ async def create_review(
             review_create_payload.rating
         )
 
-        if client.check_review(review_create_payload.review):
-            await ReviewDatabaseHandler.machine_increase_review_report_count(db.reviews, review.inserted_id)
+        await review_screener.enqueue(db, review.inserted_id, review_create_payload.review)
 
 
 @router.delete(
@@ -756,7 +788,7 @@ async def delete_review(
         review_id: str,
         alcohol_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Delete your review by id
@@ -787,8 +819,7 @@ async def update_review(
         alcohol_id: str,
         review_update_payload: ReviewUpdate,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db),
-        client: HateSpeechDetectionClient = Depends(hate_speech_detection_client)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     review_id = validate_object_id(review_id)
     alcohol_id = validate_object_id(alcohol_id)
@@ -816,8 +847,7 @@ async def update_review(
         await ReviewDatabaseHandler.update_alcohol_rating(db.alcohols, alcohol_id, rating, review_update_payload.rating)
     await ReviewDatabaseHandler.update_user_rating(db.users, current_user['_id'], rating, review_update_payload.rating)
 
-    if review_update_payload.review and client.check_review(review_update_payload.review):
-        await ReviewDatabaseHandler.machine_increase_review_report_count(db.reviews, review_id)
+    await review_screener.enqueue(db, review_id, review_update_payload.review)
 
     return review_update
 
@@ -831,7 +861,7 @@ async def update_review(
 async def report_review(
         review_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> None:
     """
     Report review
@@ -854,7 +884,7 @@ async def report_review(
 async def mark_unmark_review_as_helpful(
         review_id: str,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     review_id = validate_object_id(review_id)
     user_id = current_user['_id']
@@ -881,48 +911,34 @@ async def mark_unmark_review_as_helpful(
 async def migrate_user(
         user_migration: UserMigration,
         current_user: UserDb = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> None:
     """
     Migrate user alcohol related data
     """
     user_id = current_user['_id']
-    for alcohol_id in user_migration.wishlist:
-        if not await UserWishlistHandler.check_if_alcohol_in_wishlist(db.user_wishlist, user_id, ObjectId(alcohol_id)):
-            await UserWishlistHandler.add_alcohol_to_wishlist(db.user_wishlist, user_id, ObjectId(alcohol_id))
-
-    for alcohol_id in user_migration.favourites:
-        if not await UserFavouritesHandler \
-                .check_if_alcohol_in_favourites(db.user_favourites, user_id, ObjectId(alcohol_id)):
-            await UserFavouritesHandler.add_alcohol_to_favourites(db.user_favourites, user_id, ObjectId(alcohol_id))
-
+    wishlist = list(dict.fromkeys(ObjectId(alcohol_id) for alcohol_id in user_migration.wishlist))
+    favourites = list(dict.fromkeys(ObjectId(alcohol_id) for alcohol_id in user_migration.favourites))
+    search_dates = {}
     for alcohol_history in user_migration.search_history:
-        await SearchHistoryHandler.add_alcohol_to_search_history(
-            db.user_search_history,
-            user_id,
-            ObjectId(alcohol_history.alcohol_id),
-            alcohol_history.date
-        )
-
+        alcohol_id = ObjectId(alcohol_history.alcohol_id)
+        if alcohol_id not in search_dates or search_dates[alcohol_id] < alcohol_history.date:
+            search_dates[alcohol_id] = alcohol_history.date
+    tags = {}
     for alcohol_tag in user_migration.tags:
-        if not await UserTagDatabaseHandler.check_if_user_tag_exists(
-                db.user_tags,
-                alcohol_tag.tag_name,
-                current_user['_id']
-        ):
-            await UserTagDatabaseHandler.create_user_tag_with_alcohols(
-                db.user_tags,
-                current_user['_id'],
-                alcohol_tag.tag_name,
-                [ObjectId(alcohol_id) for alcohol_id in alcohol_tag.alcohols]
-            )
-        else:
-            await UserTagDatabaseHandler.add_alcohols(
-                db.user_tags,
-                current_user['_id'],
-                alcohol_tag.tag_name,
-                [ObjectId(alcohol_id) for alcohol_id in alcohol_tag.alcohols]
-            )
+        tags.setdefault(alcohol_tag.tag_name, []).extend(ObjectId(alcohol_id) for alcohol_id in alcohol_tag.alcohols)
+
+    if wishlist:
+        await UserWishlistHandler.add_alcohols_to_wishlist(db.user_wishlist, user_id, wishlist)
+    if favourites:
+        await UserFavouritesHandler.add_alcohols_to_favourites(db.user_favourites, user_id, favourites)
+    if search_dates:
+        await SearchHistoryHandler.merge_into_search_history(
+            db.user_search_history, user_id, search_dates, settings.SEARCH_HISTORY_MAX_LENGTH
+        )
+    if tags:
+        await UserTagDatabaseHandler.add_alcohols_to_tags(db.user_tags, user_id, tags)
 
 
 @router.get(
@@ -935,11 +951,11 @@ async def migrate_user(
 async def get_recommendations(
         current_user: UserDb = Depends(get_valid_user),
         client: RecommenderClient = Depends(recommender_client),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     recommendations = [
         ObjectId(alcohol_id) for alcohol_id in
-        client.fetch_recommendations(str(current_user.get('_id')))['recommendations']
+        (await client.fetch_recommendations(str(current_user.get('_id'))))['recommendations']
     ]
     recommendations = await AlcoholDatabaseHandler.get_alcohols_by_ids(db.alcohols, recommendations)
     return AlcoholRecommendation(
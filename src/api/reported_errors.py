@@ -1,4 +1,4 @@
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from fastapi import APIRouter, Depends, status, Response
 
 from src.infrastructure.database.models.user import User
@@ -19,7 +19,7 @@ router = APIRouter(prefix='/errors', tags=['errors'])
 async def create_error(
         reported_error_create_payload: ReportedErrorCreate,
         current_user: User = Depends(get_valid_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     await DatabaseHandler.create_reported_error(
         db.reported_errors, current_user['_id'], current_user['username'], reported_error_create_payload
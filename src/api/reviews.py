@@ -1,12 +1,12 @@
 from bson import ObjectId
-from pymongo.database import Database
 from fastapi import APIRouter, Depends, status
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from src.domain.review import Review
 from src.domain.common import PageInfo
 from src.domain.review.user_review import UserReview
 from src.infrastructure.database.database_config import get_db
 from src.infrastructure.auth.auth_utils import get_optional_user
+from src.infrastructure.common.fast_json import fast_json_response
 from src.domain.review.paginated_user_reviews import PaginatedUserReview
 from src.infrastructure.common.validate_object_id import validate_object_id
 from src.infrastructure.database.models.review import ReviewDatabaseHandler
@@ -14,6 +14,7 @@ from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
 from src.infrastructure.database.models.user import UserDatabaseHandler, User
 from src.domain.review.paginated_alcohol_review import PaginatedAlcoholReview
 from src.infrastructure.exceptions.users_exceptions import UserNotFoundException
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 from src.infrastructure.exceptions.alcohol_exceptions import AlcoholNotFoundException
 
 router = APIRouter(prefix='/reviews', tags=['reviews'])
@@ -35,7 +36,8 @@ async def get_reviews(
         limit: int = 10,
         offset: int = 0,
         current_user: User | None = Depends(get_optional_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> PaginatedAlcoholReview:
     alcohol_id = validate_object_id(alcohol_id)
     user_id = None if not current_user else current_user.get('_id')
@@ -49,29 +51,31 @@ async def get_reviews(
     )
     total = await ReviewDatabaseHandler.count_alcohol_reviews(db.reviews, alcohol_id)
     my_review = next((review for review in reviews if review['user_id'] == user_id), None) if user_id else None
-    return PaginatedAlcoholReview(
-        reviews=[
-            Review(
-                **review,
-                reported=handle_reporters(
+    page = {
+        'reviews': [
+            review | {
+                'reported': handle_reporters(
                     review['reporters'],
                     user_id,
                     review['user_id']
                 ) if user_id else False,
-                helpful=handle_reporters(
+                'helpful': handle_reporters(
                     review['helpful_reporters'],
                     user_id,
                     review['user_id']
                 ) if user_id else False
-            ) for review in reviews
+            } for review in reviews
         ],
-        my_review=my_review,
-        page_info=PageInfo(
+        'my_review': my_review,
+        'page_info': PageInfo(
             limit=limit,
             offset=offset,
             total=total
         )
-    )
+    }
+    if settings.FAST_JSON_RESPONSES:
+        return fast_json_response(PaginatedAlcoholReview, page)
+    return PaginatedAlcoholReview(**page)
 
 
 @router.get(
@@ -86,7 +90,7 @@ async def get_user_reviews(
         limit: int = 10,
         offset: int = 0,
         current_user: User | None = Depends(get_optional_user),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ) -> PaginatedUserReview:
     user_id = validate_object_id(user_id)
     current_user_id = None if not current_user else current_user.get('_id')
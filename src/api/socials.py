@@ -1,18 +1,18 @@
 from starlette import status
-from pymongo.database import Database
 from fastapi import APIRouter, Depends, Query
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from src.domain.common import PageInfo
 from src.domain.user.user_info import UserInfo
+from src.domain.common import PageInfo, CursorPageInfo
 from src.infrastructure.database.models.user import User
 from src.infrastructure.auth.auth_utils import get_valid_user
 from src.infrastructure.database.database_config import get_db
 from src.infrastructure.database.models.user import UserDatabaseHandler
 from src.infrastructure.common.validate_object_id import validate_object_id
 from src.infrastructure.exceptions.users_exceptions import UserNotFoundException
-from src.domain.user.paginated_user_info import PaginatedUserSocial, PaginatedExtendedUserSocial
-from src.infrastructure.database.models.socials.following_database_handler import FollowingDatabaseHandler
-from src.infrastructure.database.models.socials.followers_database_handler import FollowersDatabaseHandler
+from src.infrastructure.socials.social_graph import SocialGraph, social_graph, FOLLOWERS, FOLLOWING
+from src.domain.user.paginated_user_info import PaginatedUserSocial, PaginatedExtendedUserSocial, \
+    CursorPaginatedUserSocial
 from src.infrastructure.exceptions\
     .invalid_users_search_parameters_exception import InvalidUsersSearchParametersException
 
@@ -22,7 +22,7 @@ router = APIRouter(prefix='/socials', tags=['socials'])
 
 @router.get(
     path='/followers/{user_id}',
-    response_model=PaginatedUserSocial,
+    response_model=PaginatedUserSocial | CursorPaginatedUserSocial,
     status_code=status.HTTP_200_OK,
     summary='Read user followers with pagination',
     response_model_by_alias=False
@@ -31,16 +31,27 @@ async def get_followers(
         limit: int = 10,
         offset: int = 0,
         user_id: str = None,
-        db: Database = Depends(get_db),
-) -> PaginatedUserSocial:
+        cursor: str | None = Query(default=None),
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        graph: SocialGraph = Depends(social_graph)
+) -> PaginatedUserSocial | CursorPaginatedUserSocial:
     """
     Get user followers with pagination
+    - **cursor**: str - default None, opts in to keyset pagination ordered by user id, pass an empty cursor
+    for the first page and `next_cursor` of the previous page afterwards, `offset` is then ignored
     """
     user_id = validate_object_id(user_id)
-    users = await FollowersDatabaseHandler.get_followers_by_user_id(
-        limit, offset, db.followers, db.users, user_id
-    )
-    total = await FollowersDatabaseHandler.count_followers(db.followers, db.users, user_id)
+    if cursor is not None:
+        users, next_cursor, total = await graph.get_users_after(db, FOLLOWERS, user_id, limit, cursor)
+        return CursorPaginatedUserSocial(
+            users=users,
+            page_info=CursorPageInfo(
+                limit=limit,
+                next_cursor=next_cursor,
+                total=total
+            )
+        )
+    users, total = await graph.get_users(db, FOLLOWERS, user_id, limit, offset)
     return PaginatedUserSocial(
         users=users,
         page_info=PageInfo(
@@ -53,7 +64,7 @@ async def get_followers(
 
 @router.get(
     path='/following/{user_id}',
-    response_model=PaginatedUserSocial,
+    response_model=PaginatedUserSocial | CursorPaginatedUserSocial,
     status_code=status.HTTP_200_OK,
     summary='Read following users with pagination',
     response_model_by_alias=False
@@ -62,15 +73,27 @@ async def get_following(
         limit: int = 10,
         offset: int = 0,
         user_id: str = None,
-        db: Database = Depends(get_db),
-) -> PaginatedUserSocial:
+        cursor: str | None = Query(default=None),
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        graph: SocialGraph = Depends(social_graph)
+) -> PaginatedUserSocial | CursorPaginatedUserSocial:
     """
     Get following users with pagination
+    - **cursor**: str - default None, opts in to keyset pagination ordered by user id, pass an empty cursor
+    for the first page and `next_cursor` of the previous page afterwards, `offset` is then ignored
     """
     user_id = validate_object_id(user_id)
-    users = await FollowingDatabaseHandler.get_following_by_user_id(limit, offset, db.following, db.users, user_id)
-    total = await FollowingDatabaseHandler.count_following(db.following, db.users, user_id)
-
+    if cursor is not None:
+        users, next_cursor, total = await graph.get_users_after(db, FOLLOWING, user_id, limit, cursor)
+        return CursorPaginatedUserSocial(
+            users=users,
+            page_info=CursorPageInfo(
+                limit=limit,
+                next_cursor=next_cursor,
+                total=total
+            )
+        )
+    users, total = await graph.get_users(db, FOLLOWING, user_id, limit, offset)
     return PaginatedUserSocial(
         users=users,
         page_info=PageInfo(
@@ -92,7 +115,7 @@ async def search_users_by_phrase(
         limit: int = 10,
         offset: int = 0,
         phrase: str = Query(default=..., min_length=3),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         current_user: User = Depends(get_valid_user),
 ):
     """
@@ -125,8 +148,9 @@ async def search_users(
         offset: int = 0,
         phrase: str = Query(default=None, min_length=3),
         search_type: str = Query(default=None, min_length=3),
-        db: Database = Depends(get_db),
+        db: AsyncIOMotorDatabase = Depends(get_db),
         current_user: User = Depends(get_valid_user),
+        graph: SocialGraph = Depends(social_graph)
 ):
     """
     Context aware search for users with pagination.
@@ -156,10 +180,7 @@ async def search_users(
             )
         )
     elif search_type == 'following':
-        users = await FollowingDatabaseHandler.search_following_by_user_id(
-            limit, offset, db.following, db.users, phrase, user_id
-        )
-        total = await FollowingDatabaseHandler.count_following(db.following, db.users, user_id, phrase)
+        users, total = await graph.get_users(db, FOLLOWING, user_id, limit, offset, phrase)
 
         return PaginatedExtendedUserSocial(
             users=users,
@@ -170,10 +191,7 @@ async def search_users(
             )
         )
     elif search_type == 'followers':
-        users = await FollowersDatabaseHandler.search_followers_by_user_id(
-            limit, offset, db.followers, db.users, phrase, user_id
-        )
-        total = await FollowersDatabaseHandler.count_followers(db.followers, db.users, user_id, phrase)
+        users, total = await graph.get_users(db, FOLLOWERS, user_id, limit, offset, phrase)
         return PaginatedExtendedUserSocial(
             users=users,
             page_info=PageInfo(
@@ -195,7 +213,7 @@ async def search_users(
 )
 async def get_user_info(
         user_id: str,
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db)
 ):
     user_id = validate_object_id(user_id)
     if not await UserDatabaseHandler.check_if_user_exists(db.users, user_id=user_id):
@@ -0,0 +1,86 @@
+"""
+Per-item cost of mapping alcohols to the response shape, comparing the schema walk done
+for every alcohol with mappers precompiled once per category.
+Needs no database, categories and alcohols are generated in memory:
+`$ python -m src.benchmarks.alcohol_mapping --sizes 1000 10000`
+"""
+from timeit import repeat
+from argparse import ArgumentParser
+
+from src.infrastructure.alcohol.alcohol_mappers import map_alcohol_with_fields
+from src.infrastructure.alcohol.category_cache import compile_category_fields
+
+CATEGORIES = 6
+PROPERTIES_PER_CATEGORY = 12
+
+
+def build_categories() -> dict[str, dict]:
+    return {
+        f'kind_{index}': {
+            'title': f'kind_{index}',
+            'properties': {'kind': {'title': 'kategoria'}} | {
+                f'property_{index}_{number}': {'title': f'cecha {number}', 'bsonType': ['string', 'null']}
+                for number in range(PROPERTIES_PER_CATEGORY)
+            }
+        } for index in range(CATEGORIES)
+    }
+
+
+def build_alcohols(size: int, categories: dict[str, dict]) -> list[dict]:
+    titles = list(categories)
+    alcohols = []
+    for number in range(size):
+        kind = titles[number % len(titles)]
+        alcohol = {'name': f'alcohol {number}', 'kind': kind}
+        alcohol |= {name: 'value' for name in categories[kind]['properties'] if name != 'kind'}
+        alcohols.append(alcohol)
+    return alcohols
+
+
+def map_per_item(alcohols: list[dict], categories: dict[str, dict]) -> list[dict]:
+    for alcohol in alcohols:
+        category_properties = categories[alcohol['kind']]['properties'].copy()
+        del category_properties['kind']
+        alcohol['additional_properties'] = [
+            {
+                'name': property_name,
+                'display_name': property_metadata['title'],
+                'value': alcohol.pop(property_name, None)
+            } for property_name, property_metadata in category_properties.items()
+        ]
+    return alcohols
+
+
+def map_compiled(alcohols: list[dict], categories: dict[str, dict]) -> list[dict]:
+    fields = {title: compile_category_fields(category) for title, category in categories.items()}
+    return [map_alcohol_with_fields(alcohol, fields[alcohol['kind']]) for alcohol in alcohols]
+
+
+def measure(mapper, size: int, categories: dict[str, dict], rounds: int) -> float:
+    timings = repeat(
+        stmt='mapper(alcohols, categories)',
+        setup='alcohols = build_alcohols(size, categories)',
+        globals={'mapper': mapper, 'build_alcohols': build_alcohols, 'size': size, 'categories': categories},
+        number=1,
+        repeat=rounds
+    )
+    return min(timings) / size * 1_000_000
+
+
+def main(sizes: list[int], rounds: int) -> None:
+    categories = build_categories()
+    for size in sizes:
+        per_item = measure(map_per_item, size, categories, rounds)
+        compiled = measure(map_compiled, size, categories, rounds)
+        print(f'alcohols={size}')
+        print(f'per item schema walk: {per_item:8.3f} us/alcohol')
+        print(f'precompiled mapper:   {compiled:8.3f} us/alcohol')
+        print(f'speedup:              {per_item / compiled:8.2f}x')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.rounds)
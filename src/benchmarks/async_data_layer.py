@@ -0,0 +1,58 @@
+"""
+Throughput of the blocking pymongo data layer compared to motor.
+Every simulated request reads a page of alcohols, the way `POST /alcohols` does.
+Run from the repository root against a seeded database:
+`$ python -m src.benchmarks.async_data_layer --requests 500 --concurrency 50`
+"""
+from time import perf_counter
+from pymongo import MongoClient
+from argparse import ArgumentParser
+from asyncio import gather, run, Semaphore
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.infrastructure.config.app_config import get_settings
+
+
+async def blocking_request(client: MongoClient, limit: int) -> None:
+    list(client.alkoholove.alcohols.find({}).sort('name').limit(limit))
+
+
+async def async_request(client: AsyncIOMotorClient, limit: int) -> None:
+    await client.alkoholove.alcohols.find({}).sort('name').limit(limit).to_list(None)
+
+
+async def measure(request, client, requests: int, concurrency: int, limit: int) -> float:
+    semaphore = Semaphore(concurrency)
+
+    async def _request():
+        async with semaphore:
+            await request(client, limit)
+
+    start = perf_counter()
+    await gather(*(_request() for _ in range(requests)))
+    return requests / (perf_counter() - start)
+
+
+async def main(requests: int, concurrency: int, limit: int) -> None:
+    url = get_settings().DATABASE_URL
+    blocking_client = MongoClient(url, maxPoolSize=concurrency)
+    async_client = AsyncIOMotorClient(url, maxPoolSize=concurrency)
+    try:
+        blocking = await measure(blocking_request, blocking_client, requests, concurrency, limit)
+        non_blocking = await measure(async_request, async_client, requests, concurrency, limit)
+    finally:
+        blocking_client.close()
+        async_client.close()
+    print(f'requests={requests} concurrency={concurrency} page={limit}')
+    print(f'pymongo (blocking): {blocking:10.1f} req/s')
+    print(f'motor (async):      {non_blocking:10.1f} req/s')
+    print(f'speedup:            {non_blocking / blocking:10.2f}x')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+    run(main(args.requests, args.concurrency, args.limit))
@@ -0,0 +1,92 @@
+"""
+Per-response CPU time of serializing a page of alcohols, comparing the validated path FastAPI takes for a
+returned model (construct, validate against the response model, `jsonable_encoder`, `json.dumps`)
+with the lightweight serializer writing the documents with orjson.
+Needs no database, alcohols are generated in memory:
+`$ python -m src.benchmarks.json_responses --sizes 10 50 100`
+"""
+from bson import ObjectId
+from time import process_time
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.utils import create_response_field
+
+from src.domain.common import PageInfo
+from src.domain.alcohol import PaginatedAlcohol, CursorPaginatedAlcohol
+from src.infrastructure.common.fast_json import fast_json_response
+
+PROPERTIES = 12
+RESPONSE_FIELD = create_response_field(name='response', type_=PaginatedAlcohol | CursorPaginatedAlcohol)
+
+
+def build_page(size: int) -> dict:
+    created = datetime(2022, 6, 1)
+    alcohols = [
+        {
+            '_id': ObjectId(),
+            'name': f'alcohol {number}',
+            'kind': 'wódka',
+            'type': 'czysta',
+            'alcohol_by_volume': 40,
+            'description': ' '.join(['opis'] * 20),
+            'color': 'bezbarwny',
+            'manufacturer': 'producent',
+            'country': 'polska',
+            'barcode': [f'59000000{number:05}'],
+            'keywords': ['wódka', 'czysta'],
+            'food': ['śledź'],
+            'taste': ['łagodny'],
+            'aroma': ['zbożowy'],
+            'finish': ['krótki'],
+            'vintage': 2020,
+            'rate_count': number,
+            'rate_value': number * 4,
+            'avg_rating': 4,
+            **{f'rate_{rate}_count': 0 for rate in range(1, 6)},
+            'created_at': created + timedelta(minutes=number),
+            'additional_properties': [
+                {'name': f'property_{index}', 'display_name': f'cecha {index}', 'value': 'wartość'}
+                for index in range(PROPERTIES)
+            ]
+        } for number in range(size)
+    ]
+    return {'alcohols': alcohols, 'page_info': PageInfo(limit=size, offset=0, total=size * 10)}
+
+
+def validated(page: dict) -> bytes:
+    value, errors = RESPONSE_FIELD.validate(PaginatedAlcohol(**page), {}, loc=('response',))
+    if errors:
+        raise ValueError(errors)
+    return JSONResponse(jsonable_encoder(value, by_alias=False)).body
+
+
+def fast(page: dict) -> bytes:
+    return fast_json_response(PaginatedAlcohol, page).body
+
+
+def measure(serialize, page: dict, rounds: int) -> float:
+    start = process_time()
+    for _ in range(rounds):
+        serialize(page)
+    return (process_time() - start) / rounds * 1000
+
+
+def main(sizes: list[int], rounds: int) -> None:
+    for size in sizes:
+        page = build_page(size)
+        validated_time = measure(validated, page, rounds)
+        fast_time = measure(fast, page, rounds)
+        print(f'page size={size}')
+        print(f'validated model:       {validated_time:8.3f} ms/response')
+        print(f'serializer and orjson: {fast_time:8.3f} ms/response')
+        print(f'speedup:               {validated_time / fast_time:8.2f}x')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+    main(args.sizes, args.rounds)
@@ -0,0 +1,41 @@
+"""
+Latency of `/alcohols/search_values` prefix lookups served by the in-memory facet index
+as the number of distinct values grows. Needs no database, values are generated in memory:
+`$ python -m src.benchmarks.search_values --sizes 1000 10000 100000`
+"""
+from random import Random
+from timeit import repeat
+from argparse import ArgumentParser
+from string import ascii_lowercase
+
+from src.infrastructure.alcohol.facet_index import _FieldValues
+
+LOOKUPS = 1000
+
+
+def build_values(size: int, random: Random) -> dict[str, int]:
+    values = {}
+    while len(values) < size:
+        values[''.join(random.choices(ascii_lowercase, k=random.randint(4, 12)))] = random.randint(1, 5)
+    return values
+
+
+def main(sizes: list[int], rounds: int) -> None:
+    random = Random(0)
+    for size in sizes:
+        field_values = _FieldValues(build_values(size, random))
+        phrases = [''.join(random.choices(ascii_lowercase, k=random.randint(1, 3))) for _ in range(LOOKUPS)]
+        timings = repeat(
+            lambda: [field_values.search(phrase, 10, 0) for phrase in phrases],
+            number=1,
+            repeat=rounds
+        )
+        print(f'values={size:>8}: {min(timings) / LOOKUPS * 1_000_000:8.2f} us/lookup')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.rounds)
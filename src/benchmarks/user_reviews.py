@@ -0,0 +1,62 @@
+"""
+Latency of reading a page of user reviews joined to their alcohols, one `find_one` per review
+compared to a single batched `$in` fetch. Run from the repository root against a seeded database,
+reviews of the user with the most reviews are read:
+`$ python -m src.benchmarks.user_reviews --limits 10 50 100`
+"""
+from time import perf_counter
+from argparse import ArgumentParser
+from asyncio import run
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.infrastructure.config.app_config import get_settings
+from src.infrastructure.database.models.review import ReviewDatabaseHandler
+
+
+async def per_review_lookup(db, limit: int, user_id) -> None:
+    reviews = await db.reviews.find({'user_id': user_id}).limit(limit).to_list(None)
+    for review in reviews:
+        review['alcohol'] = await db.alcohols.find_one({'_id': review['alcohol_id']})
+
+
+async def batched_lookup(db, limit: int, user_id) -> None:
+    await ReviewDatabaseHandler.get_user_reviews(db.reviews, db.alcohols, limit, 0, user_id)
+
+
+async def measure(lookup, db, limit: int, user_id, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = perf_counter()
+        await lookup(db, limit, user_id)
+        timings.append(perf_counter() - start)
+    return min(timings) * 1000
+
+
+async def main(limits: list[int], rounds: int) -> None:
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    db = client.alkoholove
+    try:
+        top_user = await db.reviews.aggregate([
+            {'$group': {'_id': '$user_id', 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1}},
+            {'$limit': 1}
+        ]).to_list(None)
+        if not top_user:
+            print('no reviews in the database')
+            return
+        user_id, count = top_user[0]['_id'], top_user[0]['count']
+        print(f'user={user_id} reviews={count}')
+        for limit in limits:
+            per_review = await measure(per_review_lookup, db, limit, user_id, rounds)
+            batched = await measure(batched_lookup, db, limit, user_id, rounds)
+            print(f'limit={limit:>4}: find_one per review {per_review:8.2f} ms, batched $in {batched:8.2f} ms')
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--limits', type=int, nargs='+', default=[10, 50, 100])
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    run(main(args.limits, args.rounds))
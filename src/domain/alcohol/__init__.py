@@ -3,4 +3,5 @@ from src.domain.alcohol.alcohol import Alcohol
 from src.domain.alcohol.alcohol_create import AlcoholCreate
 from src.domain.alcohol.alcohol_update import AlcoholUpdate
 from src.domain.alcohol.paginated_alcohol import PaginatedAlcohol
+from src.domain.alcohol.cursor_paginated_alcohol import CursorPaginatedAlcohol
 from src.domain.alcohol.alcohol_recommendation import AlcoholRecommendation
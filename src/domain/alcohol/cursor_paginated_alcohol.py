@@ -0,0 +1,8 @@
+from src.domain.alcohol import Alcohol
+from src.domain.common import CursorPageInfo
+from src.domain.common.base_model import BaseModel
+
+
+class CursorPaginatedAlcohol(BaseModel):
+    alcohols: list[Alcohol]
+    page_info: CursorPageInfo
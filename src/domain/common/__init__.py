@@ -1,3 +1,4 @@
 from src.domain.common.page_info import PageInfo
+from src.domain.common.cursor_page_info import CursorPageInfo
 from src.domain.common.mongo_wrapper import PyObjectId
 from src.domain.common.mongo_wrapper import MongoBaseModel
@@ -0,0 +1,7 @@
+from src.domain.common.base_model import BaseModel
+
+
+class CursorPageInfo(BaseModel):
+    limit: int
+    next_cursor: str | None
+    total: int | None
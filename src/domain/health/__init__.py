@@ -0,0 +1,7 @@
+from src.domain.health.cache_info import CacheInfo
+from src.domain.health.mail_queue_info import MailQueueInfo
+from src.domain.health.database_status import DatabaseStatus
+from src.domain.health.database_health import DatabaseHealth
+from src.domain.health.connection_pool_info import ConnectionPoolInfo
+from src.domain.health.password_hashing_info import PasswordHashingInfo
+from src.domain.health.review_screening_info import ReviewScreeningInfo
@@ -0,0 +1,10 @@
+from src.domain.common.base_model import BaseModel
+
+
+class CacheInfo(BaseModel):
+    name: str
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_ratio: float
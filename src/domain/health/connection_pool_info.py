@@ -0,0 +1,13 @@
+from src.domain.common.base_model import BaseModel
+
+
+class ConnectionPoolInfo(BaseModel):
+    address: str
+    max_pool_size: int
+    min_pool_size: int
+    open_connections: int
+    in_use: int
+    available: int
+    waiting: int
+    wait_queue_timeouts: int
+    saturation: float
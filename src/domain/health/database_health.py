@@ -0,0 +1,6 @@
+from src.domain.health.database_status import DatabaseStatus
+from src.domain.health.connection_pool_info import ConnectionPoolInfo
+
+
+class DatabaseHealth(DatabaseStatus):
+    pools: list[ConnectionPoolInfo]
@@ -0,0 +1,5 @@
+from src.domain.common.base_model import BaseModel
+
+
+class DatabaseStatus(BaseModel):
+    status: str
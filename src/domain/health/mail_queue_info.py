@@ -0,0 +1,9 @@
+from src.domain.common.base_model import BaseModel
+
+
+class MailQueueInfo(BaseModel):
+    pending: int
+    dead_letters: int
+    sent: int
+    failed: int
+    dead_lettered: int
@@ -0,0 +1,12 @@
+from src.domain.common.base_model import BaseModel
+
+
+class PasswordHashingInfo(BaseModel):
+    pool_size: int
+    queue_limit: int
+    in_flight: int
+    rejected: int
+    logins: int
+    login_latency_avg_ms: float
+    login_latency_p95_ms: float
+    login_latency_max_ms: float
@@ -0,0 +1,10 @@
+from src.domain.common.base_model import BaseModel
+
+
+class ReviewScreeningInfo(BaseModel):
+    pending: int
+    dead_letters: int
+    screened: int
+    flagged: int
+    failed: int
+    dead_lettered: int
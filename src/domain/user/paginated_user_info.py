@@ -1,4 +1,4 @@
-from src.domain.common import PageInfo
+from src.domain.common import PageInfo, CursorPageInfo
 from src.domain.common.base_model import BaseModel
 from src.domain.user.user_social import UserSocial, ExtendedUserSocial
 
@@ -10,3 +10,8 @@ class PaginatedUserSocial(BaseModel):
 
 class PaginatedExtendedUserSocial(PaginatedUserSocial):
     users: list[ExtendedUserSocial]
+
+
+class CursorPaginatedUserSocial(BaseModel):
+    users: list[UserSocial]
+    page_info: CursorPageInfo
@@ -1,32 +1,28 @@
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
-from src.infrastructure.database.models.alcohol_category import AlcoholCategory
-from src.infrastructure.database.models.alcohol_category import AlcoholCategoryDatabaseHandler
+from src.infrastructure.alcohol.category_cache import category_cache, CategoryFields
 
 
-def map_alcohol(
-        alcohol: dict,
-        collection: Collection[AlcoholCategory]
-) -> dict:
-    category_properties = AlcoholCategoryDatabaseHandler.get_category_by_title(
-        collection, alcohol['kind']
-    )['properties'].copy()
-    del category_properties['kind']
-
-    mapped_properties = [
-        {
-            'name': property_name,
-            'display_name': property_metadata['title'],
-            'value': alcohol.pop(property_name, None)
-        } for property_name, property_metadata in category_properties.items()
+def map_alcohol_with_fields(alcohol: dict, fields: CategoryFields) -> dict:
+    pop = alcohol.pop
+    alcohol['additional_properties'] = [
+        {'name': field, 'display_name': display_name, 'value': pop(field, None)}
+        for field, display_name in fields
     ]
-
-    alcohol['additional_properties'] = mapped_properties
     return alcohol
 
 
-def map_alcohols(
+async def map_alcohol(
+        alcohol: dict,
+        collection: AsyncIOMotorCollection
+) -> dict:
+    fields = await category_cache.get_fields(collection, {alcohol['kind']})
+    return map_alcohol_with_fields(alcohol, fields[alcohol['kind']])
+
+
+async def map_alcohols(
         alcohols: list[dict],
-        collection: Collection[AlcoholCategory]
+        collection: AsyncIOMotorCollection
 ) -> list[dict]:
-    return [map_alcohol(alcohol, collection) for alcohol in alcohols]
+    fields = await category_cache.get_fields(collection, {alcohol['kind'] for alcohol in alcohols})
+    return [map_alcohol_with_fields(alcohol, fields[alcohol['kind']]) for alcohol in alcohols]
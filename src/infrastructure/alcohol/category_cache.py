@@ -0,0 +1,129 @@
+from asyncio import Lock
+from time import monotonic
+from logging import getLogger
+from pymongo.errors import PyMongoError
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.alcohol_category import AlcoholCategory
+from src.infrastructure.database.models.alcohol_category import AlcoholCategoryDatabaseHandler
+
+logger = getLogger(__name__)
+
+CategoryFields = tuple[tuple[str, str], ...]
+
+# unknown titles reload the categories at most this often, misses in between are answered from memory
+MISS_RELOAD_INTERVAL = 5
+
+
+def compile_category_fields(category: AlcoholCategory) -> CategoryFields:
+    """Flatten a category schema into `(field, display_name)` pairs of its additional properties."""
+    return tuple(
+        (property_name, property_metadata['title'])
+        for property_name, property_metadata in category['properties'].items()
+        if property_name != 'kind'
+    )
+
+
+class AlcoholCategoryCache:
+    """
+    Keeps every alcohol category schema in memory, keyed by title.
+    Categories are loaded all at once on first use and reloaded after admin mutations,
+    or on every change made by other workers when `watch` is running.
+    Requests waiting for a load in progress reuse its result instead of loading again.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._categories: dict[str, AlcoholCategory] | None = None
+        self._fields: dict[str, CategoryFields] = {}
+        self._generation = 0
+        self._missed_at = float('-inf')
+
+    @property
+    def loaded(self) -> bool:
+        return self._categories is not None
+
+    def invalidate(self) -> None:
+        self._categories = None
+        self._generation += 1
+        self._missed_at = float('-inf')
+
+    async def refresh(self, collection: AsyncIOMotorCollection) -> dict[str, AlcoholCategory]:
+        async with self._lock:
+            return await self._load(collection)
+
+    async def _refresh_stale(
+            self,
+            collection: AsyncIOMotorCollection,
+            stale: dict[str, AlcoholCategory] | None
+    ) -> dict[str, AlcoholCategory]:
+        async with self._lock:
+            # another request may have loaded the categories while this one waited for the lock
+            if self._categories is not None and self._categories is not stale:
+                return self._categories
+            return await self._load(collection)
+
+    async def _load(self, collection: AsyncIOMotorCollection) -> dict[str, AlcoholCategory]:
+        generation = self._generation
+        categories = {
+            category['title']: category
+            for category in await AlcoholCategoryDatabaseHandler.get_all_categories(collection)
+        }
+        fields = {title: compile_category_fields(category) for title, category in categories.items()}
+        # an invalidation during the load means the result may already be stale
+        if generation == self._generation:
+            self._categories, self._fields = categories, fields
+        return categories
+
+    def _reload_on_miss(self) -> bool:
+        now = monotonic()
+        if now - self._missed_at < MISS_RELOAD_INTERVAL:
+            return False
+        self._missed_at = now
+        return True
+
+    async def get_all(self, collection: AsyncIOMotorCollection) -> dict[str, AlcoholCategory]:
+        categories = self._categories
+        if categories is None:
+            return await self._refresh_stale(collection, categories)
+        return categories
+
+    async def get(self, collection: AsyncIOMotorCollection, title: str) -> AlcoholCategory | None:
+        categories = await self.get_all(collection)
+        if title not in categories and self._reload_on_miss():
+            # the category may have been added by another worker
+            categories = await self._refresh_stale(collection, categories)
+        return categories.get(title)
+
+    async def get_many(self, collection: AsyncIOMotorCollection, titles: set[str]) -> dict[str, AlcoholCategory]:
+        categories = await self.get_all(collection)
+        if not titles <= categories.keys() and self._reload_on_miss():
+            categories = await self._refresh_stale(collection, categories)
+        return {title: categories[title] for title in titles if title in categories}
+
+    async def get_fields(
+            self,
+            collection: AsyncIOMotorCollection,
+            titles: set[str]
+    ) -> dict[str, CategoryFields]:
+        categories = await self.get_many(collection, titles)
+        fields = self._fields
+        return {
+            title: fields[title] if title in fields else compile_category_fields(category)
+            for title, category in categories.items()
+        }
+
+    async def watch(self, collection: AsyncIOMotorCollection) -> None:
+        """
+        Reload the cache on every change of the categories collection.
+        Change streams require a replica set, on a standalone server the cache relies on invalidation only.
+        """
+        try:
+            async with collection.watch() as stream:
+                async for _ in stream:
+                    self.invalidate()
+                    await self.refresh(collection)
+        except PyMongoError as ex:
+            logger.warning('Alcohol category change stream stopped: %s', ex)
+
+
+category_cache = AlcoholCategoryCache()
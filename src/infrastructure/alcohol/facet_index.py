@@ -0,0 +1,113 @@
+from asyncio import Lock
+from time import monotonic
+from bisect import bisect_left, insort
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.infrastructure.alcohol.category_cache import category_cache
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+from src.infrastructure.database.models.alcohol_category import AlcoholCategory
+
+
+class _FieldValues:
+    """
+    Distinct string values of one alcohol field sorted case-insensitively,
+    with the number of alcohols holding each value so removals know when a value disappears.
+    """
+    def __init__(self, counts: dict[str, int]):
+        self.counts = {value: count for value, count in counts.items() if isinstance(value, str)}
+        self.keys = sorted((value.lower(), value) for value in self.counts)
+        self.built_at = monotonic()
+
+    def add(self, value: str) -> None:
+        if value not in self.counts:
+            self.counts[value] = 0
+            insort(self.keys, (value.lower(), value))
+        self.counts[value] += 1
+
+    def remove(self, value: str) -> None:
+        if value not in self.counts:
+            return
+        self.counts[value] -= 1
+        if self.counts[value] <= 0:
+            del self.counts[value]
+            del self.keys[bisect_left(self.keys, (value.lower(), value))]
+
+    def search(self, phrase: str, limit: int, offset: int) -> list[str]:
+        prefix = phrase.lower()
+        start = bisect_left(self.keys, (prefix,))
+        end = bisect_left(self.keys, (prefix[:-1] + chr(ord(prefix[-1]) + 1),)) if prefix else len(self.keys)
+        stop = min(start + offset + limit, end) if limit else end
+        return [value for _, value in self.keys[start + offset:stop]]
+
+
+def facet_fields(categories: dict[str, AlcoholCategory]) -> set[str]:
+    """Properties of every category holding strings or arrays, the only fields values are searched in."""
+    return {
+        property_name
+        for category in categories.values()
+        for property_name, metadata in category['properties'].items()
+        if metadata and any(bson_type in metadata.get('bsonType', ()) for bson_type in ('array', 'string'))
+    }
+
+
+class FacetValueIndex:
+    """
+    In-memory prefix index of alcohol field values backing `/alcohols/search_values`.
+    A field is loaded with one aggregation on first lookup, kept up to date as alcohols
+    are created, updated or deleted on this worker and reloaded after `max_age` seconds.
+    Only fields of the category schemas are indexed, concurrent lookups of a stale field load it once.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._fields: dict[str, _FieldValues] = {}
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._fields.clear()
+        self._generation += 1
+
+    async def search(
+            self,
+            db: AsyncIOMotorDatabase,
+            field_name: str,
+            limit: int,
+            offset: int,
+            phrase: str | None,
+            max_age: float
+    ) -> list[str]:
+        field_values = self._fields.get(field_name)
+        if field_values is None or monotonic() - field_values.built_at > max_age:
+            if field_name not in facet_fields(await category_cache.get_all(db.alcohol_categories)):
+                return []
+            field_values = await self._load(db, field_name, max_age)
+        return field_values.search(phrase or '', limit, offset)
+
+    async def _load(self, db: AsyncIOMotorDatabase, field_name: str, max_age: float) -> _FieldValues:
+        async with self._lock:
+            # the field may have been loaded while this lookup waited for the lock
+            field_values = self._fields.get(field_name)
+            if field_values is not None and monotonic() - field_values.built_at <= max_age:
+                return field_values
+            generation = self._generation
+            field_values = _FieldValues(await AlcoholDatabaseHandler.count_values(field_name, db.alcohols))
+            # writes during the load may be missing from it, so only keep it if there were none
+            if generation == self._generation:
+                self._fields[field_name] = field_values
+            return field_values
+
+    def add_alcohol(self, alcohol: dict) -> None:
+        self._apply(alcohol, _FieldValues.add)
+
+    def remove_alcohol(self, alcohol: dict) -> None:
+        self._apply(alcohol, _FieldValues.remove)
+
+    def _apply(self, alcohol: dict, operation) -> None:
+        self._generation += 1
+        for field_name, field_values in self._fields.items():
+            value = alcohol.get(field_name)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, str):
+                    operation(field_values, item)
+
+
+facet_index = FacetValueIndex()
@@ -0,0 +1,149 @@
+from hashlib import sha1
+from asyncio import Lock
+from bisect import insort
+from time import monotonic
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.domain.alcohol_filter import AlcoholFiltersMetadata
+from src.infrastructure.alcohol.facet_index import facet_index
+from src.infrastructure.alcohol.category_cache import category_cache
+from src.infrastructure.database.models.alcohol_filter import AlcoholFilterDatabaseHandler
+
+translate = {
+    'color': 'kolor',
+    'kind': 'kategoria',
+    'country': 'kraj',
+    'type': 'typ',
+    'food': 'jedzenie',
+    'aroma': 'aromat',
+    'taste': 'smak'
+}
+
+
+class _FilterValues:
+    """
+    Sorted values of one filter together with a set for membership checks.
+    Kind filters only collect values of alcohols of their kind, property filters of every alcohol.
+    """
+    def __init__(self, kind: str | None, values: list[str]):
+        self.kind = kind
+        self.values = sorted({value for value in values if value != ''}, key=str.lower)
+        self.seen = set(self.values)
+
+    def add(self, value: str) -> bool:
+        if value == '' or value in self.seen:
+            return False
+        self.seen.add(value)
+        insort(self.values, value, key=str.lower)
+        return True
+
+
+class AlcoholFiltersSnapshot:
+    """
+    Materialized response of `GET /alcohols/filters`, serialized once and served from memory.
+    Alcohols created or updated on this worker are merged in incrementally, a full rebuild happens
+    on invalidation or after `max_age` seconds to pick up changes made by other workers.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._filters: list[dict] | None = None
+        self._values: list[tuple[str, _FilterValues]] = []
+        self._body = b''
+        self._etag = ''
+        self._built_at = 0.0
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._filters = None
+        self._generation += 1
+
+    def _stale(self, max_age: float) -> bool:
+        return self._filters is None or monotonic() - self._built_at > max_age
+
+    async def get(self, db: AsyncIOMotorDatabase, max_age: float) -> tuple[bytes, str]:
+        if self._stale(max_age):
+            await self.rebuild(db, max_age)
+        return self._body, self._etag
+
+    async def rebuild(self, db: AsyncIOMotorDatabase, max_age: float) -> None:
+        async with self._lock:
+            # requests queued behind a rebuild are served its result
+            if not self._stale(max_age):
+                return
+            generation = self._generation
+            filters, values = await self._build(db, max_age)
+            if generation == self._generation:
+                self._filters, self._values = filters, values
+                self._built_at = monotonic()
+                self._publish()
+
+    def add_alcohol(self, alcohol: dict) -> None:
+        """Merge filter values of a created or updated alcohol into the snapshot."""
+        if self._filters is None:
+            return
+        changed = False
+        for name, filter_values in self._values:
+            if filter_values.kind not in (None, alcohol['kind']):
+                continue
+            value = alcohol.get(name)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, str):
+                    changed |= filter_values.add(item)
+        if changed:
+            self._publish()
+
+    def _publish(self) -> None:
+        response = JSONResponse(content=jsonable_encoder(AlcoholFiltersMetadata(filters=self._filters)))
+        self._body = response.body
+        self._etag = f'"{sha1(self._body).hexdigest()}"'
+
+    @staticmethod
+    async def _build(
+            db: AsyncIOMotorDatabase,
+            max_age: float
+    ) -> tuple[list[dict], list[tuple[str, _FilterValues]]]:
+        db_filters = await AlcoholFilterDatabaseHandler.get_all_filters(db.alcohol_filters)
+        categories = await category_cache.get_all(db.alcohol_categories)
+        property_values: dict[str, list[str]] = {}
+        filters = []
+        all_values = []
+        for db_filter in db_filters:
+            kind = db_filter.pop('_id')
+            filter_dict = {
+                'name': 'kind',
+                'display_name': translate['kind'],
+                'value': kind,
+                'filters': []
+            }
+            for key, values in sorted(db_filter.items()):
+                filter_values = _FilterValues(kind, values)
+                all_values.append((key, filter_values))
+                filter_dict['filters'].append({
+                    'name': key,
+                    'display_name': translate[key],
+                    'values': filter_values.values
+                })
+            if category := categories.get(kind):
+                properties = category['properties']
+                for kind_property, metadata in properties.items():
+                    if kind_property in ('kind', 'temperature') or \
+                            not any(x in metadata['bsonType'] for x in ['array', 'string']):
+                        continue
+                    if kind_property not in property_values:
+                        property_values[kind_property] = await facet_index.search(
+                            db, kind_property, 0, 0, '', max_age
+                        )
+                    filter_values = _FilterValues(None, property_values[kind_property])
+                    all_values.append((kind_property, filter_values))
+                    filter_dict['filters'].append({
+                        'name': kind_property,
+                        'display_name': metadata['title'],
+                        'values': filter_values.values
+                    })
+            filters.append(filter_dict)
+        return filters, all_values
+
+
+filters_snapshot = AlcoholFiltersSnapshot()
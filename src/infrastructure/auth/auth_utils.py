@@ -1,24 +1,26 @@
 from datetime import timedelta
 from fastapi import Depends, Header
-from pymongo.database import Database
 from async_fastapi_jwt_auth import AuthJWT
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from src.infrastructure.database.models.user import User
+from src.infrastructure.auth.user_cache import user_cache
 from src.infrastructure.database.database_config import get_db
-from src.infrastructure.config.app_config import ApplicationSettings
-from src.infrastructure.database.models.user import UserDatabaseHandler as DatabaseHandler, User
-from src.infrastructure.database.models.token.token_database_handler import TokenBlacklistDatabaseHandler
+from src.infrastructure.auth.token_blacklist_cache import token_blacklist_cache
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 from src.infrastructure.exceptions.auth_exceptions import CredentialsException, UserBannedException, \
-    TokenRevokedException, InsufficientPermissionsException, EmailNotVerifiedException
+    TokenRevokedException, InsufficientPermissionsException, EmailNotVerifiedException, AccountDeletionPendingException
 
 
 async def get_valid_token(
         authorization: str | None = Header(default=None),
         authorize: AuthJWT = Depends(),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> str:
     await authorize.jwt_required()
     jti = (await authorize.get_raw_jwt())['jti']
-    if await TokenBlacklistDatabaseHandler.check_if_token_is_blacklisted(db.tokens_blacklist, jti):
+    if await token_blacklist_cache.is_revoked(db.tokens_blacklist, jti, settings.TOKEN_BLACKLIST_REFRESH_INTERVAL):
         raise TokenRevokedException(token_type='Access')
     return authorization.replace('Bearer ', '')
 
@@ -41,28 +43,33 @@ async def generate_tokens(subject: str, authorize: AuthJWT, settings: Applicatio
 async def get_optional_user(
         authorization: str | None = Header(default=None),
         authorize: AuthJWT = Depends(),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> User | None:
     return await get_valid_user(
-        await get_valid_token(authorization, authorize, db),
+        await get_valid_token(authorization, authorize, db, settings),
         authorize,
-        db
+        db,
+        settings
     ) if authorization else None
 
 
 async def get_valid_user(
         token: str = Depends(get_valid_token),
         authorize: AuthJWT = Depends(),
-        db: Database = Depends(get_db)
+        db: AsyncIOMotorDatabase = Depends(get_db),
+        settings: ApplicationSettings = Depends(get_settings)
 ) -> User:
     username = (await authorize.get_raw_jwt(token))['sub']
     if username is None:
         raise CredentialsException()
-    user = await DatabaseHandler.get_user_by_username(db.users, username)
+    user = await user_cache.get(db.users, username, settings.USER_CACHE_MAX_AGE, settings.USER_CACHE_MAX_SIZE)
     if not user:
         raise CredentialsException()
     if user['is_banned']:
         raise UserBannedException()
+    if user.get('deletion_pending'):
+        raise AccountDeletionPendingException()
     if not user['is_verified']:
         raise EmailNotVerifiedException()
     return user
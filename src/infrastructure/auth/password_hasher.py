@@ -0,0 +1,101 @@
+from threading import Lock
+from collections import deque
+from time import perf_counter
+from dataclasses import dataclass
+from asyncio import get_running_loop
+from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
+
+from src.infrastructure.config.app_config import get_settings
+from src.infrastructure.exceptions.auth_exceptions import AuthenticationOverloadedException
+
+pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+
+# login latencies kept for percentiles
+LATENCY_WINDOW = 1000
+
+
+@dataclass
+class PasswordHashingStats:
+    pool_size: int
+    queue_limit: int
+    in_flight: int
+    rejected: int
+    logins: int
+    login_latency_avg_ms: float
+    login_latency_p95_ms: float
+    login_latency_max_ms: float
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated thread pool, bcrypt releases the GIL so the event loop keeps serving
+    other requests meanwhile. At most `pool_size + queue_limit` hashes wait or run at once,
+    further ones are rejected with 503 instead of piling up behind a login storm.
+    Sizes not given are read from settings when the pool is first used.
+    """
+    def __init__(self, pool_size: int | None = None, queue_limit: int | None = None):
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pool_size = pool_size
+        self._queue_limit = queue_limit
+        self._in_flight = 0
+        self._rejected = 0
+        self._logins = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def _start(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            settings = get_settings()
+            if self._pool_size is None:
+                self._pool_size = max(int(settings.PASSWORD_HASHING_POOL_SIZE), 1)
+            if self._queue_limit is None:
+                self._queue_limit = max(int(settings.PASSWORD_HASHING_QUEUE_LIMIT), 0)
+            self._executor = ThreadPoolExecutor(self._pool_size, thread_name_prefix='password-hasher')
+        return self._executor
+
+    async def _run(self, function, *args):
+        executor = self._start()
+        with self._lock:
+            if self._in_flight >= self._pool_size + self._queue_limit:
+                self._rejected += 1
+                raise AuthenticationOverloadedException()
+            self._in_flight += 1
+        try:
+            return await get_running_loop().run_in_executor(executor, function, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed_password)
+
+    def record_login(self, started_at: float) -> None:
+        with self._lock:
+            self._logins += 1
+            self._latencies.append(perf_counter() - started_at)
+
+    def stats(self) -> PasswordHashingStats:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return PasswordHashingStats(
+                pool_size=self._pool_size or 0,
+                queue_limit=self._queue_limit or 0,
+                in_flight=self._in_flight,
+                rejected=self._rejected,
+                logins=self._logins,
+                login_latency_avg_ms=sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                login_latency_p95_ms=latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+                login_latency_max_ms=latencies[-1] * 1000 if latencies else 0.0
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
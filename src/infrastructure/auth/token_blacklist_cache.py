@@ -0,0 +1,69 @@
+from asyncio import Lock
+from bson import ObjectId
+from time import monotonic
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.token import TokenBlacklistDatabaseHandler
+
+# tokens revoked by other workers are read again this far back, ids are generated by their clocks
+CLOCK_SKEW = timedelta(minutes=1)
+# tokens revoked before expiration dates were stored in UTC hold the local time of the revoking host,
+# up to 12 hours early west of UTC, so every entry is kept that much longer
+LOCAL_TIME_SKEW = timedelta(hours=12)
+
+
+class TokenBlacklistCache:
+    """
+    Revoked token ids kept in memory with their expiration dates, so tokens that are not revoked
+    are accepted without a database round trip. The whole blacklist is loaded once, afterwards only
+    tokens revoked since the last refresh are read, at most every `max_age` seconds.
+    Tokens revoked on this worker are added right away, expired ones are evicted on refresh.
+    Expiration of a token is checked against its own `exp` when it is decoded, stored dates only decide eviction.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._revoked: dict[str, datetime] = {}
+        self._synced_at: datetime | None = None
+        self._refreshed_at = 0.0
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._revoked = {}
+        self._synced_at = None
+        self._generation += 1
+
+    def add(self, token_jti: str, expiration_date: datetime) -> None:
+        self._revoked[token_jti] = expiration_date
+
+    def _stale(self, max_age: float) -> bool:
+        return self._synced_at is None or monotonic() - self._refreshed_at >= max_age
+
+    async def refresh(self, collection: AsyncIOMotorCollection, max_age: float = 0) -> None:
+        async with self._lock:
+            # requests queued behind a refresh use its result
+            if not self._stale(max_age):
+                return
+            generation = self._generation
+            now = datetime.utcnow()
+            expiring_after = now - LOCAL_TIME_SKEW
+            inserted_after = ObjectId.from_datetime(self._synced_at - CLOCK_SKEW) if self._synced_at else None
+            tokens = await TokenBlacklistDatabaseHandler.get_blacklisted_tokens(
+                collection, expiring_after, inserted_after
+            )
+            if generation != self._generation:
+                return
+            revoked = {
+                jti: expiration_date for jti, expiration_date in self._revoked.items()
+                if expiration_date > expiring_after
+            }
+            revoked.update((token['token_jti'], token['expiration_date']) for token in tokens)
+            self._revoked, self._synced_at, self._refreshed_at = revoked, now, monotonic()
+
+    async def is_revoked(self, collection: AsyncIOMotorCollection, token_jti: str, max_age: int) -> bool:
+        if self._stale(max_age):
+            await self.refresh(collection, max_age)
+        return token_jti in self._revoked
+
+
+token_blacklist_cache = TokenBlacklistCache()
@@ -0,0 +1,66 @@
+from bson import ObjectId
+from time import monotonic
+from collections import OrderedDict
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.user import User, UserDatabaseHandler
+
+
+class UserCache:
+    """
+    Least recently used user documents of authenticated requests, keyed by username.
+    Entries expire after `max_age` seconds so changes made by other workers are picked up,
+    changes made on this worker invalidate the user right away, also when it is being read at that moment.
+    """
+    def __init__(self):
+        self._users: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self._usernames: dict[ObjectId, str] = {}
+        self._generation = 0
+        self.max_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def invalidate(self, username: str | None = None) -> None:
+        self._generation += 1
+        if username is None:
+            self._users.clear()
+            self._usernames.clear()
+            self.hits = self.misses = 0
+        else:
+            self._drop(username)
+
+    def invalidate_user_id(self, user_id: ObjectId) -> None:
+        # bumped even for users not cached yet, one may be being read
+        self._generation += 1
+        if username := self._usernames.get(user_id):
+            self._drop(username)
+
+    async def get(self, collection: AsyncIOMotorCollection, username: str, max_age: int, max_size: int) -> User | None:
+        self.max_size = max_size
+        entry = self._users.get(username)
+        if entry and monotonic() - entry[0] < max_age:
+            self._users.move_to_end(username)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        generation = self._generation
+        user = await UserDatabaseHandler.get_user_by_username(collection, username)
+        # an invalidation during the read means the user may already be stale
+        if user and max_age > 0 and max_size > 0 and generation == self._generation:
+            self._drop(username)
+            self._users[username] = (monotonic(), user)
+            self._usernames[user['_id']] = username
+            while len(self._users) > max_size:
+                _, (_, evicted) = self._users.popitem(last=False)
+                self._usernames.pop(evicted['_id'], None)
+        return user
+
+    def _drop(self, username: str) -> None:
+        if entry := self._users.pop(username, None):
+            self._usernames.pop(entry[1]['_id'], None)
+
+
+user_cache = UserCache()
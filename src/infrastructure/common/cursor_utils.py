@@ -0,0 +1,39 @@
+from types import NoneType
+from json import dumps, loads
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+
+from src.infrastructure.exceptions.pagination_exceptions import InvalidCursorException, InvalidCursorLimitException
+
+# types of the sort value carried by cursors of pages ordered by id only, by name and by search score
+ID_CURSOR = (NoneType,)
+NAME_CURSOR = (str,)
+SCORE_CURSOR = (int, float)
+
+
+def encode_cursor(sort_value: str | float | None, object_id: ObjectId) -> str:
+    return urlsafe_b64encode(dumps([sort_value, str(object_id)]).encode()).decode()
+
+
+def decode_cursor(
+        cursor: str,
+        limit: int,
+        sort_types: tuple[type, ...]
+) -> tuple[str | float | None, ObjectId] | None:
+    """
+    An empty cursor requests the first page. Sort values of other types than `sort_types` are rejected,
+    so a crafted cursor cannot put query operators into the filter.
+    """
+    if limit <= 0:
+        raise InvalidCursorLimitException()
+    if not cursor:
+        return None
+    try:
+        sort_value, object_id = loads(urlsafe_b64decode(cursor.encode()))
+        object_id = ObjectId(object_id)
+    except (ValueError, TypeError, InvalidId):
+        raise InvalidCursorException()
+    if isinstance(sort_value, bool) or not isinstance(sort_value, sort_types):
+        raise InvalidCursorException()
+    return sort_value, object_id
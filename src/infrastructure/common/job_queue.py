@@ -0,0 +1,97 @@
+from logging import getLogger
+from typing import Callable, Awaitable
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from asyncio import Event, wait_for, TimeoutError as WakeTimeoutError
+
+from src.infrastructure.database.models.job_queue import JobQueueDatabaseHandler
+
+logger = getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Base of background workers processing jobs queued in the `collection` collection, so requests never wait
+    for them. Due jobs are claimed in batches with a lease, failed ones are retried after `retry_delay` seconds,
+    doubled with every further attempt, and after `max_attempts` moved to the `dead_letters` collection.
+    Counters cover this worker.
+    """
+    def __init__(self, name: str, collection: str, dead_letters: str, retry_delay: float):
+        self.name = name
+        self.collection = collection
+        self.dead_letters = dead_letters
+        self.retry_delay = retry_delay
+        self._wake = Event()
+        self.running = False
+        self.failed = 0
+        self.dead_lettered = 0
+
+    def invalidate(self) -> None:
+        self.failed = self.dead_lettered = 0
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def claim(self, db: AsyncIOMotorDatabase, batch_size: int, lease: int) -> list[dict]:
+        return await JobQueueDatabaseHandler.claim_batch(db[self.collection], batch_size, lease)
+
+    async def complete(self, db: AsyncIOMotorDatabase, job: dict) -> None:
+        await JobQueueDatabaseHandler.complete(db[self.collection], job)
+
+    async def fail(
+            self,
+            db: AsyncIOMotorDatabase,
+            job: dict,
+            max_attempts: int,
+            exception: Exception,
+            record: dict
+    ) -> None:
+        """Retry the job with backoff, or move `record` of it to dead letters after `max_attempts`."""
+        if job['attempts'] + 1 >= max_attempts:
+            await self.dead_letter(db, job, exception, record)
+        else:
+            self.failed += 1
+            await JobQueueDatabaseHandler.retry(
+                db[self.collection], job, self.retry_delay * 2 ** job['attempts'], repr(exception)
+            )
+
+    async def dead_letter(self, db: AsyncIOMotorDatabase, job: dict, exception: Exception, record: dict) -> None:
+        """Move `record` of the job to dead letters right away, for failures no retry can fix."""
+        self.failed += 1
+        logger.warning('%s job %s failed after %d attempts: %r', self.name, job['_id'], job['attempts'] + 1, exception)
+        await JobQueueDatabaseHandler.dead_letter(
+            db[self.collection], db[self.dead_letters], job, record, repr(exception)
+        )
+        self.dead_lettered += 1
+
+    async def count_pending(self, db: AsyncIOMotorDatabase) -> int:
+        return await JobQueueDatabaseHandler.count_pending(db[self.collection])
+
+    async def run_batches(self, run_once: Callable[[], Awaitable[int]], interval: float) -> None:
+        """Call `run_once` until it finds no jobs, waking up on new jobs or every interval for retries."""
+        self.running = True
+        try:
+            await run_batches(self.name, run_once, interval, self._wake)
+        finally:
+            self.running = False
+
+
+async def run_batches(
+        name: str,
+        run_once: Callable[[], Awaitable[int]],
+        interval: float,
+        wake: Event | None = None
+) -> None:
+    """Call `run_once` until it finds no jobs, waking up when `wake` is set or every interval for retries."""
+    wake = wake or Event()
+    while True:
+        wake.clear()
+        try:
+            while await run_once():
+                pass
+        except Exception:
+            # the worker is never restarted, so it has to outlive any failure
+            logger.exception('processing %s jobs failed', name)
+        try:
+            await wait_for(wake.wait(), interval)
+        except WakeTimeoutError:
+            pass
@@ -0,0 +1,38 @@
+from time import monotonic
+from typing import Any, Hashable
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Least recently used values expiring `max_age` seconds after they were stored, with hit and miss counters."""
+    def __init__(self, name: str):
+        self.name = name
+        self._values: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.max_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def invalidate(self) -> None:
+        self._values.clear()
+        self.hits = self.misses = 0
+
+    def get(self, key: Hashable, max_age: float) -> Any | None:
+        entry = self._values.get(key)
+        if entry and monotonic() - entry[0] < max_age:
+            self._values.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, max_size: int) -> None:
+        self.max_size = max_size
+        if max_size <= 0:
+            return
+        self._values.pop(key, None)
+        self._values[key] = (monotonic(), value)
+        while len(self._values) > max_size:
+            self._values.popitem(last=False)
@@ -8,14 +8,46 @@ from pydantic import BaseSettings, root_validator, EmailStr
 
 class ApplicationSettings(BaseSettings):
     DATABASE_URL: str = getenv('DATABASE_URL')
+    DATABASE_MAX_POOL_SIZE: int = getenv('DATABASE_MAX_POOL_SIZE', 100)
+    DATABASE_MIN_POOL_SIZE: int = getenv('DATABASE_MIN_POOL_SIZE', 0)
+    DATABASE_WAIT_QUEUE_TIMEOUT_MS: int | None = getenv('DATABASE_WAIT_QUEUE_TIMEOUT_MS', None)
+    DATABASE_SERVER_SELECTION_TIMEOUT_MS: int = getenv('DATABASE_SERVER_SELECTION_TIMEOUT_MS', 30000)
+    DATABASE_COMPRESSORS: str = getenv('DATABASE_COMPRESSORS', '')
+    DATABASE_READ_PREFERENCE: str = getenv('DATABASE_READ_PREFERENCE', 'primary')
+    WATCH_ALCOHOL_CATEGORIES: bool = getenv('WATCH_ALCOHOL_CATEGORIES', False)
+    ALCOHOL_FILTERS_MAX_AGE: int = getenv('ALCOHOL_FILTERS_MAX_AGE', 300)
+    ALCOHOL_FACETS_MAX_AGE: int = getenv('ALCOHOL_FACETS_MAX_AGE', 300)
+    SEARCH_BACKEND: str = getenv('SEARCH_BACKEND', 'atlas')
+    SEARCH_INDEX_MAX_AGE: int = getenv('SEARCH_INDEX_MAX_AGE', 300)
+    SEARCH_HISTORY_MAX_LENGTH: int = getenv('SEARCH_HISTORY_MAX_LENGTH', 100)
+    SOCIAL_GRAPH_STORAGE: str = getenv('SOCIAL_GRAPH_STORAGE', 'embedded')
+    ACCOUNT_DELETION_BATCH_SIZE: int = getenv('ACCOUNT_DELETION_BATCH_SIZE', 500)
+    ACCOUNT_DELETION_LEASE: int = getenv('ACCOUNT_DELETION_LEASE', 300)
+    ACCOUNT_DELETION_INTERVAL: int = getenv('ACCOUNT_DELETION_INTERVAL', 60)
+    TOKEN_BLACKLIST_REFRESH_INTERVAL: int = getenv('TOKEN_BLACKLIST_REFRESH_INTERVAL', 5)
+    USER_CACHE_MAX_AGE: int = getenv('USER_CACHE_MAX_AGE', 10)
+    USER_CACHE_MAX_SIZE: int = getenv('USER_CACHE_MAX_SIZE', 10000)
+    PASSWORD_HASHING_POOL_SIZE: int = getenv('PASSWORD_HASHING_POOL_SIZE', 4)
+    PASSWORD_HASHING_QUEUE_LIMIT: int = getenv('PASSWORD_HASHING_QUEUE_LIMIT', 64)
     CLOUDINARY_CLOUD_NAME: str = getenv('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY: str = getenv('CLOUDINARY_API_KEY')
     CLOUDINARY_API_SECRET: str = getenv('CLOUDINARY_API_SECRET')
     ALCOHOL_IMAGES_DIR: str = getenv('ALCOHOL_IMAGES_DIR')
     ALCOHOL_SUGGESTION_IMAGES_DIR: str = getenv('ALCOHOL_SUGGESTION_IMAGES_DIR')
+    IMAGE_STORAGE: str = getenv('IMAGE_STORAGE', 'cloudinary')
+    IMAGE_STORAGE_DIR: str = getenv('IMAGE_STORAGE_DIR', 'images')
+    IMAGE_RESIZING_POOL_SIZE: int = getenv('IMAGE_RESIZING_POOL_SIZE', 2)
+    ALCOHOL_IMAGE_FORMATS: str = getenv('ALCOHOL_IMAGE_FORMATS', '')
+    FAST_JSON_RESPONSES: bool = getenv('FAST_JSON_RESPONSES', True)
     ALLOWED_ORIGINS: str = getenv('ALLOWED_ORIGINS', '*')
     DOCS_URL: str | None = getenv('DOCS_URL', None)
     RECOMMENDER_URL: str = getenv('RECOMMENDER_URL')
+    RECOMMENDER_TIMEOUT: float = getenv('RECOMMENDER_TIMEOUT', 2)
+    RECOMMENDER_MAX_RETRIES: int = getenv('RECOMMENDER_MAX_RETRIES', 1)
+    RECOMMENDER_MAX_CONNECTIONS: int = getenv('RECOMMENDER_MAX_CONNECTIONS', 20)
+    RECOMMENDER_CACHE_MAX_SIZE: int = getenv('RECOMMENDER_CACHE_MAX_SIZE', 10000)
+    RECOMMENDER_SIMILAR_CACHE_MAX_AGE: int = getenv('RECOMMENDER_SIMILAR_CACHE_MAX_AGE', 3600)
+    RECOMMENDER_RECOMMENDATIONS_CACHE_MAX_AGE: int = getenv('RECOMMENDER_RECOMMENDATIONS_CACHE_MAX_AGE', 60)
     ALGORITHM: str = getenv('ALGORITHM')
     SECRET_KEY: str = getenv('SECRET_KEY')
     authjwt_secret_key: str = ''
@@ -24,11 +56,23 @@ class ApplicationSettings(BaseSettings):
     EMAIL_PORT: int = getenv('EMAIL_PORT')
     EMAIL_PASSWORD: str = getenv('EMAIL_PASSWORD')
     EMAIL_FROM: str = getenv('EMAIL_FROM')
+    EMAIL_START_TLS: bool = getenv('EMAIL_START_TLS', True)
+    EMAIL_TIMEOUT: float = getenv('EMAIL_TIMEOUT', 10)
+    EMAIL_RATE_LIMIT: float = getenv('EMAIL_RATE_LIMIT', 5)
+    EMAIL_QUEUE_BATCH_SIZE: int = getenv('EMAIL_QUEUE_BATCH_SIZE', 20)
+    EMAIL_QUEUE_MAX_ATTEMPTS: int = getenv('EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+    EMAIL_QUEUE_LEASE: int = getenv('EMAIL_QUEUE_LEASE', 120)
+    EMAIL_QUEUE_INTERVAL: int = getenv('EMAIL_QUEUE_INTERVAL', 10)
     WEB_PORT: str = getenv('WEB_PORT')
     WEB_HOST: str = getenv('WEB_HOST')
     HOST: str = getenv('HOST')
     HOST_PORT: str = getenv('HOST_PORT')
     HATE_SPEECH_DETECTION_SERVICE_URL: str = getenv('HATE_SPEECH_DETECTION_SERVICE_URL')
+    REVIEW_SCREENING_TIMEOUT: float = getenv('REVIEW_SCREENING_TIMEOUT', 3)
+    REVIEW_SCREENING_BATCH_SIZE: int = getenv('REVIEW_SCREENING_BATCH_SIZE', 20)
+    REVIEW_SCREENING_MAX_ATTEMPTS: int = getenv('REVIEW_SCREENING_MAX_ATTEMPTS', 5)
+    REVIEW_SCREENING_LEASE: int = getenv('REVIEW_SCREENING_LEASE', 60)
+    REVIEW_SCREENING_INTERVAL: int = getenv('REVIEW_SCREENING_INTERVAL', 5)
 
     @root_validator
     def set_authjwt_secret_key(cls, values):
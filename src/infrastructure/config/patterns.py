@@ -2,3 +2,5 @@ from re import compile
 
 email_pattern = compile(r'[a-zA-Z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,3}')
 password_pattern = compile(r'^(?=.*\d)(?=.*[a-z])(?=.*[A-Z])(?=.*[a-zA-Z]).{8,}$')
+# image names become file names, path separators would let them escape the images folder
+image_name_pattern = compile(r'[\w-]+')
@@ -1,11 +1,45 @@
-from pymongo import MongoClient
-from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
-from src.infrastructure.config.app_config import get_settings
+from src.infrastructure.database.pool_monitor import ConnectionPoolMonitor
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 
-client = MongoClient(get_settings().DATABASE_URL)
-db: Database = client.alkoholove
+pool_monitor = ConnectionPoolMonitor()
+client: AsyncIOMotorClient | None = None
 
 
-def get_db():
-    return db
+def create_client(settings: ApplicationSettings) -> AsyncIOMotorClient:
+    options = {
+        'maxPoolSize': settings.DATABASE_MAX_POOL_SIZE,
+        'minPoolSize': settings.DATABASE_MIN_POOL_SIZE,
+        'serverSelectionTimeoutMS': settings.DATABASE_SERVER_SELECTION_TIMEOUT_MS,
+        'readPreference': settings.DATABASE_READ_PREFERENCE,
+        'event_listeners': [pool_monitor]
+    }
+    if settings.DATABASE_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options['waitQueueTimeoutMS'] = settings.DATABASE_WAIT_QUEUE_TIMEOUT_MS
+    if settings.DATABASE_COMPRESSORS:
+        options['compressors'] = settings.DATABASE_COMPRESSORS
+    return AsyncIOMotorClient(settings.DATABASE_URL, **options)
+
+
+def connect() -> None:
+    global client
+    if client is None:
+        client = create_client(get_settings())
+
+
+def disconnect() -> None:
+    global client
+    if client is not None:
+        client.close()
+        client = None
+
+
+def get_db() -> AsyncIOMotorDatabase:
+    if client is None:
+        raise RuntimeError('Database client is not connected, connect() has to be called on startup')
+    return client.alkoholove
+
+
+def get_pool_monitor() -> ConnectionPoolMonitor:
+    return pool_monitor
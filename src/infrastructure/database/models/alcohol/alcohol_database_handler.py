@@ -1,14 +1,17 @@
 import pymongo
 from bson import ObjectId
 from bson.int64 import Int64
-from pymongo.database import Database
+from pymongo import ReturnDocument
 from pymongo.errors import WriteError, OperationFailure
-from pymongo.collection import Collection, ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
 
 from src.domain.alcohol_filter import AlcoholFilters
 from src.domain.alcohol import AlcoholCreate, AlcoholUpdate
 from src.infrastructure.exceptions.validation_exceptions import ValidationErrorException
 from src.infrastructure.database.models.alcohol_category import AlcoholCategoryDatabaseHandler
+from src.infrastructure.common.cursor_utils import encode_cursor, decode_cursor, NAME_CURSOR, SCORE_CURSOR
+
+MAX_SLICE_SIZE = 2 ** 31 - 1
 
 
 class AlcoholDatabaseHandler:
@@ -107,23 +110,73 @@ class AlcoholDatabaseHandler:
         return aggregated_filters[::-1]
 
     @staticmethod
-    async def get_alcohol_by_barcode(collection: Collection, barcode: list[str]) -> dict | None:
-        return collection.find_one({'barcode': {'$in': barcode}})
+    async def get_alcohol_by_barcode(collection: AsyncIOMotorCollection, barcode: list[str]) -> dict | None:
+        return await collection.find_one({'barcode': {'$in': barcode}})
 
     @staticmethod
-    async def get_alcohol_by_name(collection: Collection, name: str) -> dict | None:
-        return collection.find_one({'name': name})
+    async def get_alcohol_by_name(collection: AsyncIOMotorCollection, name: str) -> dict | None:
+        return await collection.find_one({'name': name})
 
     @staticmethod
-    async def get_alcohol_by_id(collection: Collection, alcohol_id: str) -> dict | None:
-        return collection.find_one({'_id': ObjectId(alcohol_id)})
+    async def get_alcohol_by_id(collection: AsyncIOMotorCollection, alcohol_id: str) -> dict | None:
+        return await collection.find_one({'_id': ObjectId(alcohol_id)})
 
     @staticmethod
-    async def get_alcohols_by_ids(collection: Collection, alcohol_ids: list[ObjectId]) -> list[dict] | None:
-        return list(collection.find({'_id': {'$in': alcohol_ids}}))
+    async def get_alcohols_by_ids(collection: AsyncIOMotorCollection, alcohol_ids: list[ObjectId]) -> list[dict] | None:
+        return await collection.find({'_id': {'$in': alcohol_ids}}).to_list(None)
 
     @staticmethod
-    async def add_alcohol(collection: Collection, payload: AlcoholCreate):
+    async def get_alcohols_page_from_list(
+            list_collection: AsyncIOMotorCollection,
+            alcohols_collection: AsyncIOMotorCollection,
+            list_filter: dict,
+            limit: int,
+            offset: int
+    ) -> tuple[list[dict], int]:
+        """
+        Page of alcohols from the `alcohols` id array of the list document matching `list_filter`, in list order,
+        and the length of the list. Only the page of ids is sliced out of the array and only its alcohols are fetched.
+        Alcohol deletion removes the alcohol from every list, ids left behind by an alcohol added to a list while
+        being deleted are skipped and left out of the total, `src.migrations.dangling_list_alcohols` removes them.
+        """
+        lists = await list_collection.aggregate([
+            {'$match': list_filter},
+            {'$limit': 1},
+            {'$project': {
+                '_id': 0,
+                'page': {'$slice': ['$alcohols', offset, limit if limit > 0 else MAX_SLICE_SIZE]},
+                'total': {'$size': '$alcohols'}
+            }}
+        ]).to_list(None)
+        if not lists:
+            return [], 0
+        page, total = lists[0]['page'], lists[0]['total']
+        alcohols = {
+            alcohol['_id']: alcohol for alcohol in
+            await AlcoholDatabaseHandler.get_alcohols_by_ids(alcohols_collection, page)
+        } if page else {}
+        total -= sum(alcohol_id not in alcohols for alcohol_id in page)
+        return [alcohols[alcohol_id] for alcohol_id in page if alcohol_id in alcohols], total
+
+    @staticmethod
+    async def join_alcohols(
+            collection: AsyncIOMotorCollection,
+            documents: list[dict],
+            key: str = 'alcohol_id',
+            field: str = 'alcohol'
+    ) -> list[dict]:
+        """Set `field` of every document to the alcohol referenced by `key`, fetched with a single `$in` query."""
+        alcohol_ids = list({document[key] for document in documents})
+        alcohols = {
+            alcohol['_id']: alcohol for alcohol in
+            await AlcoholDatabaseHandler.get_alcohols_by_ids(collection, alcohol_ids)
+        } if alcohol_ids else {}
+        for document in documents:
+            document[field] = alcohols.get(document[key])
+        return documents
+
+    @staticmethod
+    async def add_alcohol(collection: AsyncIOMotorCollection, payload: AlcoholCreate):
         payload = payload.dict() | {
             'avg_rating': float(0),
             'rate_count': Int64(0),
@@ -135,13 +188,13 @@ class AlcoholDatabaseHandler:
             'rate_5_count': Int64(0)
         }
         try:
-            return collection.insert_one(payload)
+            return await collection.insert_one(payload)
         except WriteError as ex:
             raise ValidationErrorException(ex.args[0])
 
     @staticmethod
     async def search_alcohols(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             phrase: str | None,
@@ -156,9 +209,73 @@ class AlcoholDatabaseHandler:
             total = await AlcoholDatabaseHandler.count_alcohols(collection, find_filters)
             return db_alcohols, total
 
+    @staticmethod
+    async def search_alcohols_after(
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            cursor: str,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], str | None, int | None]:
+        """
+        Keyset pagination: pages are read with a range query on (sort key, `_id`) instead of skipping.
+        The total is only counted for the first page and is not counted for Atlas phrase search at all.
+        """
+        after = decode_cursor(cursor, limit, SCORE_CURSOR if phrase else NAME_CURSOR)
+        total = None
+        if phrase:
+            aggregate_filters = AlcoholDatabaseHandler.prepare_aggregate_filters(phrase, filters)
+            alcohols = await AlcoholDatabaseHandler.get_alcohols_by_phrase_after(
+                collection, limit + 1, aggregate_filters, after
+            )
+            sort_key = 'score'
+        else:
+            find_filters = AlcoholDatabaseHandler.prepare_find_filters(filters)
+            alcohols = await AlcoholDatabaseHandler.get_alcohols_after(collection, limit + 1, find_filters, after)
+            if after is None:
+                total = await AlcoholDatabaseHandler.count_alcohols(collection, find_filters)
+            sort_key = 'name'
+        next_cursor = None
+        if len(alcohols) > limit:
+            alcohols = alcohols[:limit]
+            next_cursor = encode_cursor(alcohols[-1][sort_key], alcohols[-1]['_id']) if alcohols else None
+        return alcohols, next_cursor, total
+
+    @staticmethod
+    async def get_alcohols_by_phrase_after(
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            filters: list[dict],
+            after: tuple[float, ObjectId] | None
+    ) -> list[dict]:
+        pipeline = [*filters, {'$addFields': {'score': {'$meta': 'searchScore'}}}]
+        if after:
+            score, alcohol_id = after
+            pipeline.append(
+                {'$match': {'$or': [{'score': {'$lt': score}}, {'score': score, '_id': {'$gt': alcohol_id}}]}}
+            )
+        pipeline.extend([{'$sort': {'score': -1, '_id': 1}}, {'$limit': limit}])
+        return await collection.aggregate(pipeline).to_list(None)
+
+    @staticmethod
+    async def get_alcohols_after(
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            filters: dict,
+            after: tuple[str, ObjectId] | None
+    ) -> list[dict]:
+        if after:
+            name, alcohol_id = after
+            filters = {
+                '$and': [filters, {'$or': [{'name': {'$gt': name}}, {'name': name, '_id': {'$gt': alcohol_id}}]}]
+            }
+        return await collection.find(filters).sort(
+            [('name', pymongo.ASCENDING), ('_id', pymongo.ASCENDING)]
+        ).limit(limit).to_list(None)
+
     @staticmethod
     async def get_alcohols_by_phrase(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             filters: list[dict]
@@ -177,7 +294,7 @@ class AlcoholDatabaseHandler:
         alcohols_pipeline = [{'$skip': offset}]
         if limit:
             alcohols_pipeline.append({'$limit': limit})
-        result = list(collection.aggregate([
+        result = await collection.aggregate([
             *filters,
             {
                 '$addFields': {'score': {'$meta': 'searchScore'}}
@@ -190,7 +307,7 @@ class AlcoholDatabaseHandler:
                 }
             },
             {'$unwind': '$totalCount'}
-        ]))
+        ]).to_list(None)
 
         total = 0
         # unwrap the results and get the total count
@@ -201,40 +318,61 @@ class AlcoholDatabaseHandler:
 
         return result, total
 
+    @staticmethod
+    async def get_alcohols_search_fields(collection: AsyncIOMotorCollection, fields: tuple[str, ...]) -> list[dict]:
+        return await collection.find({}, {field: 1 for field in fields}).to_list(None)
+
+    @staticmethod
+    async def filter_alcohol_ids(
+            collection: AsyncIOMotorCollection,
+            alcohol_ids: list[ObjectId],
+            filters: dict
+    ) -> set[ObjectId]:
+        alcohols = await collection.find({'_id': {'$in': alcohol_ids}} | filters, {'_id': 1}).to_list(None)
+        return {alcohol['_id'] for alcohol in alcohols}
+
     @staticmethod
     async def get_alcohols(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             filters: dict
     ) -> list[dict]:
-        return list(collection.find(filters).sort('name', pymongo.ASCENDING).skip(offset).limit(limit))
+        return await collection.find(filters).sort('name', pymongo.ASCENDING).skip(offset).limit(limit).to_list(None)
 
     @staticmethod
     async def get_alcohols_created_by_user(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             username: str
     ) -> list[dict]:
-        return list(collection.find({'username': username}).skip(offset).limit(limit))
+        return await collection.find({'username': username}).skip(offset).limit(limit).to_list(None)
 
     @staticmethod
-    async def count_alcohols_created_by_user(collection: Collection, username: str) -> int:
-        return collection.count_documents(filter={'username': {'$eq': username}})
+    async def count_alcohols_created_by_user(collection: AsyncIOMotorCollection, username: str) -> int:
+        return await collection.count_documents(filter={'username': {'$eq': username}})
 
     @staticmethod
-    async def count_alcohols(collection: Collection, filters: dict) -> int:
-        return collection.count_documents(filters) if filters else collection.estimated_document_count()
+    async def count_alcohols(collection: AsyncIOMotorCollection, filters: dict) -> int:
+        return (
+            await collection.count_documents(filters)
+            if filters
+            else await collection.estimated_document_count()
+        )
 
     @staticmethod
-    async def delete_alcohol(collection: Collection, alcohol_id: ObjectId) -> None:
-        collection.delete_one({'_id': alcohol_id})
+    async def delete_alcohol(collection: AsyncIOMotorCollection, alcohol_id: ObjectId) -> None:
+        await collection.delete_one({'_id': alcohol_id})
 
     @staticmethod
-    async def update_alcohol(collection: Collection, alcohol_id: ObjectId, payload: AlcoholUpdate) -> dict | None:
+    async def update_alcohol(
+            collection: AsyncIOMotorCollection,
+            alcohol_id: ObjectId,
+            payload: AlcoholUpdate
+    ) -> dict | None:
         try:
-            return collection.find_one_and_update(
+            return await collection.find_one_and_update(
                 {'_id': alcohol_id},
                 {'$set': payload.dict(exclude_none=True)},
                 return_document=ReturnDocument.AFTER
@@ -243,7 +381,7 @@ class AlcoholDatabaseHandler:
             raise ValidationErrorException(ex.args[0])
 
     @staticmethod
-    async def update_validation(db: Database) -> None:
+    async def update_validation(db: AsyncIOMotorDatabase) -> None:
         core = {}
         db_categories = await AlcoholCategoryDatabaseHandler.get_all_categories(db.alcohol_categories)
         for db_category in db_categories:
@@ -251,7 +389,7 @@ class AlcoholDatabaseHandler:
             if db_category['title'] == 'core':
                 core = db_category
         db_categories.remove(core)
-        db.command(
+        await db.command(
             'collMod',
             'alcohols',
             validator={
@@ -266,65 +404,37 @@ class AlcoholDatabaseHandler:
         )
 
     @staticmethod
-    async def remove_fields_for_kind(collection: Collection, kind: str, fields: list[str]) -> None:
+    async def remove_fields_for_kind(collection: AsyncIOMotorCollection, kind: str, fields: list[str]) -> None:
         fields = {field: '' for field in fields}
-        collection.update_many({'kind': kind}, {'$unset': fields})
+        await collection.update_many({'kind': kind}, {'$unset': fields})
 
     @staticmethod
     async def check_if_alcohol_exists(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             alcohol_id: str
     ) -> bool:
-        if collection.find_one({'_id': ObjectId(alcohol_id)}):
+        if await collection.find_one({'_id': ObjectId(alcohol_id)}):
             return True
         else:
             return False
 
     @staticmethod
-    async def revert_by_removal(collection: Collection, name: str) -> None:
-        collection.find_one_and_delete({'name': name})
+    async def revert_by_removal(collection: AsyncIOMotorCollection, name: str) -> None:
+        await collection.find_one_and_delete({'name': name})
 
     @staticmethod
-    async def search_values(
-            field_name: str,
-            collection: Collection,
-            limit: int,
-            offset: int,
-            phrase: str | None
-    ) -> list[str]:
-        if phrase:
-            pipeline = [
-                # Match the possible documents. Always the best approach
-                {'$match': {field_name: {'$regex': f'^{phrase}', '$options': 'i'}}},
-                # De-normalize the array content to separate documents
-                {'$unwind': f'${field_name}'},
-                # Now "filter" the content to actual matches
-                {'$match': {field_name: {'$regex': f'^{phrase}', '$options': 'i'}}},
-                # Group the "like" terms as the "key"
-                {'$group': {'_id': f'${field_name}'}},
-                {'$sort': {'_id': 1}},
-                {'$skip': offset},
-            ]
-            if limit:
-                pipeline.append({'$limit': limit})
-            values = list(collection.aggregate(pipeline))
-        else:
-            pipeline = [
-                {'$unwind': f'${field_name}'},
-                {'$group': {'_id': f'${field_name}'}},
-                {'$sort': {'_id': 1}},
-                {'$skip': offset},
-            ]
-            if limit:
-                pipeline.append({'$limit': limit})
-            values = list(collection.aggregate(pipeline))
-        return [value['_id'] for value in values]
+    async def count_values(field_name: str, collection: AsyncIOMotorCollection) -> dict:
+        pipeline = [
+            {'$unwind': f'${field_name}'},
+            {'$group': {'_id': f'${field_name}', 'count': {'$sum': 1}}}
+        ]
+        return {value['_id']: value['count'] for value in await collection.aggregate(pipeline).to_list(None)}
 
     @staticmethod
     async def get_guest_list(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             alcohol_list: list[ObjectId]
     ) -> list[dict]:
-        return list(collection.find({'_id': {'$in': alcohol_list}}).skip(offset).limit(limit))
+        return await collection.find({'_id': {'$in': alcohol_list}}).skip(offset).limit(limit).to_list(None)
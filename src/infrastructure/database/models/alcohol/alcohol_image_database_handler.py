@@ -0,0 +1,29 @@
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+
+class AlcoholImageDatabaseHandler:
+    """
+    Digests of the stored images of an alcohol, `{_id: alcohol_id, source: digest, variants: {name: digest}}`.
+    """
+
+    @staticmethod
+    async def get_digests(collection: AsyncIOMotorCollection, alcohol_id: ObjectId) -> dict:
+        return await collection.find_one({'_id': alcohol_id}) or {'source': None, 'variants': {}}
+
+    @staticmethod
+    async def set_digests(
+            collection: AsyncIOMotorCollection,
+            alcohol_id: ObjectId,
+            source: str,
+            variants: dict[str, str]
+    ) -> None:
+        await collection.update_one(
+            {'_id': alcohol_id},
+            {'$set': {'source': source, 'variants': variants}},
+            upsert=True
+        )
+
+    @staticmethod
+    async def delete_digests(collection: AsyncIOMotorCollection, alcohol_id: ObjectId) -> None:
+        await collection.delete_one({'_id': alcohol_id})
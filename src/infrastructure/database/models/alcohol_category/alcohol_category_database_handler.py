@@ -1,7 +1,6 @@
-from functools import cache
-
 from bson import ObjectId
-from pymongo.collection import Collection, ReturnDocument
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.infrastructure.database.models.alcohol_category import AlcoholCategory
 from src.domain.alcohol_category import AlcoholCategoryUpdate, AlcoholCategoryDelete, AlcoholCategoryCreate
@@ -9,79 +8,81 @@ from src.domain.alcohol_category import AlcoholCategoryUpdate, AlcoholCategoryDe
 
 class AlcoholCategoryDatabaseHandler:
     @staticmethod
-    async def check_if_category_exist(collection: Collection[AlcoholCategory], name: str) -> bool:
-        return True if collection.find_one({'title': name}) else False
+    async def check_if_category_exist(collection: AsyncIOMotorCollection, name: str) -> bool:
+        return True if await collection.find_one({'title': name}) else False
 
     @staticmethod
-    async def get_all_categories(collection: Collection[AlcoholCategory]) -> list[AlcoholCategory]:
-        return list(collection.find({}))
+    async def get_all_categories(collection: AsyncIOMotorCollection) -> list[AlcoholCategory]:
+        return await collection.find({}).to_list(None)
 
     @staticmethod
     async def get_categories(
-            collection: Collection[AlcoholCategory],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int
     ) -> list[AlcoholCategory]:
-        return list(collection.find({}).skip(offset).limit(limit))
+        return await collection.find({}).skip(offset).limit(limit).to_list(None)
 
     @staticmethod
-    async def count_categories(collection: Collection[AlcoholCategory]) -> int:
-        return collection.estimated_document_count()
+    async def count_categories(collection: AsyncIOMotorCollection) -> int:
+        return await collection.estimated_document_count()
 
     @staticmethod
     async def get_category_by_id(
-            collection: Collection[AlcoholCategory],
+            collection: AsyncIOMotorCollection,
             category_id: ObjectId
     ) -> AlcoholCategory | None:
-        return collection.find_one({'_id': category_id})
+        return await collection.find_one({'_id': category_id})
 
     @staticmethod
     async def search_categories_by_phrase(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int, offset: int,
             phrase: str
     ) -> list[dict]:
-        return list(collection.find({'title': {'$regex': phrase, '$options': 'i'}}).skip(offset).limit(limit))
+        return await collection.find(
+            {'title': {'$regex': phrase, '$options': 'i'}}
+        ).skip(offset).limit(limit).to_list(None)
 
     @staticmethod
     async def count_categories_by_phrase(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             phrase: str
     ) -> int:
         return (
-            collection.count_documents(
+            await collection.count_documents(
                 filter={'title': {'$regex': phrase, '$options': 'i'}})
             if phrase
-            else collection.estimated_document_count()
+            else await collection.estimated_document_count()
         )
 
     @staticmethod
     async def update_category(
-            collection: Collection[AlcoholCategory],
+            collection: AsyncIOMotorCollection,
             existing: AlcoholCategory,
             payload: AlcoholCategoryUpdate
     ) -> AlcoholCategory | None:
         payload = payload.dict()
         properties = existing['properties'] | payload['properties']
         required = existing.get('required', []) + list(payload['properties'].keys())
-        return collection.find_one_and_update(
+        return await collection.find_one_and_update(
             {'_id': existing['_id']},
             {'$set': {'properties': properties, 'required': required}},
             return_document=ReturnDocument.AFTER
         )
 
     @staticmethod
-    async def add_category(collection: Collection[AlcoholCategory], payload: AlcoholCategoryCreate) -> None:
-        collection.insert_one(payload.dict(exclude_none=True))
+    async def add_category(collection: AsyncIOMotorCollection, payload: AlcoholCategoryCreate) -> None:
+        await collection.insert_one(payload.dict(exclude_none=True))
 
     @staticmethod
     async def remove_properties(
-            collection: Collection[AlcoholCategory],
+            collection: AsyncIOMotorCollection,
             existing: AlcoholCategory,
             payload: AlcoholCategoryDelete
     ) -> AlcoholCategory | None:
         unset_properties = [f'properties.{field}' for field in payload.properties]
-        return collection.find_one_and_update(
+        return await collection.find_one_and_update(
             {'_id': existing['_id']},
             [
                 {'$unset': unset_properties},
@@ -109,14 +110,9 @@ class AlcoholCategoryDatabaseHandler:
         )
 
     @staticmethod
-    async def revert(collection: Collection[AlcoholCategory], original: AlcoholCategory) -> None:
-        collection.find_one_and_replace({'_id': original['_id']}, original)
-
-    @staticmethod
-    async def revert_by_removal(collection: Collection[AlcoholCategory], name: str) -> None:
-        collection.find_one_and_delete({'title': name})
+    async def revert(collection: AsyncIOMotorCollection, original: AlcoholCategory) -> None:
+        await collection.find_one_and_replace({'_id': original['_id']}, original)
 
     @staticmethod
-    @cache
-    def get_category_by_title(collection: Collection[AlcoholCategory], title: str) -> AlcoholCategory | None:
-        return collection.find_one({'title': title})
+    async def revert_by_removal(collection: AsyncIOMotorCollection, name: str) -> None:
+        await collection.find_one_and_delete({'title': name})
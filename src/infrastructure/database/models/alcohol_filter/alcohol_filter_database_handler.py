@@ -1,4 +1,4 @@
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.infrastructure.database.models.alcohol_filter import AlcoholFilter
 
@@ -6,7 +6,7 @@ from src.infrastructure.database.models.alcohol_filter import AlcoholFilter
 class AlcoholFilterDatabaseHandler:
     @staticmethod
     async def update_filters(
-            collection: Collection[AlcoholFilter],
+            collection: AsyncIOMotorCollection,
             kind: str,
             alcohol_type: str,
             country: str,
@@ -15,7 +15,7 @@ class AlcoholFilterDatabaseHandler:
             taste: list[str] | None,
             aroma: list[str] | None
     ) -> None:
-        collection.update_one(
+        await collection.update_one(
             {'_id': kind},
             {
                 '$addToSet': {
@@ -36,12 +36,12 @@ class AlcoholFilterDatabaseHandler:
         )
 
     @staticmethod
-    async def get_all_filters(collection: Collection[AlcoholFilter]) -> list[AlcoholFilter]:
-        return list(collection.find().sort(key_or_list='_id'))
+    async def get_all_filters(collection: AsyncIOMotorCollection) -> list[AlcoholFilter]:
+        return await collection.find().sort(key_or_list='_id').to_list(None)
 
     @staticmethod
-    async def create_init_entry(collection: Collection[AlcoholFilter], kind: str) -> None:
-        collection.insert_one(
+    async def create_init_entry(collection: AsyncIOMotorCollection, kind: str) -> None:
+        await collection.insert_one(
             {
                 '_id': kind,
                 'type': [],
@@ -0,0 +1 @@
+from src.infrastructure.database.models.email.email_queue_database_handler import EmailQueueDatabaseHandler
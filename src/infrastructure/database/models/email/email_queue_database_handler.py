@@ -0,0 +1,16 @@
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.job_queue import JobQueueDatabaseHandler
+
+
+class EmailQueueDatabaseHandler:
+    """
+    Emails waiting to be sent, one job per email `{template, recipients, context}`. The message is rendered
+    from the template when it is sent, so only the template name and its variables are stored.
+    """
+
+    @staticmethod
+    async def enqueue(collection: AsyncIOMotorCollection, template: str, recipients: list[str], context: dict) -> None:
+        await collection.insert_one(
+            JobQueueDatabaseHandler.new_job(template=template, recipients=recipients, context=context)
+        )
@@ -0,0 +1 @@
+from src.infrastructure.database.models.job_queue.job_queue_database_handler import JobQueueDatabaseHandler
@@ -0,0 +1,80 @@
+from pymongo import ReturnDocument
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+
+class JobQueueDatabaseHandler:
+    """
+    Jobs waiting for a background worker, one document per job with the fields of `new_job` next to its own.
+    Jobs replaced while queued carry a new `version`, so a worker still holding the old one neither
+    removes nor retries the new one.
+    """
+
+    @staticmethod
+    def new_job(**fields) -> dict:
+        now = datetime.utcnow()
+        return {
+            **fields,
+            'attempts': 0,
+            'available_at': now,
+            'locked_until': None,
+            'last_error': None,
+            'created_at': now
+        }
+
+    @staticmethod
+    def _job_filter(job: dict) -> dict:
+        return {'_id': job['_id'], 'version': job['version']} if 'version' in job else {'_id': job['_id']}
+
+    @staticmethod
+    async def claim_batch(collection: AsyncIOMotorCollection, limit: int, lease: int) -> list[dict]:
+        """Lock up to `limit` due jobs for `lease` seconds, so other workers skip them."""
+        now = datetime.utcnow()
+        claimed = []
+        while len(claimed) < limit and (job := await collection.find_one_and_update(
+                {'available_at': {'$lte': now}, '$or': [{'locked_until': None}, {'locked_until': {'$lt': now}}]},
+                {'$set': {'locked_until': now + timedelta(seconds=lease)}},
+                sort=[('available_at', 1)],
+                return_document=ReturnDocument.AFTER
+        )):
+            claimed.append(job)
+        return claimed
+
+    @staticmethod
+    async def complete(collection: AsyncIOMotorCollection, job: dict) -> None:
+        await collection.delete_one(JobQueueDatabaseHandler._job_filter(job))
+
+    @staticmethod
+    async def retry(collection: AsyncIOMotorCollection, job: dict, delay: float, error: str) -> None:
+        await collection.update_one(
+            JobQueueDatabaseHandler._job_filter(job),
+            {
+                '$inc': {'attempts': 1},
+                '$set': {
+                    'available_at': datetime.utcnow() + timedelta(seconds=delay),
+                    'locked_until': None,
+                    'last_error': error
+                }
+            }
+        )
+
+    @staticmethod
+    async def dead_letter(
+            collection: AsyncIOMotorCollection,
+            dead_letters: AsyncIOMotorCollection,
+            job: dict,
+            record: dict,
+            error: str
+    ) -> None:
+        """Move the job to `dead_letters`, keeping `record` of it with the attempts and the last error."""
+        await dead_letters.insert_one({
+            **record,
+            'attempts': job['attempts'] + 1,
+            'last_error': error,
+            'failed_at': datetime.utcnow()
+        })
+        await collection.delete_one(JobQueueDatabaseHandler._job_filter(job))
+
+    @staticmethod
+    async def count_pending(collection: AsyncIOMotorCollection) -> int:
+        return await collection.count_documents({})
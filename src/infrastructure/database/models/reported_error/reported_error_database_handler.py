@@ -1,5 +1,5 @@
 from bson import ObjectId
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.domain.user import User
 from src.domain.reported_errors import ReportedErrorCreate
@@ -9,42 +9,42 @@ from src.infrastructure.database.models.reported_error import ReportedError
 class ReportedErrorDatabaseHandler:
     @staticmethod
     async def get_reported_error_by_id(
-            collection: Collection[ReportedError],
+            collection: AsyncIOMotorCollection,
             error_id: ObjectId
     ) -> ReportedError | None:
-        return collection.find_one({'_id': error_id})
+        return await collection.find_one({'_id': error_id})
 
     @staticmethod
     async def get_reported_errors(
-            collection: Collection[ReportedError],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             user_id: ObjectId = None
     ) -> list[ReportedError]:
         return (
-            list(collection.find({}).skip(offset).limit(limit))
+            await collection.find({}).skip(offset).limit(limit).to_list(None)
             if not user_id
-            else list(collection.find({'user_id': user_id}).skip(offset).limit(limit))
+            else await collection.find({'user_id': user_id}).skip(offset).limit(limit).to_list(None)
         )
 
     @staticmethod
     async def count_reported_errors(
-            collection: Collection[ReportedError],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId = None
     ) -> int:
         return (
-            collection.estimated_document_count()
+            await collection.estimated_document_count()
             if not user_id
-            else collection.count_documents(filter={'user_id': {'$eq': user_id}})
+            else await collection.count_documents(filter={'user_id': {'$eq': user_id}})
         )
 
     @staticmethod
-    async def delete_reported_error(collection: Collection[ReportedError], error_id: ObjectId) -> None:
-        collection.delete_one({'_id': error_id})
+    async def delete_reported_error(collection: AsyncIOMotorCollection, error_id: ObjectId) -> None:
+        await collection.delete_one({'_id': error_id})
 
     @staticmethod
     async def create_reported_error(
-            error_collection: Collection[ReportedError],
+            error_collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             username: str,
             payload: ReportedErrorCreate,
@@ -54,4 +54,4 @@ class ReportedErrorDatabaseHandler:
             user_id=user_id,
             username=username
         )
-        error_collection.insert_one(db_reported_error)
+        await error_collection.insert_one(db_reported_error)
@@ -1,89 +1,92 @@
+from bson import ObjectId
 from datetime import datetime
-from pymongo import DESCENDING
-from bson import ObjectId, Int64
-from pymongo.collection import Collection, ReturnDocument
+from collections import Counter
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import DESCENDING, ReturnDocument
 
-from src.domain.alcohol import Alcohol
 from src.domain.review import ReviewCreate
 from src.domain.review.review_update import ReviewUpdate
 from src.infrastructure.database.models.review import Review
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
 from src.infrastructure.database.models.review.banned_review import BannedReview
 
 
 class ReviewDatabaseHandler:
     @staticmethod
     async def get_alcohol_reviews(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             alcohol_id: str
     ) -> list[Review]:
         return (
-            list(collection.find({'alcohol_id': ObjectId(alcohol_id)}).skip(offset).limit(limit))
+            await collection.find({'alcohol_id': ObjectId(alcohol_id)}).skip(offset).limit(limit).to_list(None)
         )
 
     @staticmethod
     async def count_alcohol_reviews(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             alcohol_id: str
     ) -> int:
         return (
-            collection.count_documents(filter={'alcohol_id': {'$eq': ObjectId(alcohol_id)}})
+            await collection.count_documents(filter={'alcohol_id': {'$eq': ObjectId(alcohol_id)}})
         )
 
     @staticmethod
     async def get_reported_reviews(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
     ) -> list[Review]:
         return (
-            list(collection.find(filter={'report_count': {'$gt': 0}})
-                 .skip(offset)
-                 .limit(limit)
-                 .sort("report_count", DESCENDING))
+            await collection.find(filter={'report_count': {'$gt': 0}})
+            .skip(offset)
+            .limit(limit)
+            .sort("report_count", DESCENDING)
+            .to_list(None)
         )
 
     @staticmethod
     async def get_reported_reviews_by_phrase(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             phrase: str,
             limit: int,
             offset: int,
     ) -> list[Review]:
         return (
-            list(collection.find(
+            await collection.find(
                 {'$and': [{'report_count': {'$gt': 0}}, {'username': {'$regex': phrase, '$options': 'i'}}]})
-                 .skip(offset)
-                 .limit(limit)
-                 .sort("report_count", DESCENDING))
+            .skip(offset)
+            .limit(limit)
+            .sort("report_count", DESCENDING)
+            .to_list(None)
         )
 
     @staticmethod
     async def count_reported_reviews(
-            collection: Collection[Review]
+            collection: AsyncIOMotorCollection
     ) -> int:
         return (
-            collection.count_documents(filter={'report_count': {'$gt': 0}})
+            await collection.count_documents(filter={'report_count': {'$gt': 0}})
         )
 
     @staticmethod
     async def count_reported_reviews_by_phrase(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             phrase: str
     ) -> int:
         return (
-            collection.count_documents(
+            await collection.count_documents(
                 filter={'$and': [{'report_count': {'$gt': 0}}, {'username': {'$regex': phrase, '$options': 'i'}}]})
         )
 
     @staticmethod
     async def check_if_review_exists(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             alcohol_id: ObjectId,
             user_id: ObjectId,
     ) -> bool:
-        if collection.find_one({'user_id': user_id, 'alcohol_id': alcohol_id}):
+        if await collection.find_one({'user_id': user_id, 'alcohol_id': alcohol_id}):
             return True
         else:
             return False
@@ -98,159 +101,105 @@ class ReviewDatabaseHandler:
             5: 'rate_5_count'
         }[rating]
 
+    @staticmethod
+    async def change_rating(
+            collection: AsyncIOMotorCollection,
+            document_id: ObjectId,
+            counters: dict[str, int]
+    ) -> None:
+        """
+        Counters and `avg_rating` are changed with a single pipeline update evaluated by the server,
+        so concurrent reviews never lose an update and the average always matches the counters.
+        """
+        await collection.update_one({'_id': document_id}, ReviewDatabaseHandler.rating_update(counters))
+
+    @staticmethod
+    def rating_update(counters: dict[str, int]) -> list[dict]:
+        """Pipeline adding `counters` to the document and recomputing `avg_rating` from the new values."""
+        return [
+            {'$set': {field: {'$add': [{'$ifNull': [f'${field}', 0]}, value]} for field, value in counters.items()}},
+            {'$set': {'avg_rating': {
+                '$cond': [{'$gt': ['$rate_count', 0]}, {'$divide': ['$rate_value', '$rate_count']}, 0.0]
+            }}}
+        ]
+
+    @staticmethod
+    def rating_removals(reviews: list[Review]) -> list[dict]:
+        """Ratings of the reviews summed per alcohol, as `{alcohol_id, counters}` to add to the alcohol."""
+        counters: dict[ObjectId, Counter] = {}
+        for review in reviews:
+            counters.setdefault(review['alcohol_id'], Counter()).update({
+                'rate_count': -1,
+                'rate_value': -review['rating'],
+                ReviewDatabaseHandler.rate_count_field_name(review['rating']): -1
+            })
+        return [{'alcohol_id': alcohol_id, 'counters': dict(counter)} for alcohol_id, counter in counters.items()]
+
     @staticmethod
     async def add_rating_to_alcohol(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             alcohol_id: ObjectId,
             rating: int,
     ):
-        alcohol = collection.find_one({'_id': alcohol_id})
-
-        rate_count = alcohol['rate_count'] + 1
-        rate_value = alcohol['rate_value'] + rating
-        avg_rating = rate_value / rate_count
-
-        rate_count_field_name = ReviewDatabaseHandler.rate_count_field_name(rating)
-        collection.update_one(
-            {'_id': {'$eq': ObjectId(alcohol_id)}},
-            {
-                '$set': {
-                    'rate_count': Int64(rate_count),
-                    'avg_rating': avg_rating,
-                    'rate_value': Int64(rate_value),
-                },
-                '$inc': {rate_count_field_name: 1}
-            }
+        await ReviewDatabaseHandler.change_rating(
+            collection,
+            alcohol_id,
+            {'rate_count': 1, 'rate_value': rating, ReviewDatabaseHandler.rate_count_field_name(rating): 1}
         )
 
     @staticmethod
     async def add_rating_to_user(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             rating: int,
     ):
-        user = collection.find_one({'_id': user_id})
-
-        rate_count = user['rate_count'] + 1
-        rate_value = user['rate_value'] + rating
-        avg_rating = rate_value / rate_count
-
-        collection.update_one(
-            {'_id': {'$eq': ObjectId(user_id)}},
-            {
-                '$set': {
-                    'rate_count': Int64(rate_count),
-                    'avg_rating': float(avg_rating),
-                    'rate_value': Int64(rate_value)
-                }
-            }
-        )
+        await ReviewDatabaseHandler.change_rating(collection, user_id, {'rate_count': 1, 'rate_value': rating})
 
     @staticmethod
     async def remove_rating_from_alcohol(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             alcohol_id: ObjectId,
             rating: int,
     ):
-        alcohol = collection.find_one({'_id': alcohol_id})
-
-        rate_count = alcohol['rate_count'] - 1
-        rate_value = alcohol['rate_value'] - rating
-        if rate_count < 1:
-            avg_rating = 0
-        else:
-            avg_rating = rate_value / rate_count
-
-        rate_count_field_name = ReviewDatabaseHandler.rate_count_field_name(rating)
-
-        collection.update_one(
-            {'_id': {'$eq': ObjectId(alcohol_id)}},
-            {
-                '$set': {
-                    'rate_count': Int64(rate_count),
-                    'avg_rating': float(avg_rating),
-                    'rate_value': Int64(rate_value)
-                },
-                '$inc': {rate_count_field_name: -1}
-            }
+        await ReviewDatabaseHandler.change_rating(
+            collection,
+            alcohol_id,
+            {'rate_count': -1, 'rate_value': -rating, ReviewDatabaseHandler.rate_count_field_name(rating): -1}
         )
 
     @staticmethod
     async def remove_rating_from_user(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             rating: int,
     ):
-        user = collection.find_one({'_id': user_id})
-
-        rate_count = user['rate_count'] - 1
-        rate_value = user['rate_value'] - rating
-        if rate_count < 1:
-            avg_rating = 0
-        else:
-            avg_rating = rate_value / rate_count
-
-        collection.update_one(
-            {'_id': {'$eq': ObjectId(user_id)}},
-            {
-                '$set': {
-                    'rate_count': Int64(rate_count),
-                    'avg_rating': float(avg_rating),
-                    'rate_value': Int64(rate_value)
-                }
-            }
-        )
+        await ReviewDatabaseHandler.change_rating(collection, user_id, {'rate_count': -1, 'rate_value': -rating})
 
     @staticmethod
     async def update_alcohol_rating(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             alcohol_id: ObjectId,
             rating_old: int,
             rating_new: int
     ):
-        alcohol = collection.find_one({'_id': alcohol_id})
-        rate_count = alcohol['rate_count']
-        rate_value = alcohol['rate_value'] - rating_old + rating_new
-        avg_rating = rate_value / rate_count
-
-        old_rate_count_field_name = ReviewDatabaseHandler.rate_count_field_name(rating_old)
-        new_rate_count_field_name = ReviewDatabaseHandler.rate_count_field_name(rating_new)
-
-        collection.update_one(
-            {'_id': {'$eq': alcohol_id}},
-            {
-                '$set': {
-                    'rate_count': Int64(rate_count),
-                    'avg_rating': float(avg_rating),
-                    'rate_value': Int64(rate_value)
-                },
-                '$inc': {old_rate_count_field_name: -1, new_rate_count_field_name: 1}
-            }
-        )
+        counters = {'rate_value': rating_new - rating_old}
+        if rating_old != rating_new:
+            counters[ReviewDatabaseHandler.rate_count_field_name(rating_old)] = -1
+            counters[ReviewDatabaseHandler.rate_count_field_name(rating_new)] = 1
+        await ReviewDatabaseHandler.change_rating(collection, alcohol_id, counters)
 
     @staticmethod
     async def update_user_rating(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             rating_old: int,
             rating_new: int
     ):
-        user = collection.find_one({'_id': user_id})
-        rate_count = user['rate_count']
-        rate_value = user['rate_value'] - rating_old + rating_new
-        avg_rating = rate_value / rate_count
-
-        collection.update_one(
-            {'_id': {'$eq': user_id}},
-            {
-                '$set': {'rate_count': Int64(rate_count), 'avg_rating': float(avg_rating),
-                         'rate_value': Int64(rate_value)}
-            }
-        )
+        await ReviewDatabaseHandler.change_rating(collection, user_id, {'rate_value': rating_new - rating_old})
 
     @staticmethod
     async def create_review(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             alcohol_id: ObjectId,
             username: str,
@@ -267,78 +216,77 @@ class ReviewDatabaseHandler:
             helpful_count=0,
             helpful_reporters=[]
         )
-        return collection.insert_one(db_review)
+        return await collection.insert_one(db_review)
 
     @staticmethod
     async def check_if_review_belongs_to_user(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
             user_id: ObjectId
     ) -> bool:
-        if collection.find_one({'user_id': user_id, '_id': review_id}):
+        if await collection.find_one({'user_id': user_id, '_id': review_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def delete_review(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
             alcohol_id: ObjectId
     ) -> int:
-        delete = collection.delete_one({'_id': review_id, 'alcohol_id': alcohol_id})
+        delete = await collection.delete_one({'_id': review_id, 'alcohol_id': alcohol_id})
         return delete.deleted_count
 
     @staticmethod
     async def remove_user_from_reporters(
-            review_collection: Collection[Review],
+            review_collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ) -> None:
-        review_collection.update_many(
+        await review_collection.update_many(
             {'reporters': user_id},
             {'$inc': {'report_count': -1}, '$pull': {'reporters': user_id}})
-        review_collection.update_many(
+        await review_collection.update_many(
             {'helpful_reporters': user_id},
             {'$inc': {'helpful_count': -1}, '$pull': {'helpful_reporters': user_id}})
 
     @staticmethod
-    async def delete_reviews(
-            review_collection: Collection[Review],
-            alcohol_collection: Collection[Alcohol],
-            user_id: ObjectId
-    ) -> None:
-        reviews = list(review_collection.find({'user_id': user_id}))
-        for review in reviews:
-            await ReviewDatabaseHandler.remove_rating_from_alcohol(alcohol_collection, review.get('alcohol_id'),
-                                                                   review.get('rating'))
-        await ReviewDatabaseHandler.remove_user_from_reporters(review_collection, user_id)
-        review_collection.delete_many({'user_id': user_id})
+    async def get_user_reviews_batch(collection: AsyncIOMotorCollection, user_id: ObjectId,
+                                     batch_size: int) -> list[Review]:
+        return await collection.find(
+            {'user_id': user_id}, {'alcohol_id': True, 'rating': True}
+        ).limit(batch_size).to_list(None)
+
+    @staticmethod
+    async def delete_reviews_by_ids(collection: AsyncIOMotorCollection, review_ids: list[ObjectId]) -> int:
+        delete = await collection.delete_many({'_id': {'$in': review_ids}})
+        return delete.deleted_count
 
     @staticmethod
     async def get_rating(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
     ) -> int:
-        review = collection.find_one({'_id': review_id})
+        review = await collection.find_one({'_id': review_id})
         return review['rating']
 
     @staticmethod
     async def check_if_review_exists_by_id(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
     ) -> bool:
-        if collection.find_one({'_id': review_id}):
+        if await collection.find_one({'_id': review_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def update_review(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
             payload: ReviewUpdate
     ):
-        return collection.find_one_and_update(
+        return await collection.find_one_and_update(
             {'_id': review_id},
             {'$set': payload.dict(exclude_none=True)},
             return_document=ReturnDocument.AFTER
@@ -346,11 +294,11 @@ class ReviewDatabaseHandler:
 
     @staticmethod
     async def add_to_helpful_reporters(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
             user_id: ObjectId
     ):
-        return collection.find_one_and_update(
+        return await collection.find_one_and_update(
             {'_id': review_id},
             {'$inc': {'helpful_count': 1}, '$push': {'helpful_reporters': user_id}},
             return_document=ReturnDocument.AFTER
@@ -358,11 +306,11 @@ class ReviewDatabaseHandler:
 
     @staticmethod
     async def remove_from_helpful_reporters(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
             user_id: ObjectId
     ):
-        return collection.find_one_and_update(
+        return await collection.find_one_and_update(
             {'_id': review_id},
             {"$inc": {'helpful_count': -1}, '$pull': {'helpful_reporters': user_id}},
             return_document=ReturnDocument.AFTER
@@ -370,106 +318,103 @@ class ReviewDatabaseHandler:
 
     @staticmethod
     async def delete_review_admin(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId
     ):
-        return collection.delete_one({'_id': review_id})
+        return await collection.delete_one({'_id': review_id})
 
     @staticmethod
     async def get_user_reviews(
-            review_collection: Collection[Review],
-            alcohol_collection: Collection,
+            review_collection: AsyncIOMotorCollection,
+            alcohol_collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             user_id: ObjectId
     ) -> list[Review]:
-        reviews = list(review_collection.find({'user_id': user_id}).skip(offset).limit(limit))
-        for review in reviews:
-            alcohol = alcohol_collection.find_one({'_id': review["alcohol_id"]})
-            review['alcohol'] = alcohol
-        return reviews
+        reviews = await review_collection.find({'user_id': user_id}).skip(offset).limit(limit).to_list(None)
+        return await AlcoholDatabaseHandler.join_alcohols(alcohol_collection, reviews)
 
     @staticmethod
     async def count_user_reviews(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ) -> int:
         return (
-            collection.count_documents(filter={'user_id': {'$eq': user_id}})
+            await collection.count_documents(filter={'user_id': {'$eq': user_id}})
         )
 
     @staticmethod
     async def check_if_user_is_in_reporters(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             review_id: ObjectId
     ) -> bool:
-        if collection.find_one({'reporters': user_id, '_id': review_id}):
+        if await collection.find_one({'reporters': user_id, '_id': review_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def add_user_to_reporters(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             review_id: ObjectId
     ) -> None:
-        collection.update_one({'_id': review_id}, {'$push': {'reporters': user_id}})
+        await collection.update_one({'_id': review_id}, {'$push': {'reporters': user_id}})
 
     @staticmethod
     async def increase_review_report_count(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId
     ) -> None:
-        collection.update_one({'_id': review_id}, {'$inc': {'report_count': 1}})
+        await collection.update_one({'_id': review_id}, {'$inc': {'report_count': 1}})
 
     @staticmethod
     async def machine_increase_review_report_count(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId
     ) -> None:
-        collection.update_one({'_id': review_id}, {'$inc': {'report_count': 50}})
+        await collection.update_one({'_id': review_id}, {'$inc': {'report_count': 50}})
 
     @staticmethod
     async def get_review_by_id(
-            collection: Collection[Review],
+            collection: AsyncIOMotorCollection,
             review_id: ObjectId,
     ) -> Review:
-        return collection.find_one({'_id': review_id})
+        return await collection.find_one({'_id': review_id})
 
     @staticmethod
     async def copy_review_to_banned_collection(
-            collection: Collection[Review],
-            banned_reviews_collection: Collection[BannedReview],
+            collection: AsyncIOMotorCollection,
+            banned_reviews_collection: AsyncIOMotorCollection,
             review_id: ObjectId,
             reason: str
     ) -> BannedReview:
-        db_banned_review = collection.find_one({'_id': review_id})
+        db_banned_review = await collection.find_one({'_id': review_id})
         db_banned_review = BannedReview(
             **dict(db_banned_review),
             ban_date=datetime.now(),
             reason=reason
         )
-        banned_reviews_collection.insert_one(dict(db_banned_review))
+        await banned_reviews_collection.insert_one(dict(db_banned_review))
         return db_banned_review
 
     @staticmethod
     async def get_user_banned_reviews(
-            collection: Collection[BannedReview],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             user_id: ObjectId
     ) -> list[BannedReview]:
         return (
-            list(collection.find({'user_id': user_id}).skip(offset).limit(limit))
+            await collection.find({'user_id': user_id}).skip(offset).limit(limit).to_list(None)
         )
 
     @staticmethod
     async def count_user_banned_reviews(
-            collection: Collection[BannedReview],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ) -> int:
         return (
-            collection.count_documents(filter={'user_id': {'$eq': user_id}})
+            await collection.count_documents(filter={'user_id': {'$eq': user_id}})
         )
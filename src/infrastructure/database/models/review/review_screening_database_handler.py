@@ -0,0 +1,20 @@
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.job_queue import JobQueueDatabaseHandler
+
+
+class ReviewScreeningDatabaseHandler:
+    """
+    Reviews waiting for hate speech screening, one job per review `{_id: review_id, review, version}`.
+    Editing a review before it was screened replaces its text and `version`, so a screening of the old text
+    does not remove the new one from the queue.
+    """
+
+    @staticmethod
+    async def enqueue(collection: AsyncIOMotorCollection, review_id: ObjectId, review: str) -> None:
+        await collection.update_one(
+            {'_id': review_id},
+            {'$set': JobQueueDatabaseHandler.new_job(review=review, version=ObjectId())},
+            upsert=True
+        )
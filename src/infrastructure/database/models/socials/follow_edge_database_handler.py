@@ -0,0 +1,98 @@
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.alcohol.alcohol_database_handler import MAX_SLICE_SIZE
+
+# the other side of the edge for both directions of the graph
+SIDES = {'follower_id': 'followee_id', 'followee_id': 'follower_id'}
+
+
+class FollowEdgeDatabaseHandler:
+    """
+    One document per follow, `{follower_id, followee_id}`. Unique index on (follower_id, followee_id)
+    and index on (followee_id, follower_id) make every listing, count and membership check an index scan.
+    `side` is the field holding the user whose followers (`followee_id`) or following (`follower_id`) are read.
+    """
+
+    @staticmethod
+    async def create_indexes(collection: AsyncIOMotorCollection) -> None:
+        await collection.create_index([('follower_id', ASCENDING), ('followee_id', ASCENDING)], unique=True)
+        await collection.create_index([('followee_id', ASCENDING), ('follower_id', ASCENDING)])
+
+    @staticmethod
+    async def add_edge(collection: AsyncIOMotorCollection, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        try:
+            await collection.insert_one({'follower_id': follower_id, 'followee_id': followee_id})
+        except DuplicateKeyError:
+            return False
+        return True
+
+    @staticmethod
+    async def delete_edge(collection: AsyncIOMotorCollection, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        result = await collection.delete_one({'follower_id': follower_id, 'followee_id': followee_id})
+        return result.deleted_count > 0
+
+    @staticmethod
+    async def check_if_edge_exists(
+            collection: AsyncIOMotorCollection,
+            follower_id: ObjectId,
+            followee_id: ObjectId
+    ) -> bool:
+        return await collection.count_documents({'follower_id': follower_id, 'followee_id': followee_id}, limit=1) > 0
+
+    @staticmethod
+    async def count_edges(collection: AsyncIOMotorCollection, side: str, user_id: ObjectId) -> int:
+        return await collection.count_documents({side: user_id})
+
+    @staticmethod
+    async def get_user_ids(
+            collection: AsyncIOMotorCollection,
+            side: str,
+            user_id: ObjectId,
+            limit: int,
+            offset: int = 0,
+            after: ObjectId | None = None
+    ) -> list[ObjectId]:
+        """Ids on the other side of the edges, ordered by id and read from the index only."""
+        other = SIDES[side]
+        query = {side: user_id}
+        if after:
+            query[other] = {'$gt': after}
+        cursor = collection.find(query, {'_id': 0, other: 1}).sort(other, ASCENDING).skip(offset).limit(limit)
+        return [edge[other] for edge in await cursor.to_list(None)]
+
+    @staticmethod
+    async def search_users(
+            collection: AsyncIOMotorCollection,
+            side: str,
+            user_id: ObjectId,
+            phrase: str,
+            limit: int,
+            offset: int
+    ) -> tuple[list[dict], int]:
+        """Users on the other side of the edges with username matching the phrase, and their number."""
+        other = SIDES[side]
+        result = await collection.aggregate([
+            {'$match': {side: user_id}},
+            {'$sort': {other: ASCENDING}},
+            {'$lookup': {'from': 'users', 'localField': other, 'foreignField': '_id', 'as': 'user'}},
+            {'$unwind': '$user'},
+            {'$replaceRoot': {'newRoot': '$user'}},
+            {'$match': {'username': {'$regex': phrase, '$options': 'i'}}},
+            {'$facet': {
+                'users': [{'$skip': offset}, {'$limit': limit if limit > 0 else MAX_SLICE_SIZE}],
+                'total': [{'$count': 'count'}]
+            }}
+        ]).to_list(None)
+        total = result[0]['total']
+        return result[0]['users'], total[0]['count'] if total else 0
+
+    @staticmethod
+    async def delete_user_edges(collection: AsyncIOMotorCollection, user_id: ObjectId) -> tuple[list, list]:
+        """Delete every edge of the user, returns ids of users it followed and of users following it."""
+        following = await collection.distinct('followee_id', {'follower_id': user_id})
+        followers = await collection.distinct('follower_id', {'followee_id': user_id})
+        await collection.delete_many({'$or': [{'follower_id': user_id}, {'followee_id': user_id}]})
+        return following, followers
@@ -1,43 +1,26 @@
 from bson import ObjectId
-from pymongo.collection import Collection
+from pymongo import ASCENDING
+from motor.motor_asyncio import AsyncIOMotorCollection
 
-from src.infrastructure.database.models.user import User
-from src.infrastructure.database.models.socials.followers import Followers
-from src.infrastructure.database.models.socials.following import Following
 from src.infrastructure.database.models.socials.followers_database_handler import FollowersDatabaseHandler
 
 
 class FollowingDatabaseHandler:
 
     @staticmethod
-    async def get_following_by_user_id(
-            limit: int,
-            offset: int,
-            following_collection: Collection[Following],
-            users_collection: Collection[User],
-            user_id: ObjectId = None,
-    ) -> list[dict]:
-        following = following_collection.find_one({'_id': user_id}, {'following': 1})
-        following = following['following']
-
-        return (
-            list(users_collection.find({'_id': {'$in': following}}).skip(offset).limit(limit))
-        )
-
-    @staticmethod
-    async def delete_user_from_following(collection: Collection[Following], user_id: ObjectId,
+    async def delete_user_from_following(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                          following_user_id: ObjectId) -> int:
-        update = collection.update_one({'_id': user_id}, {'$pull': {'following': following_user_id}})
+        update = await collection.update_one({'_id': user_id}, {'$pull': {'following': following_user_id}})
         return update.modified_count
 
     @staticmethod
-    async def add_user_to_following(collection: Collection[Following], user_id: ObjectId,
+    async def add_user_to_following(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                     following_user_id: ObjectId) -> None:
-        collection.update_one({'_id': user_id}, {'$push': {'following': following_user_id}})
+        await collection.update_one({'_id': user_id}, {'$push': {'following': following_user_id}})
 
     @staticmethod
-    async def increase_following_counter(collection: Collection, current_user_id: ObjectId) -> None:
-        collection.update_one(
+    async def increase_following_counter(collection: AsyncIOMotorCollection, current_user_id: ObjectId) -> None:
+        await collection.update_one(
             {'_id': {'$eq': ObjectId(current_user_id)}},
             {
                 '$inc': {'following_count': 1}
@@ -45,8 +28,8 @@ class FollowingDatabaseHandler:
         )
 
     @staticmethod
-    async def decrease_following_counter(collection: Collection, current_user_id: ObjectId) -> None:
-        collection.update_one(
+    async def decrease_following_counter(collection: AsyncIOMotorCollection, current_user_id: ObjectId) -> None:
+        await collection.update_one(
             {
                 '_id': {'$eq': current_user_id},
                 'following_count': {'$gt': 0}
@@ -57,30 +40,30 @@ class FollowingDatabaseHandler:
         )
 
     @staticmethod
-    async def check_if_user_in_following(collection: Collection[Following], user_id: ObjectId,
+    async def check_if_user_in_following(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                          following_user_id: ObjectId) -> bool:
-        if collection.find_one({'_id': user_id, 'following': following_user_id}):
+        if await collection.find_one({'_id': user_id, 'following': following_user_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def count_following(
-            following_collection: Collection[Following],
-            users_collection: Collection,
+            following_collection: AsyncIOMotorCollection,
+            users_collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             phrase: str | None = None
     ) -> int:
-        following = following_collection.find_one({'_id': user_id}, {'following': 1})
+        following = await following_collection.find_one({'_id': user_id}, {'following': 1})
         following = following['following']
         query = {'_id': {'$in': following}}
         if phrase:
             query |= {'username': {'$regex': phrase, '$options': 'i'}}
-        return users_collection.count_documents(filter=query)
+        return await users_collection.count_documents(filter=query)
 
     @staticmethod
-    async def batch_decrease_following_counter(collection: Collection[User], user_ids: [ObjectId]) -> None:
-        collection.update_many(
+    async def batch_decrease_following_counter(collection: AsyncIOMotorCollection, user_ids: [ObjectId]) -> None:
+        await collection.update_many(
             {
                 '_id': {'$in': user_ids},
                 'following_count': {'$gt': 0}
@@ -92,28 +75,32 @@ class FollowingDatabaseHandler:
 
     @staticmethod
     async def delete_user_following(
-            following_collection: Collection[Following],
-            followers_collection: Collection[Followers],
-            users: Collection[User],
+            following_collection: AsyncIOMotorCollection,
+            followers_collection: AsyncIOMotorCollection,
+            users: AsyncIOMotorCollection,
             user_id: ObjectId
     ):
-        followed_users = following_collection.find_one({'_id': user_id}, {'following': 1, '_id': 0})
+        followed_users = await following_collection.find_one({'_id': user_id}, {'following': 1, '_id': 0})
+        if not followed_users:
+            return
         followed_users = followed_users.get('following')
-        following_collection.delete_one({'_id': user_id})
+        await following_collection.delete_one({'_id': user_id})
         await FollowersDatabaseHandler.delete_user_from_many_followers_list(followers_collection, followed_users,
                                                                             user_id)
         await FollowersDatabaseHandler.batch_decrease_followers_counter(users, followed_users)
 
     @staticmethod
     async def delete_user_followers(
-            followers_collection: Collection[Followers],
-            following_collection: Collection[Following],
-            users: Collection[User],
+            followers_collection: AsyncIOMotorCollection,
+            following_collection: AsyncIOMotorCollection,
+            users: AsyncIOMotorCollection,
             user_id: ObjectId
     ):
-        users_following_me = followers_collection.find_one({'_id': user_id}, {'followers': 1, '_id': 0})
+        users_following_me = await followers_collection.find_one({'_id': user_id}, {'followers': 1, '_id': 0})
+        if not users_following_me:
+            return
         users_following_me = users_following_me.get('followers')
-        followers_collection.delete_one({'_id': user_id})
+        await followers_collection.delete_one({'_id': user_id})
         if users_following_me:
             await FollowingDatabaseHandler.delete_user_from_multiple_following_lists(following_collection,
                                                                                      users_following_me, user_id)
@@ -121,26 +108,40 @@ class FollowingDatabaseHandler:
 
     @staticmethod
     async def delete_user_from_multiple_following_lists(
-            collection: Collection[Following],
+            collection: AsyncIOMotorCollection,
             user_ids: list[ObjectId],
             follower_user_id: ObjectId
     ):
-        collection.update_many({'_id': {'$in': user_ids}}, {'$pull': {'following': follower_user_id}})
+        await collection.update_many({'_id': {'$in': user_ids}}, {'$pull': {'following': follower_user_id}})
+
+    @staticmethod
+    async def get_following_after(
+            limit: int,
+            after: ObjectId | None,
+            following_collection: AsyncIOMotorCollection,
+            users_collection: AsyncIOMotorCollection,
+            user_id: ObjectId
+    ) -> list[dict]:
+        following = await following_collection.find_one({'_id': user_id}, {'following': 1})
+        query = {'$in': following['following']}
+        if after:
+            query['$gt'] = after
+        return await users_collection.find({'_id': query}).sort('_id', ASCENDING).limit(limit).to_list(None)
 
     @staticmethod
     async def search_following_by_user_id(
             limit: int,
             offset: int,
-            following_collection: Collection[Following],
-            users_collection: Collection[User],
+            following_collection: AsyncIOMotorCollection,
+            users_collection: AsyncIOMotorCollection,
             phrase: str | None,
             user_id: ObjectId = None
     ) -> list[dict]:
-        following = following_collection.find_one({'_id': user_id}, {'following': 1})
+        following = await following_collection.find_one({'_id': user_id}, {'following': 1})
         following = following['following']
         query = {'_id': {'$in': following}}
         if phrase:
             query |= {'username': {'$regex': phrase, '$options': 'i'}}
         return (
-            list(users_collection.find(query).skip(offset).limit(limit))
+            await users_collection.find(query).skip(offset).limit(limit).to_list(None)
         )
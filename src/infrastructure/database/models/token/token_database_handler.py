@@ -1,19 +1,31 @@
+from bson import ObjectId
 from datetime import datetime
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 
 class TokenBlacklistDatabaseHandler:
     @staticmethod
     async def add_token_to_blacklist(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             token_jti: str,
             expiration_date: datetime
     ) -> None:
-        collection.insert_one({'token_jti': token_jti, 'expiration_date': expiration_date})
+        await collection.insert_one({'token_jti': token_jti, 'expiration_date': expiration_date})
 
     @staticmethod
     async def check_if_token_is_blacklisted(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             token_jti: str
     ) -> bool:
-        return True if collection.find_one({'token_jti': token_jti}) else False
+        return True if await collection.find_one({'token_jti': token_jti}) else False
+
+    @staticmethod
+    async def get_blacklisted_tokens(
+            collection: AsyncIOMotorCollection,
+            expiring_after: datetime,
+            inserted_after: ObjectId | None = None
+    ) -> list[dict]:
+        query = {'expiration_date': {'$gt': expiring_after}}
+        if inserted_after:
+            query['_id'] = {'$gte': inserted_after}
+        return await collection.find(query, {'_id': 0, 'token_jti': 1, 'expiration_date': 1}).to_list(None)
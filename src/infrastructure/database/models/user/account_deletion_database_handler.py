@@ -0,0 +1,79 @@
+from bson import ObjectId
+from pymongo import ReturnDocument
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+
+class AccountDeletionDatabaseHandler:
+    """
+    One document per account being deleted, `{_id: user_id, step, batch, locked_until, created_at, updated_at}`.
+    `step` is the first step of the cascade not finished yet, the document is removed once the account is gone.
+    `batch` is the batch of the step being applied, saved before it is applied with what of it was applied
+    so far, so it can be finished after an interruption.
+    `locked_until` keeps two workers from running the same deletion at once.
+    """
+
+    @staticmethod
+    async def create_job(collection: AsyncIOMotorCollection, user_id: ObjectId, step: str) -> None:
+        now = datetime.utcnow()
+        await collection.update_one(
+            {'_id': user_id},
+            {'$setOnInsert': {'step': step, 'locked_until': None, 'created_at': now, 'updated_at': now}},
+            upsert=True
+        )
+
+    @staticmethod
+    async def claim_job(collection: AsyncIOMotorCollection, user_id: ObjectId, lease: int) -> dict | None:
+        """Lock the job for `lease` seconds, returns None when it is done or another worker holds it."""
+        now = datetime.utcnow()
+        return await collection.find_one_and_update(
+            {'_id': user_id, '$or': [{'locked_until': None}, {'locked_until': {'$lt': now}}]},
+            {'$set': {'locked_until': now + timedelta(seconds=lease)}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    @staticmethod
+    async def set_step(collection: AsyncIOMotorCollection, user_id: ObjectId, step: str, lease: int) -> None:
+        now = datetime.utcnow()
+        await collection.update_one(
+            {'_id': user_id},
+            {'$set': {'step': step, 'locked_until': now + timedelta(seconds=lease), 'updated_at': now}}
+        )
+
+    @staticmethod
+    async def get_job(collection: AsyncIOMotorCollection, user_id: ObjectId) -> dict | None:
+        return await collection.find_one({'_id': user_id})
+
+    @staticmethod
+    async def save_batch(collection: AsyncIOMotorCollection, user_id: ObjectId, batch: dict | None,
+                         lease: int) -> None:
+        """Save the batch about to be applied, or None once it is done, renewing the lease."""
+        now = datetime.utcnow()
+        await collection.update_one(
+            {'_id': user_id},
+            {'$set': {'batch': batch, 'locked_until': now + timedelta(seconds=lease), 'updated_at': now}}
+        )
+
+    @staticmethod
+    async def mark_applied(collection: AsyncIOMotorCollection, user_id: ObjectId, item, lease: int) -> None:
+        """Record `item` of the batch as applied, renewing the lease."""
+        now = datetime.utcnow()
+        await collection.update_one(
+            {'_id': user_id},
+            {
+                '$addToSet': {'batch.applied': item},
+                '$set': {'locked_until': now + timedelta(seconds=lease), 'updated_at': now}
+            }
+        )
+
+    @staticmethod
+    async def release_job(collection: AsyncIOMotorCollection, user_id: ObjectId) -> None:
+        await collection.update_one({'_id': user_id}, {'$set': {'locked_until': None}})
+
+    @staticmethod
+    async def delete_job(collection: AsyncIOMotorCollection, user_id: ObjectId) -> None:
+        await collection.delete_one({'_id': user_id})
+
+    @staticmethod
+    async def get_pending_user_ids(collection: AsyncIOMotorCollection) -> list[ObjectId]:
+        return await collection.distinct('_id')
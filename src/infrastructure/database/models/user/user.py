@@ -25,3 +25,4 @@ class User(TypedDict):
     verification_code: str | None
     reset_password_code: str | None
     delete_account_code: str | None
+    deletion_pending: bool
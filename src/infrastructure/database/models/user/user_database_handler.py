@@ -2,15 +2,16 @@ from bcrypt import gensalt
 from random import randbytes
 from pydantic import EmailStr
 from datetime import datetime
+from time import perf_counter
 from bson import ObjectId, Int64
-from passlib.context import CryptContext
-from pymongo.collection import Collection, ReturnDocument
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.domain.user import UserCreate
 from src.domain.user.user_email import UserEmail
 from src.infrastructure.database.models.user import User
 from src.infrastructure.email.email_handler import Email
-from src.infrastructure.database.models.user_tag import UserTag
+from src.infrastructure.auth.password_hasher import password_hasher
 from src.infrastructure.email.email_utils import dehash_token, hash_token
 from src.infrastructure.database.models.user_list.wishlist import UserWishlist
 from src.infrastructure.database.models.user_list.favourites import Favourites
@@ -18,35 +19,41 @@ from src.infrastructure.exceptions.users_exceptions import UserNotFoundException
 from src.infrastructure.config.app_config import get_settings, ApplicationSettings
 from src.infrastructure.database.models.user_list.search_history import UserSearchHistory
 from src.infrastructure.exceptions.auth_exceptions import UserBannedException, InvalidCredentialsException, \
-    EmailNotVerifiedException, SendingEmailError, InvalidVerificationCode
-
-pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+    EmailNotVerifiedException, SendingEmailError, InvalidVerificationCode, AccountDeletionPendingException
 
 
 class UserDatabaseHandler:
     @staticmethod
-    def get_password_hash(password: str, salt: str) -> str:
-        return pwd_context.hash(salt + password)
+    async def get_password_hash(password: str, salt: str) -> str:
+        return await password_hasher.hash(salt + password)
+
+    @staticmethod
+    async def verify_password(password_raw: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(password_raw, hashed_password)
+
+    @staticmethod
+    async def ban_user(collection: AsyncIOMotorCollection, user_id: ObjectId) -> None:
+        await collection.find_one_and_update({'_id': user_id}, {"$set": {'is_banned': True}})
 
     @staticmethod
-    def verify_password(password_raw: str, hashed_password: str) -> bool:
-        return pwd_context.verify(password_raw, hashed_password)
+    async def unban_user(collection: AsyncIOMotorCollection, user_id: ObjectId) -> None:
+        await collection.find_one_and_update({'_id': user_id}, {"$set": {'is_banned': False}})
 
     @staticmethod
-    async def ban_user(collection: Collection[User], user_id: ObjectId) -> None:
-        collection.find_one_and_update({'_id': user_id}, {"$set": {'is_banned': True}})
+    async def set_deletion_pending(collection: AsyncIOMotorCollection, user_id: ObjectId) -> None:
+        await collection.update_one({'_id': user_id}, {'$set': {'deletion_pending': True}})
 
     @staticmethod
-    async def unban_user(collection: Collection[User], user_id: ObjectId) -> None:
-        collection.find_one_and_update({'_id': user_id}, {"$set": {'is_banned': False}})
+    async def get_user_by_id(collection: AsyncIOMotorCollection, user_id: ObjectId) -> User | None:
+        return await collection.find_one({'_id': user_id})
 
     @staticmethod
-    async def get_user_by_id(collection: Collection[User], user_id: ObjectId) -> User | None:
-        return collection.find_one({'_id': user_id})
+    async def get_users_by_ids(collection: AsyncIOMotorCollection, user_ids: list[ObjectId]) -> list[User]:
+        return await collection.find({'_id': {'$in': user_ids}}).to_list(None)
 
     @staticmethod
     async def get_users(
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             username: str | None,
@@ -57,21 +64,19 @@ class UserDatabaseHandler:
         if current:
             query['$and'].append({'username': {'$ne': current}})\
                 if query.get('$and', None) else query.update({'username': {'$ne': current}})
-        return list(
-            collection.find(query).skip(offset).limit(limit)
-        )
+        return await collection.find(query).skip(offset).limit(limit).to_list(None)
 
     @staticmethod
-    async def count_users(collection: Collection[User], username: str) -> int:
+    async def count_users(collection: AsyncIOMotorCollection, username: str) -> int:
         return (
-            collection.count_documents(filter={'username': {'$regex': username, '$options': 'i'}})
+            await collection.count_documents(filter={'username': {'$regex': username, '$options': 'i'}})
             if username
-            else collection.estimated_document_count()
+            else await collection.estimated_document_count()
         )
 
     @staticmethod
     async def count_users_without_current(
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
             username: str | None,
             current_user: User
     ) -> int:
@@ -79,31 +84,31 @@ class UserDatabaseHandler:
         if username:
             query['username'] |= {'$regex': username, '$options': 'i'}
         return (
-            collection.count_documents(filter=query)
+            await collection.count_documents(filter=query)
             if username
-            else collection.estimated_document_count()
+            else await collection.estimated_document_count()
         )
 
     @staticmethod
-    async def delete_user(collection: Collection[User], user_id: ObjectId) -> None:
-        collection.delete_one({'_id': user_id})
+    async def delete_user(collection: AsyncIOMotorCollection, user_id: ObjectId) -> None:
+        await collection.delete_one({'_id': user_id})
 
     @staticmethod
     async def delete_user_lists(
-            favourites: Collection[Favourites],
-            wishlist: Collection[UserWishlist],
-            search_history: Collection[UserSearchHistory],
-            tags: Collection[UserTag],
+            favourites: AsyncIOMotorCollection,
+            wishlist: AsyncIOMotorCollection,
+            search_history: AsyncIOMotorCollection,
+            tags: AsyncIOMotorCollection,
             user_id: ObjectId
     ) -> None:
-        favourites.delete_one({'user_id': user_id})
-        wishlist.delete_one({'user_id': user_id})
-        search_history.delete_one({'user_id': user_id})
-        tags.delete_many({'user_id': user_id})
+        await favourites.delete_one({'user_id': user_id})
+        await wishlist.delete_one({'user_id': user_id})
+        await search_history.delete_one({'user_id': user_id})
+        await tags.delete_many({'user_id': user_id})
 
     @staticmethod
     async def check_if_user_exists(
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
             email: str = None,
             username: str = None,
             user_id: ObjectId = None
@@ -118,17 +123,17 @@ class UserDatabaseHandler:
             return False
 
     @staticmethod
-    async def get_user_by_email(collection: Collection[User], email: str) -> User | None:
-        return collection.find_one({'email': email})
+    async def get_user_by_email(collection: AsyncIOMotorCollection, email: str) -> User | None:
+        return await collection.find_one({'email': email})
 
     @staticmethod
-    async def get_user_by_username(collection: Collection[User], username: str) -> User | None:
-        return collection.find_one({'username': username})
+    async def get_user_by_username(collection: AsyncIOMotorCollection, username: str) -> User | None:
+        return await collection.find_one({'username': username})
 
     @staticmethod
-    async def create_user(collection: Collection[User], payload: UserCreate):
+    async def create_user(collection: AsyncIOMotorCollection, payload: UserCreate):
         password_salt = gensalt().decode('utf-8')
-        payload.password = UserDatabaseHandler.get_password_hash(
+        payload.password = await UserDatabaseHandler.get_password_hash(
             payload.password,
             password_salt
         )
@@ -150,97 +155,104 @@ class UserDatabaseHandler:
             updated_at=datetime.now(),
             is_verified=False,
             verification_code=None)
-        user = collection.insert_one(db_user)
-        return collection.find_one({'_id': user.inserted_id})
+        user = await collection.insert_one(db_user)
+        return await collection.find_one({'_id': user.inserted_id})
 
     @staticmethod
     async def send_verification_mail(
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
+            email_queue: AsyncIOMotorCollection,
             user: User,
             settings: ApplicationSettings
     ):
         token = randbytes(10)
         verification_code = hash_token(token)
-        new_user = collection.find_one_and_update({'_id': user['_id']}, {
+        new_user = await collection.find_one_and_update({'_id': user['_id']}, {
             '$set': {'verification_code': verification_code, 'updated_at': datetime.utcnow()}},
-                                                  return_document=ReturnDocument.AFTER)
+                                                        return_document=ReturnDocument.AFTER)
         url = f'{settings.HOST}:{settings.HOST_PORT}/auth/verify_email/{token.hex()}'
-        await Email(new_user, url, [EmailStr(user['email'])]).send_verification_code()
+        await Email(new_user, url, [EmailStr(user['email'])]).send_verification_code(email_queue, settings)
 
     @staticmethod
     async def verify_email(
             token: str,
-            collection: Collection[User]
-    ):
+            collection: AsyncIOMotorCollection
+    ) -> User:
         verification_code = dehash_token(token)
-        result = collection.find_one_and_update({'verification_code': verification_code}, {
+        result = await collection.find_one_and_update({'verification_code': verification_code}, {
             '$set': {'verification_code': None, 'is_verified': True, 'updated_at': datetime.utcnow()}}, new=True,
-                                                return_document=ReturnDocument.AFTER)
+                                                      return_document=ReturnDocument.AFTER)
         if not result:
             raise InvalidVerificationCode()
+        return result
 
     @staticmethod
     async def authenticate_user(
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
             username: str,
             password: str,
             update_last_login: bool = False
     ) -> User:
+        started_at = perf_counter()
         user = await UserDatabaseHandler.get_user_by_username(collection, username)
         if not user:
             raise UserNotFoundException()
         if not user['is_verified']:
             raise EmailNotVerifiedException()
         raw_password = user['password_salt'] + password
-        if not UserDatabaseHandler.verify_password(raw_password, user['password']):
+        verified = await UserDatabaseHandler.verify_password(raw_password, user['password'])
+        password_hasher.record_login(started_at)
+        if not verified:
             raise InvalidCredentialsException()
         if user['is_banned']:
             raise UserBannedException()
+        if user.get('deletion_pending'):
+            raise AccountDeletionPendingException()
         if update_last_login:
-            collection.update_one({'_id': user['_id']}, {'$set': {'last_login': datetime.now()}})
+            await collection.update_one({'_id': user['_id']}, {'$set': {'last_login': datetime.now()}})
         return user
 
     @staticmethod
     async def create_user_lists(
-            user_collection: Collection[User],
+            user_collection: AsyncIOMotorCollection,
             username: str,
-            wishlist_collection: Collection[UserWishlist],
-            favourites_collection: Collection[Favourites],
-            search_history_collection: Collection[UserSearchHistory],
+            wishlist_collection: AsyncIOMotorCollection,
+            favourites_collection: AsyncIOMotorCollection,
+            search_history_collection: AsyncIOMotorCollection,
     ) -> None:
         user = await UserDatabaseHandler.get_user_by_username(user_collection, username)
         empty_wishlist = UserWishlist(user_id=user['_id'], alcohols=[], _id=ObjectId())
-        wishlist_collection.insert_one(empty_wishlist)
+        await wishlist_collection.insert_one(empty_wishlist)
         empty_favourites = Favourites(user_id=user['_id'], alcohols=[], _id=ObjectId())
-        favourites_collection.insert_one(empty_favourites)
+        await favourites_collection.insert_one(empty_favourites)
         empty_search_history = UserSearchHistory(user_id=user['_id'], alcohols=[], _id=ObjectId())
-        search_history_collection.insert_one(empty_search_history)
+        await search_history_collection.insert_one(empty_search_history)
 
     @staticmethod
     async def search_users_by_phrase(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             limit: int, offset: int,
             phrase: str,
             current_user: User
     ) -> list[dict]:
-        result = list(collection.find(
+        result = await collection.find(
             {'username': {'$regex': phrase, '$options': 'i', '$ne': current_user['username']}}).skip(offset).limit(
-            limit))
+            limit).to_list(None)
         return result
 
     @staticmethod
     async def add_to_favourite_counter(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ):
-        collection.update_one({'_id': {'$eq': ObjectId(user_id)}}, {'$inc': {'favourites_count': 1}})
+        await collection.update_one({'_id': {'$eq': ObjectId(user_id)}}, {'$inc': {'favourites_count': 1}})
 
     @staticmethod
     async def remove_from_favourite_counter(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ):
-        collection.update_one(
+        await collection.update_one(
             {
                 '_id': {'$eq': ObjectId(user_id)},
                 'favourites_count': {'$gt': 0}
@@ -250,88 +262,108 @@ class UserDatabaseHandler:
             }
         )
 
+    @staticmethod
+    async def remove_from_favourite_counters(
+            collection: AsyncIOMotorCollection,
+            user_ids: list[ObjectId]
+    ):
+        await collection.update_many(
+            {
+                '_id': {'$in': user_ids},
+                'favourites_count': {'$gt': 0}
+            },
+            {
+                '$inc': {'favourites_count': -1}
+            }
+        )
+
     @staticmethod
     async def send_password_reset_request(
             payload: UserEmail,
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
+            email_queue: AsyncIOMotorCollection,
             user: User,
             settings: ApplicationSettings
     ):
         try:
             token = randbytes(10)
             reset_password_code = hash_token(token)
-            collection.find_one_and_update({'_id': user['_id']}, {
+            await collection.find_one_and_update({'_id': user['_id']}, {
                 '$set': {'reset_password_code': reset_password_code, 'updated_at': datetime.utcnow()}},
-                                           return_document=ReturnDocument.AFTER)
+                                                 return_document=ReturnDocument.AFTER)
             url = f'https://{settings.WEB_HOST}:{settings.WEB_PORT}/reset_password/{token.hex()}'
-            await Email(user, url, [EmailStr(payload.email)]).send_reset_password_code()
+            await Email(user, url, [EmailStr(payload.email)]).send_reset_password_code(email_queue, settings)
         except Exception:
-            collection.find_one_and_update({'_id': user['_id']},
-                                           {'$set': {'reset_password_code': None, 'updated_at': datetime.utcnow()}},
-                                           return_document=ReturnDocument.AFTER)
+            await collection.find_one_and_update(
+                {'_id': user['_id']},
+                {'$set': {'reset_password_code': None, 'updated_at': datetime.utcnow()}},
+                return_document=ReturnDocument.AFTER
+            )
             raise SendingEmailError()
 
     @staticmethod
     async def check_reset_token(
             token: str,
-            collection: Collection[User]
+            collection: AsyncIOMotorCollection
     ):
         reset_password_code = dehash_token(token)
-        return collection.find_one({'reset_password_code': reset_password_code})
+        return await collection.find_one({'reset_password_code': reset_password_code})
 
     @staticmethod
     async def change_password(
             new_password: str,
             token: str,
-            collection: Collection[User]
-    ):
+            collection: AsyncIOMotorCollection
+    ) -> User | None:
         reset_password_code = dehash_token(token)
         password_salt = gensalt().decode('utf-8')
-        new_password = UserDatabaseHandler.get_password_hash(new_password, password_salt)
-        collection.find_one_and_update({'reset_password_code': reset_password_code},
-                                       {'$set': {'password': new_password, 'password_salt': password_salt,
-                                                 'reset_password_code': None, 'updated_at': datetime.utcnow()}})
+        new_password = await UserDatabaseHandler.get_password_hash(new_password, password_salt)
+        return await collection.find_one_and_update({'reset_password_code': reset_password_code},
+                                                    {'$set': {'password': new_password, 'password_salt': password_salt,
+                                                              'reset_password_code': None,
+                                                              'updated_at': datetime.utcnow()}})
 
     @staticmethod
     async def send_deletion_request(
             current_user: User,
-            collection: Collection[User],
+            collection: AsyncIOMotorCollection,
+            email_queue: AsyncIOMotorCollection,
             settings: ApplicationSettings
     ):
         try:
             token = randbytes(10)
             delete_account_code = hash_token(token)
-            user = collection.find_one_and_update({'_id': current_user['_id']},
-                                                  {'$set': {'delete_account_code': delete_account_code}},
-                                                  return_document=ReturnDocument.AFTER)
+            user = await collection.find_one_and_update({'_id': current_user['_id']},
+                                                        {'$set': {'delete_account_code': delete_account_code}},
+                                                        return_document=ReturnDocument.AFTER)
             url = f'{settings.HOST}:{settings.HOST_PORT}/me/delete_account/{token.hex()}'
-            await Email(user, url, [EmailStr(current_user['email'])]).send_delete_account_code()
+            await Email(user, url, [EmailStr(current_user['email'])]).send_delete_account_code(email_queue, settings)
         except Exception:
-            collection.find_one_and_update({'_id': current_user['_id']}, {'$set': {'delete_account_code': None}})
+            await collection.find_one_and_update({'_id': current_user['_id']}, {'$set': {'delete_account_code': None}})
             raise SendingEmailError
 
     @staticmethod
-    async def find_user_by_deletion_code(token: str, collection: Collection[User]):
+    async def find_user_by_deletion_code(token: str, collection: AsyncIOMotorCollection):
         delete_account_code = dehash_token(token)
-        return collection.find_one({'delete_account_code': delete_account_code})
+        return await collection.find_one({'delete_account_code': delete_account_code})
 
     @staticmethod
-    async def delete_user_by_id(user_id: ObjectId, collection: Collection[User]):
-        return collection.find_one_and_delete({'_id': user_id})
+    async def delete_user_by_id(user_id: ObjectId, collection: AsyncIOMotorCollection):
+        return await collection.find_one_and_delete({'_id': user_id})
 
     @staticmethod
     async def add_to_wishlist_counter(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ):
-        collection.update_one({'_id': {'$eq': ObjectId(user_id)}}, {'$inc': {'wishlist_count': 1}})
+        await collection.update_one({'_id': {'$eq': ObjectId(user_id)}}, {'$inc': {'wishlist_count': 1}})
 
     @staticmethod
     async def remove_from_wishlist_counter(
-            collection: Collection,
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ):
-        collection.update_one(
+        await collection.update_one(
             {
                 '_id': {'$eq': ObjectId(user_id)},
                 'wishlist_count': {'$gt': 0}
@@ -340,3 +372,18 @@ class UserDatabaseHandler:
                 '$inc': {'wishlist_count': -1}
             }
         )
+
+    @staticmethod
+    async def remove_from_wishlist_counters(
+            collection: AsyncIOMotorCollection,
+            user_ids: list[ObjectId]
+    ):
+        await collection.update_many(
+            {
+                '_id': {'$in': user_ids},
+                'wishlist_count': {'$gt': 0}
+            },
+            {
+                '$inc': {'wishlist_count': -1}
+            }
+        )
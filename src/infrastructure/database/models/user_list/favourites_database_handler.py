@@ -1,8 +1,7 @@
 from bson import ObjectId
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
-from src.domain.alcohol import AlcoholBase
-from src.infrastructure.database.models.user_list.favourites import Favourites
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
 
 
 class UserFavouritesHandler:
@@ -10,41 +9,44 @@ class UserFavouritesHandler:
     async def get_user_favourites_by_user_id(
             limit: int,
             offset: int,
-            favourites_collection: Collection[Favourites],
-            alcohols_collection: Collection[AlcoholBase],
+            favourites_collection: AsyncIOMotorCollection,
+            alcohols_collection: AsyncIOMotorCollection,
             user_id: ObjectId,
-    ) -> list[dict]:
-        favourites = favourites_collection.find_one({'user_id': user_id}, {'alcohols': 1})
-        favourites = favourites['alcohols']
-
-        return list(alcohols_collection.find({'_id': {'$in': favourites}}).skip(offset).limit(limit))
+    ) -> tuple[list[dict], int]:
+        return await AlcoholDatabaseHandler.get_alcohols_page_from_list(
+            favourites_collection, alcohols_collection, {'user_id': user_id}, limit, offset
+        )
 
     @staticmethod
-    async def delete_alcohol_from_favourites(collection: Collection[Favourites], user_id: ObjectId,
+    async def delete_alcohol_from_favourites(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                              alcohol_id: ObjectId) -> int:
-        update = collection.update_one({'user_id': user_id}, {'$pull': {'alcohols': alcohol_id}})
+        update = await collection.update_one({'user_id': user_id}, {'$pull': {'alcohols': alcohol_id}})
         return update.modified_count
 
     @staticmethod
-    async def add_alcohol_to_favourites(collection: Collection[Favourites], user_id: ObjectId,
+    async def add_alcohol_to_favourites(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                         alcohol_id: ObjectId) -> None:
-        collection.update_one({'user_id': user_id}, {'$push': {'alcohols': alcohol_id}})
+        await collection.update_one({'user_id': user_id}, {'$push': {'alcohols': alcohol_id}})
+
+    @staticmethod
+    async def add_alcohols_to_favourites(collection: AsyncIOMotorCollection, user_id: ObjectId,
+                                         alcohol_ids: list[ObjectId]) -> None:
+        await collection.update_one({'user_id': user_id}, {'$addToSet': {'alcohols': {'$each': alcohol_ids}}})
 
     @staticmethod
-    async def check_if_alcohol_in_favourites(collection: Collection[Favourites], user_id: ObjectId,
+    async def delete_alcohol_from_all_favourites(
+            collection: AsyncIOMotorCollection,
+            alcohol_id: ObjectId
+    ) -> list[ObjectId]:
+        """Returns ids of the users the alcohol was removed for."""
+        user_ids = await collection.distinct('user_id', {'alcohols': alcohol_id})
+        await collection.update_many({'user_id': {'$in': user_ids}}, {'$pull': {'alcohols': alcohol_id}})
+        return user_ids
+
+    @staticmethod
+    async def check_if_alcohol_in_favourites(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                              alcohol_id: ObjectId) -> bool:
-        if collection.find_one({'user_id': user_id, 'alcohols': alcohol_id}):
+        if await collection.find_one({'user_id': user_id, 'alcohols': alcohol_id}):
             return True
         else:
             return False
-
-    @staticmethod
-    async def count_alcohols_in_favourites(
-            favourites_collection: Collection[Favourites],
-            alcohols_collection: Collection,
-            user_id: ObjectId
-    ) -> int:
-        alcohols = favourites_collection.find_one({'user_id': user_id}, {'alcohols': 1})
-        alcohols = alcohols['alcohols']
-
-        return len(list(alcohols_collection.find({'_id': {'$in': alcohols}})))
@@ -1,9 +1,10 @@
 from bson import ObjectId
 from datetime import datetime
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.domain.user_list import SearchHistoryEntry
-from src.infrastructure.database.models.user_list.search_history import UserSearchHistory
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+from src.infrastructure.database.models.alcohol.alcohol_database_handler import MAX_SLICE_SIZE
 
 
 class SearchHistoryHandler:
@@ -11,47 +12,105 @@ class SearchHistoryHandler:
     async def get_user_search_history_user_id(
             limit: int,
             offset: int,
-            search_history_collection: Collection,
-            alcohols_collection: Collection,
+            search_history_collection: AsyncIOMotorCollection,
+            alcohols_collection: AsyncIOMotorCollection,
             user_id: ObjectId = None,
-    ) -> list[SearchHistoryEntry]:
-        search_history = search_history_collection.find_one({'user_id': user_id})
-        search_history = search_history['alcohols'][::-1]
-        right_bound = offset + limit
-        search_history = search_history[offset:right_bound]
-        alcohol_ids = [alcohol['alcohol_id'] for alcohol in search_history]
-        alcohol_list = list((alcohols_collection.find({'_id': {'$in': alcohol_ids}})))
-        alcohols = []
-        for i in range(len(alcohol_list)):
-            alcohol = next((item for item in search_history if item['alcohol_id'] == alcohol_list[i]['_id']), None)
-            alcohols.append(SearchHistoryEntry(alcohol=alcohol_list[i], date=alcohol['search_date']))
-        alcohols.sort(key=lambda search_history_entry: search_history_entry.date, reverse=True)
-        return alcohols
-
-    @staticmethod
-    async def delete_alcohol_from_search_history(collection: Collection[UserSearchHistory], user_id: ObjectId,
+    ) -> tuple[list[SearchHistoryEntry], int]:
+        """History is stored newest first, so the page is sliced out of the array as is."""
+        search_history = await search_history_collection.aggregate([
+            {'$match': {'user_id': user_id}},
+            {'$limit': 1},
+            {'$project': {
+                '_id': 0,
+                'page': {'$slice': ['$alcohols', offset, limit if limit > 0 else MAX_SLICE_SIZE]},
+                'total': {'$size': '$alcohols'}
+            }}
+        ]).to_list(None)
+        if not search_history:
+            return [], 0
+        page, total = search_history[0]['page'], search_history[0]['total']
+        alcohols = {
+            alcohol['_id']: alcohol for alcohol in
+            await AlcoholDatabaseHandler.get_alcohols_by_ids(alcohols_collection, [item['alcohol_id'] for item in page])
+        } if page else {}
+        # left behind by an alcohol searched while being deleted, removed by `src.migrations.dangling_list_alcohols`
+        total -= sum(item['alcohol_id'] not in alcohols for item in page)
+        return [
+            SearchHistoryEntry(alcohol=alcohols[item['alcohol_id']], date=item['search_date'])
+            for item in page if item['alcohol_id'] in alcohols
+        ], total
+
+    @staticmethod
+    async def delete_alcohol_from_search_history(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                                  alcohol_id: ObjectId) -> None:
-        collection.update_many({'user_id': user_id},
-                               {'$pull': {'alcohols': {'alcohol_id': alcohol_id}}})
+        await collection.update_many({'user_id': user_id},
+                                     {'$pull': {'alcohols': {'alcohol_id': alcohol_id}}})
+
+    @staticmethod
+    async def delete_alcohol_from_all_search_histories(collection: AsyncIOMotorCollection,
+                                                       alcohol_id: ObjectId) -> None:
+        await collection.update_many({'alcohols.alcohol_id': alcohol_id},
+                                     {'$pull': {'alcohols': {'alcohol_id': alcohol_id}}})
 
     @staticmethod
-    async def add_alcohol_to_search_history(collection: Collection[UserSearchHistory], user_id: ObjectId,
-                                            alcohol_id: ObjectId, search_date: datetime = None) -> None:
+    async def add_alcohol_to_search_history(collection: AsyncIOMotorCollection, user_id: ObjectId,
+                                            alcohol_id: ObjectId, search_date: datetime = None,
+                                            max_length: int = 0) -> None:
+        """
+        Move the alcohol to the front of the history, keeping at most `max_length` newest entries
+        if it is positive, with a single pipeline update.
+        """
         if search_date is None:
             search_date = datetime.now()
-        collection.update_one({'user_id': user_id}, {'$pull': {'alcohols': {'alcohol_id': alcohol_id}}})
-        collection.update_one({'user_id': user_id},
-                              {'$push': {'alcohols': {'alcohol_id': alcohol_id, 'search_date': search_date}}})
-
-    @staticmethod
-    async def count_alcohols_in_search_history(
-            search_history_collection: Collection[UserSearchHistory],
-            alcohols_collection: Collection,
-            user_id: ObjectId
-    ) -> int:
-        alcohols = search_history_collection.find_one({'user_id': user_id}, {'alcohols': 1})
-        alcohols = alcohols['alcohols']
-        alcohol_ids = []
-        for a_dict in alcohols:
-            alcohol_ids.append(a_dict['alcohol_id'])
-        return len(list(alcohols_collection.find({'_id': {'$in': alcohol_ids}})))
+        entry = {'alcohol_id': alcohol_id, 'search_date': search_date}
+        await collection.update_one({'user_id': user_id}, [
+            {'$set': {'alcohols': {'$concatArrays': [[entry], SearchHistoryHandler._without([alcohol_id])]}}},
+            *SearchHistoryHandler._capped(max_length)
+        ])
+
+    @staticmethod
+    async def merge_into_search_history(collection: AsyncIOMotorCollection, user_id: ObjectId,
+                                        search_dates: dict[ObjectId, datetime], max_length: int = 0) -> None:
+        """
+        Replace entries of the given alcohols with the given search dates, keeping the history sorted
+        newest first and capped to `max_length` entries if it is positive, with a single pipeline update.
+        The history is stored sorted, so every new entry is put between the stored entries newer and older
+        than it instead of sorting the array on the server.
+        """
+        entries = sorted(
+            ({'alcohol_id': alcohol_id, 'search_date': date} for alcohol_id, date in search_dates.items()),
+            key=lambda entry: entry['search_date'],
+            reverse=True
+        )
+        if max_length > 0:
+            entries = entries[:max_length]
+        merged = []
+        newer = None
+        for entry in entries:
+            cond = {'$gte': ['$$entry.search_date', entry['search_date']]}
+            if newer is not None:
+                cond = {'$and': [cond, {'$lt': ['$$entry.search_date', newer]}]}
+            merged.extend([SearchHistoryHandler._stored(cond), [entry]])
+            newer = entry['search_date']
+        merged.append(SearchHistoryHandler._stored({'$lt': ['$$entry.search_date', newer]}))
+        await collection.update_one({'user_id': user_id}, [
+            {'$set': {'alcohols': SearchHistoryHandler._without(list(search_dates))}},
+            {'$set': {'alcohols': {'$concatArrays': merged}}},
+            *SearchHistoryHandler._capped(max_length)
+        ])
+
+    @staticmethod
+    def _stored(cond: dict) -> dict:
+        return {'$filter': {'input': '$alcohols', 'as': 'entry', 'cond': cond}}
+
+    @staticmethod
+    def _without(alcohol_ids: list[ObjectId]) -> dict:
+        return {'$filter': {
+            'input': {'$ifNull': ['$alcohols', []]},
+            'as': 'entry',
+            'cond': {'$not': {'$in': ['$$entry.alcohol_id', alcohol_ids]}}
+        }}
+
+    @staticmethod
+    def _capped(max_length: int) -> list[dict]:
+        return [{'$set': {'alcohols': {'$slice': ['$alcohols', max_length]}}}] if max_length > 0 else []
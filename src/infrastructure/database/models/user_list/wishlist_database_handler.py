@@ -1,7 +1,7 @@
 from bson import ObjectId
-from pymongo.collection import Collection
+from motor.motor_asyncio import AsyncIOMotorCollection
 
-from src.infrastructure.database.models.user_list.wishlist import UserWishlist
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
 
 
 class UserWishlistHandler:
@@ -9,40 +9,44 @@ class UserWishlistHandler:
     async def get_user_wishlist_by_user_id(
             limit: int,
             offset: int,
-            wishlist_collection: Collection[UserWishlist],
-            alcohols_collection: Collection,
+            wishlist_collection: AsyncIOMotorCollection,
+            alcohols_collection: AsyncIOMotorCollection,
             user_id: ObjectId = None,
-    ) -> list[dict]:
-        wishlist = wishlist_collection.find_one({'user_id': user_id}, {'alcohols': 1})
-        wishlist = wishlist['alcohols']
-        return list(alcohols_collection.find({'_id': {'$in': wishlist}}).skip(offset).limit(limit))
+    ) -> tuple[list[dict], int]:
+        return await AlcoholDatabaseHandler.get_alcohols_page_from_list(
+            wishlist_collection, alcohols_collection, {'user_id': user_id}, limit, offset
+        )
 
     @staticmethod
-    async def delete_alcohol_from_wishlist(collection: Collection[UserWishlist], user_id: ObjectId,
+    async def delete_alcohol_from_wishlist(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                            alcohol_id: ObjectId) -> int:
-        update = collection.update_one({'user_id': user_id}, {'$pull': {'alcohols': alcohol_id}})
+        update = await collection.update_one({'user_id': user_id}, {'$pull': {'alcohols': alcohol_id}})
         return update.modified_count
 
     @staticmethod
-    async def add_alcohol_to_wishlist(collection: Collection[UserWishlist], user_id: ObjectId,
+    async def add_alcohol_to_wishlist(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                       alcohol_id: ObjectId) -> None:
-        collection.update_one({'user_id': user_id}, {'$push': {'alcohols': alcohol_id}})
+        await collection.update_one({'user_id': user_id}, {'$push': {'alcohols': alcohol_id}})
 
     @staticmethod
-    async def check_if_alcohol_in_wishlist(collection: Collection[UserWishlist], user_id: ObjectId,
+    async def add_alcohols_to_wishlist(collection: AsyncIOMotorCollection, user_id: ObjectId,
+                                       alcohol_ids: list[ObjectId]) -> None:
+        await collection.update_one({'user_id': user_id}, {'$addToSet': {'alcohols': {'$each': alcohol_ids}}})
+
+    @staticmethod
+    async def delete_alcohol_from_all_wishlists(
+            collection: AsyncIOMotorCollection,
+            alcohol_id: ObjectId
+    ) -> list[ObjectId]:
+        """Returns ids of the users the alcohol was removed for."""
+        user_ids = await collection.distinct('user_id', {'alcohols': alcohol_id})
+        await collection.update_many({'user_id': {'$in': user_ids}}, {'$pull': {'alcohols': alcohol_id}})
+        return user_ids
+
+    @staticmethod
+    async def check_if_alcohol_in_wishlist(collection: AsyncIOMotorCollection, user_id: ObjectId,
                                            alcohol_id: ObjectId) -> bool:
-        if collection.find_one({'user_id': user_id, 'alcohols': alcohol_id}):
+        if await collection.find_one({'user_id': user_id, 'alcohols': alcohol_id}):
             return True
         else:
             return False
-
-    @staticmethod
-    async def count_alcohols_in_wishlist(
-            wishlist_collection: Collection[UserWishlist],
-            alcohols_collection: Collection,
-            user_id: ObjectId
-    ) -> int:
-        alcohols = wishlist_collection.find_one({'user_id': user_id}, {'alcohols': 1})
-        alcohols = alcohols['alcohols']
-
-        return len(list(alcohols_collection.find({'_id': {'$in': alcohols}})))
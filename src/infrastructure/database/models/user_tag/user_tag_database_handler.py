@@ -1,63 +1,65 @@
 from bson import ObjectId
-from pymongo.collection import Collection
+from pymongo import UpdateOne
+from motor.motor_asyncio import AsyncIOMotorCollection
 
 from src.domain.user_tag.user_tag_create import UserTagCreate
 from src.infrastructure.database.models.user_tag import UserTag
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
 
 
 class UserTagDatabaseHandler:
     @staticmethod
     async def get_user_tags(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             limit: int,
             offset: int,
             user_id: ObjectId
     ) -> list[UserTag]:
         return (
-            list(collection.find({'user_id': user_id}).skip(offset).limit(limit))
+            await collection.find({'user_id': user_id}).skip(offset).limit(limit).to_list(None)
         )
 
     @staticmethod
     async def count_user_tags(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId
     ) -> int:
         return (
-            collection.count_documents(filter={'user_id': {'$eq': user_id}})
+            await collection.count_documents(filter={'user_id': {'$eq': user_id}})
         )
 
     @staticmethod
     async def delete_user_tag(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId
     ) -> None:
-        collection.delete_one({'_id': tag_id})
+        await collection.delete_one({'_id': tag_id})
 
     @staticmethod
     async def check_if_user_tag_belongs_to_user(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId,
             user_id: ObjectId
     ) -> bool:
-        if collection.find_one({'user_id': user_id, '_id': tag_id}):
+        if await collection.find_one({'user_id': user_id, '_id': tag_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def check_if_user_tag_exists(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_name: str,
             user_id: ObjectId
     ) -> bool:
-        if collection.find_one({'user_id': user_id, 'tag_name': tag_name}):
+        if await collection.find_one({'user_id': user_id, 'tag_name': tag_name}):
             return True
         else:
             return False
 
     @staticmethod
     async def create_user_tag(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
             payload: UserTagCreate
     ) -> None:
@@ -66,111 +68,95 @@ class UserTagDatabaseHandler:
             user_id=user_id,
             alcohols=[]
         )
-        collection.insert_one(db_user_tag)
-
-    @staticmethod
-    async def create_user_tag_with_alcohols(
-            collection: Collection[UserTag],
-            user_id: ObjectId,
-            tag_name: str,
-            alcohols: list[ObjectId],
-    ) -> None:
-        db_user_tag = UserTag(
-            _id=ObjectId(),
-            user_id=user_id,
-            tag_name=tag_name,
-            alcohols=alcohols
-        )
-        collection.insert_one(db_user_tag)
+        await collection.insert_one(db_user_tag)
 
     @staticmethod
     async def add_alcohol(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId,
             alcohol_id: ObjectId,
     ) -> None:
-        collection.update_one({'_id': tag_id}, {'$push': {'alcohols': alcohol_id}})
+        await collection.update_one({'_id': tag_id}, {'$push': {'alcohols': alcohol_id}})
 
     @staticmethod
-    async def add_alcohols(
-            collection: Collection[UserTag],
+    async def add_alcohols_to_tags(
+            collection: AsyncIOMotorCollection,
             user_id: ObjectId,
-            tag_name: str,
-            alcohols: list[ObjectId],
+            tags: dict[str, list[ObjectId]],
     ) -> None:
-        collection.update_one({'user_id': user_id, 'tag_name': tag_name}, {'$push': {'alcohols': {'$each': alcohols}}})
+        """Add alcohols to the user tags with the given names, creating missing tags, in one bulk write."""
+        await collection.bulk_write([
+            UpdateOne(
+                {'user_id': user_id, 'tag_name': tag_name},
+                {'$addToSet': {'alcohols': {'$each': alcohols}}},
+                upsert=True
+            ) for tag_name, alcohols in tags.items()
+        ])
 
     @staticmethod
     async def remove_alcohol(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId,
             alcohol_id: ObjectId,
     ) -> None:
-        collection.update_one({'_id': tag_id}, {'$pull': {'alcohols': alcohol_id}})
+        await collection.update_one({'_id': tag_id}, {'$pull': {'alcohols': alcohol_id}})
+
+    @staticmethod
+    async def remove_alcohol_from_all_tags(
+            collection: AsyncIOMotorCollection,
+            alcohol_id: ObjectId,
+    ) -> None:
+        await collection.update_many({'alcohols': alcohol_id}, {'$pull': {'alcohols': alcohol_id}})
 
     @staticmethod
     async def check_if_alcohol_is_in_user_tag(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId,
             alcohol_id: ObjectId
     ) -> bool:
-        if collection.find_one({'alcohols': alcohol_id, '_id': tag_id}):
+        if await collection.find_one({'alcohols': alcohol_id, '_id': tag_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def update_tag(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId,
             tag_name: str
     ) -> UserTag:
-        collection.update_one({'_id':  tag_id}, {'$set': {'tag_name': tag_name}})
-        return collection.find_one({'_id': tag_id})
+        await collection.update_one({'_id':  tag_id}, {'$set': {'tag_name': tag_name}})
+        return await collection.find_one({'_id': tag_id})
 
     @staticmethod
     async def get_tag_alcohols(
             tag_id: ObjectId,
             limit: int,
             offset: int,
-            tag_collection: Collection[UserTag],
-            alcohols_collection: Collection,
-    ) -> list[dict]:
-        tag = tag_collection.find_one({'_id': tag_id}, {'alcohols': 1})
-
-        return (
-            list(alcohols_collection.find({'_id': {'$in': tag['alcohols']}}).skip(offset).limit(limit))
-        )
-
-    @staticmethod
-    async def count_alcohols(
-            tag_id: ObjectId,
-            tag_collection: Collection[UserTag],
-            alcohols_collection: Collection,
-    ):
-        tag = tag_collection.find_one({'_id': tag_id}, {'alcohols': 1})
-
-        return (
-            len(list(alcohols_collection.find({'_id': {'$in': tag['alcohols']}})))
+            tag_collection: AsyncIOMotorCollection,
+            alcohols_collection: AsyncIOMotorCollection,
+    ) -> tuple[list[dict], int]:
+        return await AlcoholDatabaseHandler.get_alcohols_page_from_list(
+            tag_collection, alcohols_collection, {'_id': tag_id}, limit, offset
         )
 
     @staticmethod
     async def check_if_tag_exists_by_id(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             tag_id: ObjectId
     ) -> bool:
-        if collection.find_one({'_id': tag_id}):
+        if await collection.find_one({'_id': tag_id}):
             return True
         else:
             return False
 
     @staticmethod
     async def get_alcohol_tags(
-            collection: Collection[UserTag],
+            collection: AsyncIOMotorCollection,
             alcohol_id: ObjectId,
             user_id: ObjectId
     ) -> list[str]:
-        tags = list(collection.find({'user_id': user_id}))
+        tags = await collection.find({'user_id': user_id}).to_list(None)
         result = []
         for tag in tags:
             if alcohol_id in tag.get('alcohols'):
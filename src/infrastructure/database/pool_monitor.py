@@ -0,0 +1,80 @@
+from threading import Lock
+from dataclasses import dataclass
+from pymongo.common import MAX_POOL_SIZE, MIN_POOL_SIZE
+from pymongo.monitoring import ConnectionPoolListener, ConnectionCheckOutFailedReason
+
+
+@dataclass
+class PoolStats:
+    max_pool_size: int = 0
+    min_pool_size: int = 0
+    open_connections: int = 0
+    in_use: int = 0
+    waiting: int = 0
+    wait_queue_timeouts: int = 0
+
+
+class ConnectionPoolMonitor(ConnectionPoolListener):
+    """
+    Tracks connection pool usage per server from pymongo CMAP events.
+    pymongo publishes the events from its own threads, hence the lock.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._pools: dict[str, PoolStats] = {}
+
+    def _pool(self, address: tuple[str, int]) -> PoolStats:
+        return self._pools.setdefault(f'{address[0]}:{address[1]}', PoolStats())
+
+    def snapshot(self) -> dict[str, PoolStats]:
+        with self._lock:
+            return {address: PoolStats(**vars(stats)) for address, stats in self._pools.items()}
+
+    def pool_created(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            # pymongo only reports options that differ from its defaults
+            pool.max_pool_size = event.options.get('maxPoolSize', MAX_POOL_SIZE)
+            pool.min_pool_size = event.options.get('minPoolSize', MIN_POOL_SIZE)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(f'{event.address[0]}:{event.address[1]}', None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address).open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._pool(event.address).open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._pool(event.address).waiting += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting -= 1
+            if event.reason == ConnectionCheckOutFailedReason.TIMEOUT:
+                pool.wait_queue_timeouts += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.waiting -= 1
+            pool.in_use += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._pool(event.address).in_use -= 1
@@ -0,0 +1,90 @@
+from asyncio import sleep
+from time import monotonic
+from jinja2 import TemplateError
+from aiosmtplib import SMTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorCollection
+
+from src.infrastructure.common.job_queue import JobQueue
+from src.infrastructure.email.mail_sender import MailSender
+from src.infrastructure.email.mail_templates import render_mail
+from src.infrastructure.config.app_config import ApplicationSettings
+from src.infrastructure.database.models.email import EmailQueueDatabaseHandler
+
+
+class MailQueue(JobQueue):
+    """
+    Sends emails in the background, so registration and other requests never wait for the mail server.
+    Emails are queued in the `email_queue` collection and sent one after another over a persistent
+    connection, at most `rate_limit` per second per worker. Emails failing every attempt end up
+    in `email_queue_dead_letters`.
+    """
+    def __init__(self):
+        super().__init__('email', 'email_queue', 'email_queue_dead_letters', retry_delay=30)
+        self._last_sent = 0.0
+        self.sent = 0
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._last_sent = 0.0
+        self.sent = 0
+
+    async def enqueue(
+            self,
+            collection: AsyncIOMotorCollection,
+            template: str,
+            recipients: list[str],
+            context: dict
+    ) -> None:
+        await EmailQueueDatabaseHandler.enqueue(collection, template, recipients, context)
+        self.wake()
+
+    async def run_once(
+            self,
+            db: AsyncIOMotorDatabase,
+            sender: MailSender,
+            batch_size: int,
+            lease: int,
+            max_attempts: int,
+            rate_limit: float
+    ) -> int:
+        """Send one batch of due emails, returns its size."""
+        jobs = await self.claim(db, batch_size, lease)
+        for job in jobs:
+            await self._throttle(rate_limit)
+            await self._send(db, sender, job, max_attempts)
+        return len(jobs)
+
+    async def _throttle(self, rate_limit: float) -> None:
+        if rate_limit > 0:
+            await sleep(max(self._last_sent + 1 / rate_limit - monotonic(), 0))
+        self._last_sent = monotonic()
+
+    async def _send(self, db: AsyncIOMotorDatabase, sender: MailSender, job: dict, max_attempts: int) -> None:
+        record = {'template': job['template'], 'recipients': job['recipients']}
+        try:
+            message = render_mail(job['template'], job['recipients'], job['context'])
+        except (KeyError, TypeError, TemplateError) as exception:
+            # an email that cannot be rendered fails the same way on every attempt
+            await self.dead_letter(db, job, exception, record)
+            return
+        try:
+            await sender.send(message)
+        except (SMTPException, OSError) as exception:
+            await self.fail(db, job, max_attempts, exception, record)
+            return
+        self.sent += 1
+        await self.complete(db, job)
+
+    async def run(self, db: AsyncIOMotorDatabase, sender: MailSender, settings: ApplicationSettings):
+        """Send queued emails until cancelled."""
+        batch_size = int(settings.EMAIL_QUEUE_BATCH_SIZE)
+        lease = int(settings.EMAIL_QUEUE_LEASE)
+        max_attempts = int(settings.EMAIL_QUEUE_MAX_ATTEMPTS)
+        rate_limit = float(settings.EMAIL_RATE_LIMIT)
+        await self.run_batches(
+            lambda: self.run_once(db, sender, batch_size, lease, max_attempts, rate_limit),
+            float(settings.EMAIL_QUEUE_INTERVAL)
+        )
+
+
+mail_queue = MailQueue()
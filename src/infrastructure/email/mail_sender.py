@@ -0,0 +1,54 @@
+from asyncio import Lock
+from email.message import EmailMessage
+from aiosmtplib import SMTP, SMTPServerDisconnected
+
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
+
+
+class MailSender:
+    """
+    Keeps one SMTP connection per worker open between emails instead of connecting, starting TLS
+    and logging in for every one. The connection is reopened when the server closed it, e.g. after
+    its idle timeout, and used by one email at a time. Settings not given are read when connecting.
+    """
+    def __init__(self, settings: ApplicationSettings | None = None):
+        self._lock = Lock()
+        self._smtp: SMTP | None = None
+        self._settings = settings
+
+    async def _connect(self) -> SMTP:
+        settings = self._settings or get_settings()
+        smtp = SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=int(settings.EMAIL_PORT),
+            start_tls=bool(settings.EMAIL_START_TLS),
+            timeout=float(settings.EMAIL_TIMEOUT)
+        )
+        await smtp.connect()
+        if settings.EMAIL_USERNAME and settings.EMAIL_PASSWORD:
+            await smtp.login(settings.EMAIL_USERNAME, settings.EMAIL_PASSWORD)
+        return smtp
+
+    async def send(self, message: EmailMessage) -> None:
+        if 'From' not in message:
+            message['From'] = (self._settings or get_settings()).EMAIL_FROM
+        async with self._lock:
+            if self._smtp is None or not self._smtp.is_connected:
+                self._smtp = await self._connect()
+            try:
+                await self._smtp.send_message(message)
+            except SMTPServerDisconnected:
+                self._smtp = await self._connect()
+                await self._smtp.send_message(message)
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._smtp is not None and self._smtp.is_connected:
+                try:
+                    await self._smtp.quit()
+                except SMTPServerDisconnected:
+                    pass
+            self._smtp = None
+
+
+mail_sender = MailSender()
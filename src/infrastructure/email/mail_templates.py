@@ -0,0 +1,24 @@
+from email.message import EmailMessage
+from jinja2 import Environment, select_autoescape, PackageLoader
+
+env = Environment(
+    loader=PackageLoader('src', 'infrastructure/email/templates'),
+    autoescape=select_autoescape(['html', 'xml'])
+)
+
+SUBJECTS = {
+    'verification': 'AlkohoLove email verification',
+    'reset_password': 'AlkohoLove password reset request',
+    'delete_account': 'AlkohoLove account deletion request'
+}
+# compiled once at import instead of for every email
+TEMPLATES = {template: env.get_template(f'{template}.html') for template in SUBJECTS}
+
+
+def render_mail(template: str, recipients: list[str], context: dict) -> EmailMessage:
+    subject = SUBJECTS[template]
+    message = EmailMessage()
+    message['To'] = ', '.join(recipients)
+    message['Subject'] = subject
+    message.set_content(TEMPLATES[template].render(subject=subject, **context), subtype='html')
+    return message
@@ -0,0 +1,79 @@
+"""
+SMTP server keeping received emails in memory, for tests and for running locally without a mail server.
+Run from the repository root and set `EMAIL_HOST=localhost`, `EMAIL_PORT=1025` and `EMAIL_START_TLS=false`,
+received emails are printed:
+`$ python -m src.infrastructure.email.smtp_sink --port 1025`
+"""
+from email.policy import default
+from argparse import ArgumentParser
+from email import message_from_bytes
+from email.message import EmailMessage
+from asyncio import run, start_server, StreamReader, StreamWriter, AbstractServer
+
+
+class SmtpSink:
+    """Accepts every email without TLS or authentication, received emails are kept in `messages`."""
+    def __init__(self, echo: bool = False):
+        self.echo = echo
+        self.messages: list[EmailMessage] = []
+        self.connections = 0
+        self._server: AbstractServer | None = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """Start listening, returns the port, a free one when `port` is 0."""
+        self._server = await start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: StreamReader, writer: StreamWriter) -> None:
+        self.connections += 1
+        writer.write(b'220 smtp-sink ready\r\n')
+        while line := await reader.readline():
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                writer.write(b'250 smtp-sink\r\n')
+            elif command == b'DATA':
+                writer.write(b'354 end data with <CR><LF>.<CR><LF>\r\n')
+                await writer.drain()
+                self._receive(await reader.readuntil(b'\r\n.\r\n'))
+                writer.write(b'250 OK\r\n')
+            elif command == b'QUIT':
+                writer.write(b'221 bye\r\n')
+                break
+            elif command in (b'MAIL', b'RCPT', b'RSET', b'NOOP'):
+                writer.write(b'250 OK\r\n')
+            else:
+                writer.write(b'502 command not implemented\r\n')
+            await writer.drain()
+        await writer.drain()
+        writer.close()
+
+    def _receive(self, data: bytes) -> None:
+        # lines starting with a dot were escaped with another one by the client
+        lines = [line[1:] if line.startswith(b'.') else line for line in data[:-len(b'.\r\n')].split(b'\r\n')]
+        message = message_from_bytes(b'\r\n'.join(lines), policy=default)
+        self.messages.append(message)
+        if self.echo:
+            print(f"to={message['To']} subject={message['Subject']}")
+
+
+async def main(host: str, port: int) -> None:
+    sink = SmtpSink(echo=True)
+    print(f'listening on {host}:{await sink.start(host, port)}')
+    await sink.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    args = parser.parse_args()
+    run(main(args.host, args.port))
@@ -39,3 +39,19 @@ class FileTooBigException(HTTPException):
             status.HTTP_400_BAD_REQUEST,
             'Za duży rozmiar pliku. Maksymalny rozmiar to 1 mb.'
         )
+
+
+class SourceImageTooBigException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_400_BAD_REQUEST,
+            'Za duży rozmiar pliku. Maksymalny rozmiar to 10 mb.'
+        )
+
+
+class MissingImageException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_400_BAD_REQUEST,
+            'Dodaj zdjęcie alkoholu lub jego wersje sm i md.'
+        )
@@ -31,3 +31,11 @@ class SuggestionFileTooBigException(HTTPException):
             status.HTTP_400_BAD_REQUEST,
             'Za duży rozmiar pliku. Maksymalny rozmiar to 9 mb.'
         )
+
+
+class InvalidSuggestionImageNameException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_400_BAD_REQUEST,
+            'Nazwa zdjęcia może zawierać jedynie litery, cyfry, _ i -.'
+        )
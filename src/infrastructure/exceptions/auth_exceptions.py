@@ -18,6 +18,14 @@ class UserBannedException(HTTPException):
         )
 
 
+class AccountDeletionPendingException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_401_UNAUTHORIZED,
+            'Brak dostępu. Konto jest w trakcie usuwania.',
+        )
+
+
 class TokenRevokedException(HTTPException):
     def __init__(self, token_type):
         super().__init__(
@@ -104,3 +112,11 @@ class IncorrectEmailException(HTTPException):
             status.HTTP_422_UNPROCESSABLE_ENTITY,
             'Nieprawidłowy email.',
         )
+
+
+class AuthenticationOverloadedException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            'Zbyt wiele prób logowania, spróbuj ponownie za chwilę.',
+        )
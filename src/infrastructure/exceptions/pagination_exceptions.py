@@ -0,0 +1,17 @@
+from fastapi import HTTPException, status
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_400_BAD_REQUEST,
+            'Nieprawidłowy kursor.'
+        )
+
+
+class InvalidCursorLimitException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status.HTTP_400_BAD_REQUEST,
+            'Limit musi być większy od zera.'
+        )
@@ -1,20 +1,22 @@
-from fastapi import Depends
-from requests import RequestException, post
+from httpx import AsyncClient
 
-from src.infrastructure.config.app_config import ApplicationSettings, get_settings
+from src.infrastructure.config.app_config import ApplicationSettings
 
 
 class HateSpeechDetectionClient:
-    def __init__(self, service_url: str):
+    def __init__(self, service_url: str, http_client: AsyncClient):
         self.service_url = service_url
+        self.http_client = http_client
 
-    def check_review(self, json):
-        try:
-            return post(url=self.service_url, json=json, timeout=3).json()
-        except RequestException as exception:
-            print(f"Hate Speech Detection Service encountered an unexpected error: \n{exception}")
-            return None
+    async def check_review(self, review: str) -> bool:
+        """Whether the review contains hate speech, raises `httpx.HTTPError` when the service fails."""
+        response = await self.http_client.post(url=self.service_url, json=review)
+        response.raise_for_status()
+        return bool(response.json())
 
 
-async def hate_speech_detection_client(config: ApplicationSettings = Depends(get_settings)):
-    return HateSpeechDetectionClient(config.HATE_SPEECH_DETECTION_SERVICE_URL)
+def create_hate_speech_detection_client(config: ApplicationSettings) -> HateSpeechDetectionClient:
+    return HateSpeechDetectionClient(
+        config.HATE_SPEECH_DETECTION_SERVICE_URL,
+        AsyncClient(timeout=float(config.REVIEW_SCREENING_TIMEOUT))
+    )
@@ -0,0 +1,70 @@
+from asyncio import gather
+from httpx import HTTPError
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.infrastructure.common.job_queue import JobQueue
+from src.infrastructure.config.app_config import ApplicationSettings
+from src.infrastructure.database.models.review import ReviewDatabaseHandler
+from src.infrastructure.hate_speech_detection.hate_speech_detection_client import HateSpeechDetectionClient
+from src.infrastructure.database.models.review.review_screening_database_handler import ReviewScreeningDatabaseHandler
+
+
+class ReviewScreener(JobQueue):
+    """
+    Screens written reviews for hate speech in the background, so review writes never wait for the classifier.
+    Reviews are queued in the `review_screening` collection and screened in batches, concurrently within a batch,
+    reviews failing every attempt end up in `review_screening_dead_letters`.
+    Reviews are only queued while `run` is running, nothing would screen them otherwise.
+    """
+    def __init__(self):
+        super().__init__('review screening', 'review_screening', 'review_screening_dead_letters', retry_delay=5)
+        self.screened = 0
+        self.flagged = 0
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self.screened = self.flagged = 0
+
+    async def enqueue(self, db: AsyncIOMotorDatabase, review_id, review: str | None) -> None:
+        if not review or not self.running:
+            return
+        await ReviewScreeningDatabaseHandler.enqueue(db.review_screening, review_id, review)
+        self.wake()
+
+    async def run_once(
+            self,
+            db: AsyncIOMotorDatabase,
+            client: HateSpeechDetectionClient,
+            batch_size: int,
+            lease: int,
+            max_attempts: int
+    ) -> int:
+        """Screen one batch of due reviews, returns its size."""
+        jobs = await self.claim(db, batch_size, lease)
+        await gather(*(self._screen(db, client, job, max_attempts) for job in jobs))
+        return len(jobs)
+
+    async def _screen(self, db: AsyncIOMotorDatabase, client: HateSpeechDetectionClient, job: dict, max_attempts: int):
+        try:
+            flagged = await client.check_review(job['review'])
+        except (HTTPError, ValueError) as exception:
+            await self.fail(db, job, max_attempts, exception, {'review_id': job['_id'], 'review': job['review']})
+            return
+        if flagged:
+            await ReviewDatabaseHandler.machine_increase_review_report_count(db.reviews, job['_id'])
+            self.flagged += 1
+        self.screened += 1
+        await self.complete(db, job)
+
+    async def run(self, db: AsyncIOMotorDatabase, client: HateSpeechDetectionClient, settings: ApplicationSettings):
+        """Screen queued reviews until cancelled."""
+        batch_size = int(settings.REVIEW_SCREENING_BATCH_SIZE)
+        lease = int(settings.REVIEW_SCREENING_LEASE)
+        max_attempts = int(settings.REVIEW_SCREENING_MAX_ATTEMPTS)
+        await self.run_batches(
+            lambda: self.run_once(db, client, batch_size, lease, max_attempts),
+            float(settings.REVIEW_SCREENING_INTERVAL)
+        )
+
+
+review_screener = ReviewScreener()
@@ -0,0 +1,62 @@
+from io import BytesIO
+from bson import ObjectId
+from hashlib import sha256
+from fastapi import UploadFile
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.common.file_utils import image_size
+from src.infrastructure.images.image_storage import ImageStorage
+from src.infrastructure.images.image_resizer import image_resizer, variant_names
+from src.infrastructure.exceptions.alcohol_exceptions import WrongFileTypeException, SourceImageTooBigException
+from src.infrastructure.database.models.alcohol.alcohol_image_database_handler import AlcoholImageDatabaseHandler
+
+SOURCE_IMAGE_MAX_SIZE = 10000000
+
+
+async def read_source_image(image: UploadFile) -> bytes:
+    if image.content_type not in ['image/png', 'image/jpeg']:
+        raise WrongFileTypeException()
+    if image_size(image.file) > SOURCE_IMAGE_MAX_SIZE:
+        raise SourceImageTooBigException()
+    return await image.read()
+
+
+async def store_alcohol_images(
+        collection: AsyncIOMotorCollection,
+        storage: ImageStorage,
+        alcohol_id: ObjectId,
+        folder: str,
+        source: bytes,
+        formats: list[str],
+        overwrite: bool
+) -> list[str]:
+    """
+    Resize the source image to every variant and upload the variants, named `{alcohol_id}_{variant}`.
+    Variants are compared by digest with the stored ones, so only changed variants are uploaded
+    and an unchanged source is not even resized. Returns names of the uploaded variants.
+    """
+    digests = await AlcoholImageDatabaseHandler.get_digests(collection, alcohol_id)
+    source_digest = sha256(source).hexdigest()
+    if digests['source'] == source_digest and set(digests['variants']) == set(variant_names(formats)):
+        return []
+    variants = await image_resizer.resize(source, formats)
+    variant_digests = {name: sha256(data).hexdigest() for name, data in variants.items()}
+    changed = [name for name, digest in variant_digests.items() if digests['variants'].get(name) != digest]
+    await storage.upload_many(
+        {f'{alcohol_id}_{name}': BytesIO(variants[name]) for name in changed},
+        folder=folder,
+        overwrite=overwrite
+    )
+    await AlcoholImageDatabaseHandler.set_digests(collection, alcohol_id, source_digest, variant_digests)
+    return changed
+
+
+async def delete_alcohol_images(
+        collection: AsyncIOMotorCollection,
+        storage: ImageStorage,
+        alcohol_id: ObjectId,
+        folder: str,
+        formats: list[str]
+) -> None:
+    await storage.delete_many([f'{folder}/{alcohol_id}_{name}' for name in variant_names(formats)])
+    await AlcoholImageDatabaseHandler.delete_digests(collection, alcohol_id)
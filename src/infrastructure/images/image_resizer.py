@@ -0,0 +1,92 @@
+from io import BytesIO
+from asyncio import get_running_loop
+from multiprocessing import get_context
+from PIL import Image, UnidentifiedImageError
+from concurrent.futures import ProcessPoolExecutor
+
+from src.infrastructure.config.app_config import get_settings
+from src.infrastructure.exceptions.alcohol_exceptions import WrongFileTypeException
+
+try:
+    # registers the AVIF plugin, without it `avif` variants are skipped
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+# bounding boxes of the variants, the aspect ratio of the source is kept
+SIZES = {'sm': (300, 300), 'md': (800, 800)}
+# variants in formats other than the source's png or jpeg, by name used in settings
+FORMATS = {'webp': 'WEBP', 'avif': 'AVIF'}
+
+
+def image_formats(formats: str) -> list[str]:
+    """Extra variant formats from a comma separated list, formats Pillow cannot write are skipped."""
+    Image.init()
+    requested = [image_format.strip().lower() for image_format in formats.split(',')]
+    return [
+        image_format for image_format in requested
+        if image_format in FORMATS and FORMATS[image_format] in Image.SAVE
+    ]
+
+
+def variant_names(formats: list[str]) -> list[str]:
+    return [*SIZES, *(f'{size}_{image_format}' for size in SIZES for image_format in formats)]
+
+
+def resize_image(data: bytes, formats: list[str]) -> dict[str, bytes]:
+    """Variants of the source image by name, e.g. `sm` and `sm_webp`. Runs in a worker process."""
+    with Image.open(BytesIO(data)) as source:
+        source_format = 'PNG' if source.format == 'PNG' else 'JPEG'
+        source.load()
+        if source_format == 'JPEG' and source.mode != 'RGB':
+            source = source.convert('RGB')
+        variants = {}
+        for size, box in SIZES.items():
+            image = source.copy()
+            image.thumbnail(box)
+            variants[size] = _save(image, source_format)
+            for image_format in formats:
+                variants[f'{size}_{image_format}'] = _save(image, FORMATS[image_format])
+        return variants
+
+
+def _save(image: Image.Image, image_format: str) -> bytes:
+    output = BytesIO()
+    if image_format in ('PNG', 'JPEG'):
+        image.save(output, image_format, optimize=True)
+    else:
+        image.save(output, image_format)
+    return output.getvalue()
+
+
+class ImageResizer:
+    """
+    Resizes images in a process pool, decoding, resampling and encoding are CPU bound
+    and would otherwise compete with the event loop for the GIL.
+    The pool size not given is read from settings when the pool is first used. Workers are spawned,
+    not forked, as forking copies a process already running the database driver and thread pools.
+    """
+    def __init__(self, pool_size: int | None = None):
+        self._executor: ProcessPoolExecutor | None = None
+        self._pool_size = pool_size
+
+    def _start(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            if self._pool_size is None:
+                self._pool_size = max(int(get_settings().IMAGE_RESIZING_POOL_SIZE), 1)
+            self._executor = ProcessPoolExecutor(self._pool_size, mp_context=get_context('spawn'))
+        return self._executor
+
+    async def resize(self, data: bytes, formats: list[str]) -> dict[str, bytes]:
+        try:
+            return await get_running_loop().run_in_executor(self._start(), resize_image, data, formats)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            raise WrongFileTypeException()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_resizer = ImageResizer()
@@ -0,0 +1,107 @@
+import shutil
+import cloudinary.api
+from pathlib import Path
+import cloudinary.uploader
+from typing import BinaryIO
+from fastapi import Depends
+from abc import ABC, abstractmethod
+from asyncio import gather, to_thread
+
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
+
+
+class ImageStorage(ABC):
+    """
+    Images are stored as `folder/public_id`. Blocking SDK and disk calls run in threads,
+    so several images are uploaded or deleted at once without holding the event loop.
+    Files are handed over as they are, e.g. the spooled file behind an `UploadFile`.
+    """
+    @abstractmethod
+    async def upload(self, file: BinaryIO, folder: str | None, public_id: str, overwrite: bool) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, path: str) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        pass
+
+    async def upload_many(self, files: dict[str, BinaryIO], folder: str | None, overwrite: bool) -> None:
+        """Upload files by public id concurrently, the first error is raised after every upload finished."""
+        results = await gather(
+            *(self.upload(file, folder, public_id, overwrite) for public_id, file in files.items()),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+    async def delete_many(self, paths: list[str]) -> None:
+        await gather(*(self.delete(path) for path in paths))
+
+
+class CloudinaryImageStorage(ImageStorage):
+    async def upload(self, file: BinaryIO, folder: str | None, public_id: str, overwrite: bool) -> None:
+        file.seek(0)
+        await to_thread(
+            cloudinary.uploader.upload,
+            file,
+            folder=folder,
+            public_id=public_id,
+            resource_type='image',
+            overwrite=overwrite,
+            invalidate=True
+        )
+
+    async def delete(self, path: str) -> None:
+        await to_thread(cloudinary.uploader.destroy, path, invalidate=True)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await to_thread(cloudinary.api.delete_resources_by_prefix, prefix=prefix)
+
+
+class LocalImageStorage(ImageStorage):
+    """
+    Images kept as files under `root_dir`, for tests and running without Cloudinary credentials.
+    Paths resolving outside of `root_dir` are rejected with a ValueError.
+    """
+    def __init__(self, root_dir: str | Path):
+        self.root_dir = Path(root_dir)
+
+    async def upload(self, file: BinaryIO, folder: str | None, public_id: str, overwrite: bool) -> None:
+        await to_thread(self._write, file, self._path(folder or '', public_id), overwrite)
+
+    async def delete(self, path: str) -> None:
+        await to_thread(self._path(path).unlink, missing_ok=True)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await to_thread(self._delete_prefix, self._path(prefix))
+
+    def _path(self, *parts: str) -> Path:
+        root_dir = self.root_dir.resolve()
+        path = root_dir.joinpath(*parts).resolve()
+        if path == root_dir or not path.is_relative_to(root_dir):
+            raise ValueError(f'{"/".join(parts)} is outside of the image storage')
+        return path
+
+    @staticmethod
+    def _write(file: BinaryIO, path: Path, overwrite: bool) -> None:
+        if path.exists() and not overwrite:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file.seek(0)
+        with path.open('wb') as image:
+            shutil.copyfileobj(file, image)
+
+    @staticmethod
+    def _delete_prefix(prefix: Path) -> None:
+        for path in prefix.parent.glob(f'{prefix.name}*'):
+            path.unlink(missing_ok=True)
+
+
+async def image_storage(config: ApplicationSettings = Depends(get_settings)) -> ImageStorage:
+    if config.IMAGE_STORAGE == 'local':
+        return LocalImageStorage(config.IMAGE_STORAGE_DIR)
+    return CloudinaryImageStorage()
@@ -1,24 +1,64 @@
-from requests import RequestException, get
+from asyncio import sleep
 from fastapi import HTTPException, status, Depends
+from httpx import AsyncClient, HTTPError, Limits, Timeout, TransportError
 
+from src.infrastructure.common.ttl_cache import TTLCache
 from src.infrastructure.config.app_config import ApplicationSettings, get_settings
 
+similar_alcohols_cache = TTLCache('recommender_similar_alcohols')
+recommendations_cache = TTLCache('recommender_recommendations')
+
+_http_client: AsyncClient | None = None
+
 
 class RecommenderClient:
-    def __init__(self, service_url: str):
+    """
+    Calls the recommender over a shared connection pool. Every attempt is bounded by the timeout,
+    transport errors and server errors are retried up to `max_retries` times, so a slow recommender costs a request
+    at most `(max_retries + 1) * timeout` instead of blocking the worker.
+    Responses are cached, similar alcohols for longer as they only change when the model is retrained.
+    """
+    def __init__(self, service_url: str, http_client: AsyncClient, settings: ApplicationSettings):
         self.service_url = service_url
+        self.http_client = http_client
+        self.max_retries = int(settings.RECOMMENDER_MAX_RETRIES)
+        self.cache_max_size = int(settings.RECOMMENDER_CACHE_MAX_SIZE)
+        self.similar_max_age = int(settings.RECOMMENDER_SIMILAR_CACHE_MAX_AGE)
+        self.recommendations_max_age = int(settings.RECOMMENDER_RECOMMENDATIONS_CACHE_MAX_AGE)
 
-    def fetch_recommendations(self, user_id: str):
+    async def _get(self, path: str) -> dict:
+        """Transport errors and 5xx responses are retried, any other error is raised right away."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.http_client.get(f'{self.service_url}{path}')
+            except TransportError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code < 500 or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+            await sleep(0.1 * 2 ** attempt)
+
+    async def fetch_recommendations(self, user_id: str):
+        if recommendations := recommendations_cache.get(user_id, self.recommendations_max_age):
+            return recommendations
         try:
-            return get(url=f'{self.service_url}/recommend/users/{user_id}').json()
-        except RequestException as exception:
-            raise RecommenderClientFetchRecommendationsException(user_id, str(exception))
+            recommendations = await self._get(f'/recommend/users/{user_id}')
+        except (HTTPError, ValueError) as exception:
+            raise RecommenderClientFetchRecommendationsException(user_id, repr(exception))
+        recommendations_cache.set(user_id, recommendations, self.cache_max_size)
+        return recommendations
 
-    def fetch_similar_alcohols(self, alcohol_id: str):
+    async def fetch_similar_alcohols(self, alcohol_id: str):
+        if similar := similar_alcohols_cache.get(alcohol_id, self.similar_max_age):
+            return similar
         try:
-            return get(url=f'{self.service_url}/recommend/alcohols/{alcohol_id}').json()
-        except RequestException as exception:
-            raise RecommenderClientSimilarAlcoholsException(alcohol_id, str(exception))
+            similar = await self._get(f'/recommend/alcohols/{alcohol_id}')
+        except (HTTPError, ValueError) as exception:
+            raise RecommenderClientSimilarAlcoholsException(alcohol_id, repr(exception))
+        similar_alcohols_cache.set(alcohol_id, similar, self.cache_max_size)
+        return similar
 
 
 class RecommenderClientFetchRecommendationsException(HTTPException):
@@ -37,5 +77,25 @@ class RecommenderClientSimilarAlcoholsException(HTTPException):
         )
 
 
+def get_http_client(config: ApplicationSettings) -> AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = AsyncClient(
+            timeout=Timeout(float(config.RECOMMENDER_TIMEOUT)),
+            limits=Limits(
+                max_connections=int(config.RECOMMENDER_MAX_CONNECTIONS),
+                max_keepalive_connections=int(config.RECOMMENDER_MAX_CONNECTIONS)
+            )
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def recommender_client(config: ApplicationSettings = Depends(get_settings)):
-    return RecommenderClient(config.RECOMMENDER_URL)
+    return RecommenderClient(config.RECOMMENDER_URL, get_http_client(config), config)
@@ -0,0 +1,184 @@
+from re import findall
+from asyncio import Lock
+from bson import ObjectId
+from time import monotonic
+from collections import defaultdict
+from bisect import bisect_left, insort
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+
+TOKEN_PATTERN = r'\w+'
+# field, boost, fuzzy - the same weights as the Atlas `tetxtSearch` compound query
+TEXT_FIELDS = (
+    ('name', 10, True),
+    ('kind', 8, True),
+    ('type', 7, False),
+    ('color', 5, False),
+    ('keywords', 5, False)
+)
+AUTOCOMPLETE_FIELD, AUTOCOMPLETE_BOOST = 'name', 10
+SEARCH_FIELDS = tuple(field for field, _, _ in TEXT_FIELDS)
+MIN_TRIGRAM_SIMILARITY = 0.4
+LOAD_ATTEMPTS = 3
+
+
+def tokenize(value: str | list[str] | None) -> set[str]:
+    if value is None:
+        return set()
+    if isinstance(value, list):
+        value = ' '.join(item for item in value if isinstance(item, str))
+    return set(findall(TOKEN_PATTERN, value.lower()))
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f'  {token} '
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class _FieldIndex:
+    def __init__(self, fuzzy: bool):
+        self.postings: dict[str, set[ObjectId]] = defaultdict(set)
+        self.trigrams: dict[str, set[str]] | None = defaultdict(set) if fuzzy else None
+        self.sorted_tokens: list[str] = []
+
+    def add(self, alcohol_id: ObjectId, tokens: set[str]) -> None:
+        for token in tokens:
+            if token not in self.postings:
+                insort(self.sorted_tokens, token)
+                if self.trigrams is not None:
+                    for trigram in trigrams(token):
+                        self.trigrams[trigram].add(token)
+            self.postings[token].add(alcohol_id)
+
+    def remove(self, alcohol_id: ObjectId, tokens: set[str]) -> None:
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(alcohol_id)
+            if not ids:
+                del self.postings[token]
+                del self.sorted_tokens[bisect_left(self.sorted_tokens, token)]
+                if self.trigrams is not None:
+                    for trigram in trigrams(token):
+                        self.trigrams[trigram].discard(token)
+
+    def match(self, token: str) -> dict[str, float]:
+        """Indexed tokens matching the query token, exactly or by trigram similarity, with their weight."""
+        matches = {token: 1.0} if token in self.postings else {}
+        if self.trigrams is None:
+            return matches
+        query_trigrams = trigrams(token)
+        candidates = set().union(*(self.trigrams.get(trigram, ()) for trigram in query_trigrams))
+        for candidate in candidates - matches.keys():
+            candidate_trigrams = trigrams(candidate)
+            similarity = len(query_trigrams & candidate_trigrams) / len(query_trigrams | candidate_trigrams)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                matches[candidate] = similarity
+        return matches
+
+    def prefix(self, token: str) -> list[str]:
+        start = bisect_left(self.sorted_tokens, token)
+        end = bisect_left(self.sorted_tokens, token[:-1] + chr(ord(token[-1]) + 1))
+        return self.sorted_tokens[start:end]
+
+
+class LocalSearchIndex:
+    """
+    In-process inverted index over alcohol `name`, `kind`, `type`, `color` and `keywords`,
+    an alternative to Atlas Search for self-hosted deployments and tests.
+    Scores mirror the Atlas compound query: every clause adds its boost times the fraction
+    of query tokens it matched, fuzzy clauses weighted by trigram similarity.
+    Concurrent searches on a stale index load it once.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._fields = {field: _FieldIndex(fuzzy) for field, _, fuzzy in TEXT_FIELDS}
+        self._documents: dict[ObjectId, dict[str, set[str]]] = {}
+        self._loaded_at: float | None = None
+        self._generation = 0
+
+    def invalidate(self) -> None:
+        self._fields = {field: _FieldIndex(fuzzy) for field, _, fuzzy in TEXT_FIELDS}
+        self._documents = {}
+        self._loaded_at = None
+        self._generation += 1
+
+    async def load(self, collection: AsyncIOMotorCollection, max_age: float) -> None:
+        async with self._lock:
+            # another search may have loaded the index while this one waited for the lock
+            if not self._stale(max_age):
+                return
+            for _ in range(LOAD_ATTEMPTS):
+                generation = self._generation
+                alcohols = await AlcoholDatabaseHandler.get_alcohols_search_fields(collection, SEARCH_FIELDS)
+                # writes during the load may be missing from it, so only keep it if there were none
+                if generation == self._generation:
+                    self._build(alcohols, monotonic())
+                    return
+            if self._loaded_at is None:
+                # rather than an empty result, search the last load and reload it on the next search
+                self._build(alcohols, float('-inf'))
+
+    def _stale(self, max_age: float) -> bool:
+        return self._loaded_at is None or monotonic() - self._loaded_at > max_age
+
+    def _build(self, alcohols: list[dict], loaded_at: float) -> None:
+        self.invalidate()
+        for alcohol in alcohols:
+            self._add(alcohol)
+        self._loaded_at = loaded_at
+
+    async def rank(
+            self,
+            collection: AsyncIOMotorCollection,
+            phrase: str,
+            max_age: float
+    ) -> list[tuple[ObjectId, float]]:
+        """Ids and scores of alcohols matching the phrase, ordered by score descending and then by id."""
+        if self._stale(max_age):
+            await self.load(collection, max_age)
+        tokens = tokenize(phrase)
+        if not tokens:
+            return []
+        scores: dict[ObjectId, float] = defaultdict(float)
+        for field, boost, _ in TEXT_FIELDS:
+            field_index = self._fields[field]
+            for token in tokens:
+                weights: dict[ObjectId, float] = {}
+                for matched, weight in field_index.match(token).items():
+                    for alcohol_id in field_index.postings[matched]:
+                        weights[alcohol_id] = max(weight, weights.get(alcohol_id, 0))
+                for alcohol_id, weight in weights.items():
+                    scores[alcohol_id] += boost * weight / len(tokens)
+        autocomplete_index = self._fields[AUTOCOMPLETE_FIELD]
+        for token in tokens:
+            matched_ids = (autocomplete_index.postings[matched] for matched in autocomplete_index.prefix(token))
+            for alcohol_id in set().union(*matched_ids):
+                scores[alcohol_id] += AUTOCOMPLETE_BOOST / len(tokens)
+        return sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+
+    def add_alcohol(self, alcohol: dict) -> None:
+        # a load running concurrently may have read the alcohol before this write
+        self._generation += 1
+        if self._loaded_at is None:
+            return
+        self.remove_alcohol(alcohol)
+        self._add(alcohol)
+
+    def remove_alcohol(self, alcohol: dict) -> None:
+        self._generation += 1
+        if self._loaded_at is None:
+            return
+        for field, tokens in self._documents.pop(alcohol['_id'], {}).items():
+            self._fields[field].remove(alcohol['_id'], tokens)
+
+    def _add(self, alcohol: dict) -> None:
+        document = {field: tokenize(alcohol.get(field)) for field in SEARCH_FIELDS}
+        for field, tokens in document.items():
+            self._fields[field].add(alcohol['_id'], tokens)
+        self._documents[alcohol['_id']] = document
+
+
+local_search_index = LocalSearchIndex()
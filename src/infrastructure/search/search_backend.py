@@ -0,0 +1,133 @@
+from bson import ObjectId
+from fastapi import Depends
+from bisect import bisect_right
+from abc import ABC, abstractmethod
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from src.domain.alcohol_filter import AlcoholFilters
+from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
+from src.infrastructure.common.cursor_utils import encode_cursor, decode_cursor, SCORE_CURSOR
+from src.infrastructure.search.local_search_index import LocalSearchIndex, local_search_index
+
+
+class SearchBackend(ABC):
+    @abstractmethod
+    async def search_alcohols(
+            self,
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            offset: int,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], int]:
+        pass
+
+    @abstractmethod
+    async def search_alcohols_after(
+            self,
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            cursor: str,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], str | None, int | None]:
+        pass
+
+
+class AtlasSearchBackend(SearchBackend):
+    """Phrase search with the Atlas Search `$search` stage, available on Atlas clusters only."""
+    async def search_alcohols(
+            self,
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            offset: int,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], int]:
+        return await AlcoholDatabaseHandler.search_alcohols(collection, limit, offset, phrase, filters)
+
+    async def search_alcohols_after(
+            self,
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            cursor: str,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], str | None, int | None]:
+        return await AlcoholDatabaseHandler.search_alcohols_after(collection, limit, cursor, phrase, filters)
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    Phrase search with the in-process index, works with any MongoDB deployment.
+    The index ranks the alcohols, filters are applied in the database and only the requested page is fetched.
+    """
+    def __init__(self, index: LocalSearchIndex, max_age: float):
+        self.index = index
+        self.max_age = max_age
+
+    async def search_alcohols(
+            self,
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            offset: int,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], int]:
+        if not phrase:
+            return await AlcoholDatabaseHandler.search_alcohols(collection, limit, offset, phrase, filters)
+
+        ranked = await self._filter(collection, await self.index.rank(collection, phrase, self.max_age), filters)
+        page = ranked[offset:offset + limit] if limit else ranked[offset:]
+        return await self._fetch(collection, [alcohol_id for alcohol_id, _ in page]), len(ranked)
+
+    async def search_alcohols_after(
+            self,
+            collection: AsyncIOMotorCollection,
+            limit: int,
+            cursor: str,
+            phrase: str | None,
+            filters: AlcoholFilters | None
+    ) -> tuple[list[dict], str | None, int | None]:
+        if not phrase:
+            return await AlcoholDatabaseHandler.search_alcohols_after(collection, limit, cursor, phrase, filters)
+
+        ranked = await self._filter(collection, await self.index.rank(collection, phrase, self.max_age), filters)
+        start = 0
+        if after := decode_cursor(cursor, limit, SCORE_CURSOR):
+            score, alcohol_id = after
+            keys = [(-ranked_score, str(ranked_id)) for ranked_id, ranked_score in ranked]
+            start = bisect_right(keys, (-score, str(alcohol_id)))
+        page = ranked[start:start + limit]
+        next_cursor = encode_cursor(page[-1][1], page[-1][0]) if page and start + limit < len(ranked) else None
+        alcohols = await self._fetch(collection, [alcohol_id for alcohol_id, _ in page])
+        return alcohols, next_cursor, len(ranked) if after is None else None
+
+    @staticmethod
+    async def _filter(
+            collection: AsyncIOMotorCollection,
+            ranked: list[tuple[ObjectId, float]],
+            filters: AlcoholFilters | None
+    ) -> list[tuple[ObjectId, float]]:
+        find_filters = AlcoholDatabaseHandler.prepare_find_filters(filters)
+        if not find_filters or not ranked:
+            return ranked
+        matching_ids = await AlcoholDatabaseHandler.filter_alcohol_ids(
+            collection, [alcohol_id for alcohol_id, _ in ranked], find_filters
+        )
+        return [(alcohol_id, score) for alcohol_id, score in ranked if alcohol_id in matching_ids]
+
+    @staticmethod
+    async def _fetch(collection: AsyncIOMotorCollection, alcohol_ids: list[ObjectId]) -> list[dict]:
+        alcohols = {
+            alcohol['_id']: alcohol
+            for alcohol in await AlcoholDatabaseHandler.get_alcohols_by_ids(collection, alcohol_ids)
+        }
+        return [alcohols[alcohol_id] for alcohol_id in alcohol_ids if alcohol_id in alcohols]
+
+
+async def search_backend(config: ApplicationSettings = Depends(get_settings)) -> SearchBackend:
+    if config.SEARCH_BACKEND == 'local':
+        return LocalSearchBackend(local_search_index, config.SEARCH_INDEX_MAX_AGE)
+    return AtlasSearchBackend()
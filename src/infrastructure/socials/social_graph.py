@@ -0,0 +1,204 @@
+from bson import ObjectId
+from fastapi import Depends
+from abc import ABC, abstractmethod
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.infrastructure.database.models.user import UserDatabaseHandler
+from src.infrastructure.config.app_config import ApplicationSettings, get_settings
+from src.infrastructure.common.cursor_utils import encode_cursor, decode_cursor, ID_CURSOR
+from src.infrastructure.database.models.socials.following_database_handler import FollowingDatabaseHandler
+from src.infrastructure.database.models.socials.followers_database_handler import FollowersDatabaseHandler
+from src.infrastructure.database.models.socials.follow_edge_database_handler import FollowEdgeDatabaseHandler
+
+FOLLOWERS = 'followers'
+FOLLOWING = 'following'
+
+
+class SocialGraph(ABC):
+    """
+    Who follows whom. `direction` is either `FOLLOWERS` or `FOLLOWING` of the user,
+    cursor pages are ordered by user id.
+    """
+    @abstractmethod
+    async def get_users(
+            self,
+            db: AsyncIOMotorDatabase,
+            direction: str,
+            user_id: ObjectId,
+            limit: int,
+            offset: int,
+            phrase: str | None = None
+    ) -> tuple[list[dict], int]:
+        pass
+
+    @abstractmethod
+    async def get_users_after(
+            self,
+            db: AsyncIOMotorDatabase,
+            direction: str,
+            user_id: ObjectId,
+            limit: int,
+            cursor: str
+    ) -> tuple[list[dict], str | None, int | None]:
+        pass
+
+    @abstractmethod
+    async def follow(self, db: AsyncIOMotorDatabase, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        """Returns whether the user was not followed before."""
+
+    @abstractmethod
+    async def unfollow(self, db: AsyncIOMotorDatabase, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        """Returns whether the user was followed before."""
+
+    @abstractmethod
+    async def create_user(self, db: AsyncIOMotorDatabase, username: str) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_user(self, db: AsyncIOMotorDatabase, user_id: ObjectId) -> None:
+        pass
+
+
+class EmbeddedSocialGraph(SocialGraph):
+    """Every user's followers and following are arrays in one `followers` and one `following` document."""
+    async def get_users(
+            self,
+            db: AsyncIOMotorDatabase,
+            direction: str,
+            user_id: ObjectId,
+            limit: int,
+            offset: int,
+            phrase: str | None = None
+    ) -> tuple[list[dict], int]:
+        if direction == FOLLOWERS:
+            users = await FollowersDatabaseHandler.search_followers_by_user_id(
+                limit, offset, db.followers, db.users, phrase, user_id
+            )
+            return users, await FollowersDatabaseHandler.count_followers(db.followers, db.users, user_id, phrase)
+        users = await FollowingDatabaseHandler.search_following_by_user_id(
+            limit, offset, db.following, db.users, phrase, user_id
+        )
+        return users, await FollowingDatabaseHandler.count_following(db.following, db.users, user_id, phrase)
+
+    async def get_users_after(
+            self,
+            db: AsyncIOMotorDatabase,
+            direction: str,
+            user_id: ObjectId,
+            limit: int,
+            cursor: str
+    ) -> tuple[list[dict], str | None, int | None]:
+        after = decode_cursor(cursor, limit, ID_CURSOR)
+        after_id = after[1] if after else None
+        if direction == FOLLOWERS:
+            users = await FollowersDatabaseHandler.get_followers_after(
+                limit + 1, after_id, db.followers, db.users, user_id
+            )
+            total = await FollowersDatabaseHandler.count_followers(db.followers, db.users, user_id) \
+                if after is None else None
+        else:
+            users = await FollowingDatabaseHandler.get_following_after(
+                limit + 1, after_id, db.following, db.users, user_id
+            )
+            total = await FollowingDatabaseHandler.count_following(db.following, db.users, user_id) \
+                if after is None else None
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(None, users[-1]['_id']) if users else None
+        return users, next_cursor, total
+
+    async def follow(self, db: AsyncIOMotorDatabase, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        if await FollowingDatabaseHandler.check_if_user_in_following(db.following, follower_id, followee_id):
+            return False
+        await FollowingDatabaseHandler.add_user_to_following(db.following, follower_id, followee_id)
+        if not await FollowersDatabaseHandler.check_if_user_in_followers(db.followers, followee_id, follower_id):
+            await FollowersDatabaseHandler.add_user_to_followers(db.followers, followee_id, follower_id)
+        return True
+
+    async def unfollow(self, db: AsyncIOMotorDatabase, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        removed = await FollowingDatabaseHandler.delete_user_from_following(db.following, follower_id, followee_id)
+        await FollowersDatabaseHandler.delete_user_from_followers(db.followers, followee_id, follower_id)
+        return bool(removed)
+
+    async def create_user(self, db: AsyncIOMotorDatabase, username: str) -> None:
+        await FollowersDatabaseHandler.create_followers_and_following_lists(
+            db.users, username, db.followers, db.following
+        )
+
+    async def delete_user(self, db: AsyncIOMotorDatabase, user_id: ObjectId) -> None:
+        await FollowingDatabaseHandler.delete_user_following(db.following, db.followers, db.users, user_id)
+        await FollowingDatabaseHandler.delete_user_followers(db.followers, db.following, db.users, user_id)
+
+
+class EdgeSocialGraph(SocialGraph):
+    """
+    One `follows` document per follow, so no document grows with the number of followers.
+    Pages and counts are answered from the compound indexes, users are fetched for the page only.
+    """
+    SIDES = {FOLLOWERS: 'followee_id', FOLLOWING: 'follower_id'}
+
+    async def get_users(
+            self,
+            db: AsyncIOMotorDatabase,
+            direction: str,
+            user_id: ObjectId,
+            limit: int,
+            offset: int,
+            phrase: str | None = None
+    ) -> tuple[list[dict], int]:
+        side = self.SIDES[direction]
+        if phrase:
+            return await FollowEdgeDatabaseHandler.search_users(db.follows, side, user_id, phrase, limit, offset)
+        user_ids = await FollowEdgeDatabaseHandler.get_user_ids(db.follows, side, user_id, limit, offset)
+        total = await FollowEdgeDatabaseHandler.count_edges(db.follows, side, user_id)
+        return await self._fetch(db, user_ids), total
+
+    async def get_users_after(
+            self,
+            db: AsyncIOMotorDatabase,
+            direction: str,
+            user_id: ObjectId,
+            limit: int,
+            cursor: str
+    ) -> tuple[list[dict], str | None, int | None]:
+        side = self.SIDES[direction]
+        after = decode_cursor(cursor, limit, ID_CURSOR)
+        user_ids = await FollowEdgeDatabaseHandler.get_user_ids(
+            db.follows, side, user_id, limit + 1, after=after[1] if after else None
+        )
+        next_cursor = None
+        if len(user_ids) > limit:
+            user_ids = user_ids[:limit]
+            next_cursor = encode_cursor(None, user_ids[-1]) if user_ids else None
+        total = await FollowEdgeDatabaseHandler.count_edges(db.follows, side, user_id) if after is None else None
+        return await self._fetch(db, user_ids), next_cursor, total
+
+    async def follow(self, db: AsyncIOMotorDatabase, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        if await FollowEdgeDatabaseHandler.check_if_edge_exists(db.follows, follower_id, followee_id):
+            return False
+        return await FollowEdgeDatabaseHandler.add_edge(db.follows, follower_id, followee_id)
+
+    async def unfollow(self, db: AsyncIOMotorDatabase, follower_id: ObjectId, followee_id: ObjectId) -> bool:
+        return await FollowEdgeDatabaseHandler.delete_edge(db.follows, follower_id, followee_id)
+
+    async def create_user(self, db: AsyncIOMotorDatabase, username: str) -> None:
+        pass
+
+    async def delete_user(self, db: AsyncIOMotorDatabase, user_id: ObjectId) -> None:
+        following, followers = await FollowEdgeDatabaseHandler.delete_user_edges(db.follows, user_id)
+        if following:
+            await FollowersDatabaseHandler.batch_decrease_followers_counter(db.users, following)
+        if followers:
+            await FollowingDatabaseHandler.batch_decrease_following_counter(db.users, followers)
+
+    @staticmethod
+    async def _fetch(db: AsyncIOMotorDatabase, user_ids: list[ObjectId]) -> list[dict]:
+        users = {user['_id']: user for user in await UserDatabaseHandler.get_users_by_ids(db.users, user_ids)}
+        return [users[user_id] for user_id in user_ids if user_id in users]
+
+
+async def social_graph(config: ApplicationSettings = Depends(get_settings)) -> SocialGraph:
+    if config.SOCIAL_GRAPH_STORAGE == 'edges':
+        return EdgeSocialGraph()
+    return EmbeddedSocialGraph()
@@ -0,0 +1,135 @@
+from bson import ObjectId
+from logging import getLogger
+from typing import Callable, Awaitable
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.infrastructure.auth.user_cache import user_cache
+from src.infrastructure.common.job_queue import run_batches
+from src.infrastructure.socials.social_graph import SocialGraph
+from src.infrastructure.config.app_config import ApplicationSettings
+from src.infrastructure.database.models.user import UserDatabaseHandler
+from src.infrastructure.database.models.review import ReviewDatabaseHandler
+from src.infrastructure.database.models.user.account_deletion_database_handler import AccountDeletionDatabaseHandler
+
+logger = getLogger(__name__)
+
+Step = Callable[[AsyncIOMotorDatabase, SocialGraph, ObjectId, int, int], Awaitable[None]]
+
+
+async def delete_lists(
+        db: AsyncIOMotorDatabase, graph: SocialGraph, user_id: ObjectId, batch_size: int, lease: int
+) -> None:
+    await UserDatabaseHandler.delete_user_lists(
+        db.user_favourites, db.user_wishlist, db.user_search_history, db.user_tags, user_id
+    )
+
+
+async def delete_social(
+        db: AsyncIOMotorDatabase, graph: SocialGraph, user_id: ObjectId, batch_size: int, lease: int
+) -> None:
+    await graph.delete_user(db, user_id)
+
+
+async def delete_reviews(
+        db: AsyncIOMotorDatabase, graph: SocialGraph, user_id: ObjectId, batch_size: int, lease: int
+) -> None:
+    """
+    Every batch of reviews is saved in the job with the ratings to remove before anything is applied,
+    each alcohol is recorded in the job once its ratings are removed. A batch interrupted at any point is
+    finished from the job, only the alcohol being updated at that moment can have its ratings removed twice.
+    """
+    await ReviewDatabaseHandler.remove_user_from_reporters(db.reviews, user_id)
+    batch = (await AccountDeletionDatabaseHandler.get_job(db.account_deletions, user_id) or {}).get('batch')
+    while True:
+        if not batch:
+            reviews = await ReviewDatabaseHandler.get_user_reviews_batch(db.reviews, user_id, batch_size)
+            if not reviews:
+                return
+            batch = {
+                'review_ids': [review['_id'] for review in reviews],
+                'ratings': ReviewDatabaseHandler.rating_removals(reviews),
+                'applied': []
+            }
+            await AccountDeletionDatabaseHandler.save_batch(db.account_deletions, user_id, batch, lease)
+        for removal in batch['ratings']:
+            if removal['alcohol_id'] in batch['applied']:
+                continue
+            await ReviewDatabaseHandler.change_rating(db.alcohols, removal['alcohol_id'], removal['counters'])
+            await AccountDeletionDatabaseHandler.mark_applied(
+                db.account_deletions, user_id, removal['alcohol_id'], lease
+            )
+        await ReviewDatabaseHandler.delete_reviews_by_ids(db.reviews, batch['review_ids'])
+        await AccountDeletionDatabaseHandler.save_batch(db.account_deletions, user_id, None, lease)
+        batch = None
+
+
+async def delete_user(
+        db: AsyncIOMotorDatabase, graph: SocialGraph, user_id: ObjectId, batch_size: int, lease: int
+) -> None:
+    await UserDatabaseHandler.delete_user(db.users, user_id)
+    user_cache.invalidate_user_id(user_id)
+
+
+# every step can be run again after an interruption, the user document goes last
+STEPS: tuple[tuple[str, Step], ...] = (
+    ('lists', delete_lists),
+    ('social', delete_social),
+    ('reviews', delete_reviews),
+    ('user', delete_user)
+)
+STEP_NAMES = [name for name, _ in STEPS]
+
+
+async def schedule_account_deletion(db: AsyncIOMotorDatabase, user_id: ObjectId) -> None:
+    """Record the deletion and lock the user out until the account is gone."""
+    await AccountDeletionDatabaseHandler.create_job(db.account_deletions, user_id, STEP_NAMES[0])
+    await UserDatabaseHandler.set_deletion_pending(db.users, user_id)
+    user_cache.invalidate_user_id(user_id)
+
+
+async def run_account_deletion(
+        db: AsyncIOMotorDatabase,
+        graph: SocialGraph,
+        user_id: ObjectId,
+        batch_size: int,
+        lease: int
+) -> bool:
+    """
+    Run the remaining steps of a scheduled deletion, recording each finished one.
+    Returns whether the account was deleted, a failed or already running job is left for `run_account_deletions`.
+    """
+    job = await AccountDeletionDatabaseHandler.claim_job(db.account_deletions, user_id, lease)
+    if not job:
+        return False
+    try:
+        for index in range(STEP_NAMES.index(job['step']), len(STEPS)):
+            await STEPS[index][1](db, graph, user_id, batch_size, lease)
+            if index + 1 < len(STEPS):
+                await AccountDeletionDatabaseHandler.set_step(
+                    db.account_deletions, user_id, STEP_NAMES[index + 1], lease
+                )
+    except Exception:
+        logger.exception('deletion of account %s failed', user_id)
+        await AccountDeletionDatabaseHandler.release_job(db.account_deletions, user_id)
+        return False
+    await AccountDeletionDatabaseHandler.delete_job(db.account_deletions, user_id)
+    return True
+
+
+async def resume_account_deletions(db: AsyncIOMotorDatabase, graph: SocialGraph, batch_size: int, lease: int) -> int:
+    """Finish deletions interrupted by a restart or a failure, returns the number of deleted accounts."""
+    deleted = 0
+    for user_id in await AccountDeletionDatabaseHandler.get_pending_user_ids(db.account_deletions):
+        deleted += await run_account_deletion(db, graph, user_id, batch_size, lease)
+    return deleted
+
+
+async def run_account_deletions(db: AsyncIOMotorDatabase, graph: SocialGraph, settings: ApplicationSettings) -> None:
+    """Retry pending deletions every `ACCOUNT_DELETION_INTERVAL` seconds until cancelled."""
+    batch_size = int(settings.ACCOUNT_DELETION_BATCH_SIZE)
+    lease = int(settings.ACCOUNT_DELETION_LEASE)
+    await run_batches(
+        'account deletion',
+        lambda: resume_account_deletions(db, graph, batch_size, lease),
+        float(settings.ACCOUNT_DELETION_INTERVAL)
+    )
@@ -1,4 +1,5 @@
 from uvicorn import run
+from asyncio import create_task, Task
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,16 +7,33 @@ from async_fastapi_jwt_auth.exceptions import AuthJWTException
 
 from src.api.auth import router as auth_router
 from src.api.admin import router as admin_router
+from src.api.health import router as health_router
 from src.api.user_list import router as list_router
 from src.api.reviews import router as review_router
 from src.api.alcohols import router as alcohol_router
 from src.api.me import router as logged_in_user_router
 from src.api.socials import router as followers_router
+from src.infrastructure.email.mail_queue import mail_queue
+from src.infrastructure.email.mail_sender import mail_sender
+from src.api.health import admin_router as health_admin_router
+from src.infrastructure.socials.social_graph import social_graph
+from src.infrastructure.images.image_resizer import image_resizer
 from src.api.reported_errors import router as reported_error_router
 from src.api.alcohol_suggestion import router as suggestions_router
+from src.infrastructure.auth.password_hasher import password_hasher
+from src.infrastructure.alcohol.category_cache import category_cache
+from src.infrastructure.user.account_deletion import run_account_deletions
+from src.infrastructure.recommender.recommender_client import close_http_client
+from src.infrastructure.auth.token_blacklist_cache import token_blacklist_cache
+from src.infrastructure.database.database_config import connect, disconnect, get_db
+from src.infrastructure.hate_speech_detection.review_screening import review_screener
+from src.infrastructure.database.models.socials.follow_edge_database_handler import FollowEdgeDatabaseHandler
 from src.infrastructure.config.app_config import ALLOWED_HEADERS, ALLOWED_METHODS, ALLOW_CREDENTIALS, get_settings
+from src.infrastructure.hate_speech_detection.hate_speech_detection_client import \
+    create_hate_speech_detection_client
 
 app = FastAPI(title='AlkohoLove-backend-service', docs_url=get_settings().DOCS_URL, redoc_url=None)
+background_tasks: set[Task] = set()
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,6 +52,39 @@ app.include_router(review_router)
 app.include_router(list_router)
 app.include_router(followers_router)
 app.include_router(suggestions_router)
+app.include_router(health_router)
+app.include_router(health_admin_router)
+
+
+@app.on_event('startup')
+async def startup():
+    connect()
+    await token_blacklist_cache.refresh(get_db().tokens_blacklist)
+    if get_settings().WATCH_ALCOHOL_CATEGORIES:
+        background_tasks.add(create_task(category_cache.watch(get_db().alcohol_categories)))
+    if get_settings().SOCIAL_GRAPH_STORAGE == 'edges':
+        await FollowEdgeDatabaseHandler.create_indexes(get_db().follows)
+    if get_settings().HATE_SPEECH_DETECTION_SERVICE_URL:
+        background_tasks.add(create_task(review_screener.run(
+            get_db(), create_hate_speech_detection_client(get_settings()), get_settings()
+        )))
+    if get_settings().EMAIL_HOST:
+        background_tasks.add(create_task(mail_queue.run(get_db(), mail_sender, get_settings())))
+    background_tasks.add(create_task(run_account_deletions(
+        get_db(), await social_graph(get_settings()), get_settings()
+    )))
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    password_hasher.shutdown()
+    image_resizer.shutdown()
+    await close_http_client()
+    await mail_sender.close()
+    disconnect()
 
 
 @app.exception_handler(AuthJWTException)
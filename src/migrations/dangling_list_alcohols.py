@@ -0,0 +1,69 @@
+"""
+Remove ids of deleted alcohols from wishlists, favourites, tags and search histories, so list totals only count
+alcohols that still exist, and recount `wishlist_count` and `favourites_count` of the users they were removed for.
+Safe to run more than once, run from the repository root:
+`$ python -m src.migrations.dangling_list_alcohols`
+"""
+from asyncio import run
+from pymongo import UpdateOne
+from argparse import ArgumentParser
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from src.infrastructure.config.app_config import get_settings
+
+
+async def dangling_ids(db: AsyncIOMotorDatabase, alcohol_ids: list, batch_size: int) -> list:
+    dangling = []
+    for start in range(0, len(alcohol_ids), batch_size):
+        batch = alcohol_ids[start:start + batch_size]
+        existing = set(await db.alcohols.distinct('_id', {'_id': {'$in': batch}}))
+        dangling.extend(alcohol_id for alcohol_id in batch if alcohol_id not in existing)
+    return dangling
+
+
+async def recount(db: AsyncIOMotorDatabase, collection, user_ids: list, counter: str) -> None:
+    """Set `counter` of the users to the length of their list."""
+    sizes = collection.aggregate([
+        {'$match': {'user_id': {'$in': user_ids}}},
+        {'$project': {'user_id': 1, 'size': {'$size': '$alcohols'}}}
+    ])
+    updates = [UpdateOne({'_id': size['user_id']}, {'$set': {counter: size['size']}}) async for size in sizes]
+    if updates:
+        await db.users.bulk_write(updates, ordered=False)
+
+
+async def migrate(db: AsyncIOMotorDatabase, batch_size: int) -> int:
+    """Returns the number of deleted alcohols removed, counted once per kind of list."""
+    lists = (
+        (db.user_wishlist, 'alcohols', lambda ids: {'alcohols': {'$in': ids}}, 'wishlist_count'),
+        (db.user_favourites, 'alcohols', lambda ids: {'alcohols': {'$in': ids}}, 'favourites_count'),
+        (db.user_tags, 'alcohols', lambda ids: {'alcohols': {'$in': ids}}, None),
+        (db.user_search_history, 'alcohols.alcohol_id', lambda ids: {'alcohols': {'alcohol_id': {'$in': ids}}}, None)
+    )
+    removed = 0
+    for collection, field, pull, counter in lists:
+        dangling = await dangling_ids(db, await collection.distinct(field), batch_size)
+        for start in range(0, len(dangling), batch_size):
+            batch = dangling[start:start + batch_size]
+            user_ids = await collection.distinct('user_id', {field: {'$in': batch}}) if counter else []
+            await collection.update_many({field: {'$in': batch}}, {'$pull': pull(batch)})
+            if user_ids:
+                await recount(db, collection, user_ids, counter)
+        removed += len(dangling)
+    return removed
+
+
+async def main(batch_size: int) -> None:
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    try:
+        removed = await migrate(client.alkoholove, batch_size)
+    finally:
+        client.close()
+    print(f'removed {removed} deleted alcohols from lists')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+    run(main(args.batch_size))
@@ -0,0 +1,52 @@
+"""
+Copy the embedded `followers` and `following` arrays into the `follows` edge collection used with
+`SOCIAL_GRAPH_STORAGE=edges`, the arrays are left in place. Safe to run more than once, run from the repository root:
+`$ python -m src.migrations.follow_edges`
+"""
+from asyncio import run
+from pymongo import UpdateOne
+from argparse import ArgumentParser
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from src.infrastructure.config.app_config import get_settings
+from src.infrastructure.database.models.socials.follow_edge_database_handler import FollowEdgeDatabaseHandler
+
+
+def upsert_edge(follower_id, followee_id) -> UpdateOne:
+    edge = {'follower_id': follower_id, 'followee_id': followee_id}
+    return UpdateOne(edge, {'$setOnInsert': edge}, upsert=True)
+
+
+async def migrate(db: AsyncIOMotorDatabase, batch_size: int) -> int:
+    await FollowEdgeDatabaseHandler.create_indexes(db.follows)
+    created = 0
+    operations = []
+    sources = (
+        (db.following, 'following', lambda user_id, other_id: upsert_edge(user_id, other_id)),
+        (db.followers, 'followers', lambda user_id, other_id: upsert_edge(other_id, user_id))
+    )
+    for collection, field, to_edge in sources:
+        async for document in collection.find({}, {field: 1}):
+            operations.extend(to_edge(document['_id'], other_id) for other_id in document.get(field, []))
+            if len(operations) >= batch_size:
+                created += (await db.follows.bulk_write(operations, ordered=False)).upserted_count
+                operations = []
+    if operations:
+        created += (await db.follows.bulk_write(operations, ordered=False)).upserted_count
+    return created
+
+
+async def main(batch_size: int) -> None:
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    try:
+        created = await migrate(client.alkoholove, batch_size)
+    finally:
+        client.close()
+    print(f'created {created} follow edges')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+    run(main(args.batch_size))
@@ -0,0 +1,49 @@
+"""
+Reorder stored search histories newest first, drop duplicated alcohols and cap them to
+`SEARCH_HISTORY_MAX_LENGTH` entries. Safe to run more than once, run from the repository root:
+`$ python -m src.migrations.search_history_newest_first`
+"""
+from asyncio import run
+from pymongo import UpdateOne
+from argparse import ArgumentParser
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from src.infrastructure.config.app_config import get_settings
+
+
+def newest_first(alcohols: list[dict], max_length: int) -> list[dict]:
+    seen = set()
+    result = []
+    for alcohol in sorted(alcohols, key=lambda item: item['search_date'], reverse=True):
+        if alcohol['alcohol_id'] not in seen:
+            seen.add(alcohol['alcohol_id'])
+            result.append(alcohol)
+    return result[:max_length] if max_length > 0 else result
+
+
+async def main(batch_size: int) -> None:
+    settings = get_settings()
+    client = AsyncIOMotorClient(settings.DATABASE_URL)
+    collection = client.alkoholove.user_search_history
+    updated = 0
+    try:
+        operations = []
+        async for search_history in collection.find({}, {'alcohols': 1}):
+            alcohols = newest_first(search_history['alcohols'], settings.SEARCH_HISTORY_MAX_LENGTH)
+            if alcohols != search_history['alcohols']:
+                operations.append(UpdateOne({'_id': search_history['_id']}, {'$set': {'alcohols': alcohols}}))
+            if len(operations) >= batch_size:
+                updated += (await collection.bulk_write(operations, ordered=False)).modified_count
+                operations = []
+        if operations:
+            updated += (await collection.bulk_write(operations, ordered=False)).modified_count
+    finally:
+        client.close()
+    print(f'updated {updated} search histories')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+    run(main(args.batch_size))
@@ -1,6 +1,7 @@
 from httpx import AsyncClient
 from pytest_asyncio import fixture
 from typing import Callable, AsyncGenerator
+from mongomock_motor import AsyncMongoMockDatabase
 
 
 @fixture(autouse=True)
@@ -11,14 +12,84 @@ def mock_settings_env_vars():
         yield
 
 
+@fixture(autouse=True)
+def clear_in_memory_caches():
+    from src.infrastructure.auth.user_cache import user_cache
+    from src.infrastructure.email.mail_queue import mail_queue
+    from src.infrastructure.alcohol.facet_index import facet_index
+    from src.infrastructure.alcohol.category_cache import category_cache
+    from src.infrastructure.alcohol.filters_snapshot import filters_snapshot
+    from src.infrastructure.search.local_search_index import local_search_index
+    from src.infrastructure.auth.token_blacklist_cache import token_blacklist_cache
+    from src.infrastructure.hate_speech_detection.review_screening import review_screener
+    from src.infrastructure.recommender.recommender_client import similar_alcohols_cache, recommendations_cache
+    category_cache.invalidate()
+    filters_snapshot.invalidate()
+    facet_index.invalidate()
+    local_search_index.invalidate()
+    token_blacklist_cache.invalidate()
+    user_cache.invalidate()
+    similar_alcohols_cache.invalidate()
+    recommendations_cache.invalidate()
+    review_screener.invalidate()
+    mail_queue.invalidate()
+    yield
+
+
 @fixture
 def override_get_db(mongodb) -> Callable:
+    async_mongodb = AsyncMongoMockDatabase(mongodb)
+
     def _override_get_db():
-        return mongodb
+        return async_mongodb
 
     return _override_get_db
 
 
+@fixture
+async def mongod_db() -> AsyncGenerator:
+    """
+    A scratch database on a real MongoDB server for behaviour mongomock cannot reproduce, such as writes
+    interleaving on the server. Tests using it are skipped unless `TEST_DATABASE_URL` is set.
+    """
+    from os import getenv
+    from pytest import skip
+    from bson import ObjectId
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    url = getenv('TEST_DATABASE_URL')
+    if not url:
+        skip('TEST_DATABASE_URL is not set')
+    client = AsyncIOMotorClient(url)
+    name = f'alkoholove_test_{ObjectId()}'
+    try:
+        yield client[name]
+    finally:
+        await client.drop_database(name)
+        client.close()
+
+
+@fixture
+def mock_http_client() -> tuple[AsyncClient, list, list]:
+    """
+    An httpx client answering with `responses` in order, exceptions among them are raised instead.
+    Paths of the sent requests are collected in `requests`.
+    """
+    from httpx import MockTransport
+
+    responses = []
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return AsyncClient(transport=MockTransport(handler)), responses, requests
+
+
 @fixture
 async def async_client(override_get_db: Callable) -> AsyncGenerator:
     from src.infrastructure.database.database_config import get_db
@@ -29,6 +100,35 @@ async def async_client(override_get_db: Callable) -> AsyncGenerator:
         yield ac
 
 
+@fixture
+async def edge_social_graph(async_client: AsyncClient, override_get_db: Callable) -> AsyncGenerator:
+    from src.main import app
+    from src.infrastructure.socials.social_graph import social_graph, EdgeSocialGraph
+    from src.infrastructure.database.models.socials.follow_edge_database_handler import FollowEdgeDatabaseHandler
+
+    await FollowEdgeDatabaseHandler.create_indexes(override_get_db().follows)
+    app.dependency_overrides[social_graph] = EdgeSocialGraph
+    yield
+    app.dependency_overrides.pop(social_graph)
+
+
+@fixture
+async def local_image_storage(async_client: AsyncClient, tmp_path) -> AsyncGenerator:
+    from src.main import app
+    from src.infrastructure.config.app_config import get_settings
+    from src.infrastructure.images.image_storage import image_storage, LocalImageStorage
+
+    storage = LocalImageStorage(tmp_path)
+    settings = get_settings().copy(
+        update={'ALCOHOL_IMAGES_DIR': 'alcohols', 'ALCOHOL_SUGGESTION_IMAGES_DIR': 'alcohol_suggestions'}
+    )
+    app.dependency_overrides[image_storage] = lambda: storage
+    app.dependency_overrides[get_settings] = lambda: settings
+    yield tmp_path
+    app.dependency_overrides.pop(image_storage)
+    app.dependency_overrides.pop(get_settings)
+
+
 @fixture
 async def user_token_headers(async_client: AsyncClient) -> dict[str, str]:
     data = {
@@ -202,7 +202,7 @@ SEARCH_HISTORY_FIXTURE = [
                 "rate_4_count": 0,
                 "rate_5_count": 0
             },
-        'date': '2022-07-21T19:13:25+00:00'
+        'date': '2022-07-21T19:13:25'
     },
     {
         'alcohol':
@@ -243,6 +243,6 @@ SEARCH_HISTORY_FIXTURE = [
                 "rate_4_count": 0,
                 "rate_5_count": 1
             },
-        'date': '2022-04-25T19:13:25+00:00'
+        'date': '2022-04-25T19:13:25'
     }
 ]
@@ -1,4 +1,10 @@
+import json
+from PIL import Image
+from io import BytesIO
 from pytest import mark
+from pathlib import Path
+from bson import ObjectId
+from typing import Callable
 from httpx import AsyncClient
 
 from src.tests.response_fixtures.alcohol_suggestions import SUGGESTION_ID_FIXTURE, SUGGESTIONS_RESPONSE_FIXTURE, \
@@ -135,6 +141,42 @@ async def test_ban_user(
     assert response.status_code == 204
 
 
+@mark.asyncio
+async def test_ban_applies_to_cached_user(
+        async_client: AsyncClient,
+        admin_token_headers: dict[str, str],
+        user_token_headers: dict[str, str]
+):
+    response = await async_client.get('/me/wishlist', headers=user_token_headers)
+    assert response.status_code == 200
+    response = await async_client.put('/admin/users/6288e2fdd5ab6070dde8db8c?to_ban=true', headers=admin_token_headers)
+    assert response.status_code == 204
+    response = await async_client.get('/me/wishlist', headers=user_token_headers)
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Brak dostępu. Użytkownik jest zablokowany.'
+
+
+@mark.asyncio
+async def test_ban_during_user_read_is_not_cached(override_get_db: Callable, monkeypatch):
+    from src.infrastructure.auth.user_cache import user_cache
+    from src.infrastructure.database.models.user import UserDatabaseHandler
+
+    users = override_get_db().users
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    get_user_by_username = UserDatabaseHandler.get_user_by_username
+
+    async def banned_during_read(collection, username):
+        user = await get_user_by_username(collection, username)
+        await UserDatabaseHandler.ban_user(collection, user_id)
+        user_cache.invalidate_user_id(user_id)
+        return user
+
+    monkeypatch.setattr(UserDatabaseHandler, 'get_user_by_username', banned_during_read)
+    assert not (await user_cache.get(users, 'Adam_Skorupa', max_age=60, max_size=10))['is_banned']
+    monkeypatch.setattr(UserDatabaseHandler, 'get_user_by_username', get_user_by_username)
+    assert (await user_cache.get(users, 'Adam_Skorupa', max_age=60, max_size=10))['is_banned']
+
+
 @mark.asyncio
 async def test_get_error(
         async_client: AsyncClient,
@@ -216,10 +258,37 @@ async def test_delete_error_with_insufficient_permissions(
 @mark.asyncio
 async def test_delete_alcohol(
         async_client: AsyncClient,
-        admin_token_headers: dict[str, str]
+        admin_token_headers: dict[str, str],
+        local_image_storage: Path
 ):
+    images = local_image_storage / 'alcohols'
+    images.mkdir()
+    for size in ['sm', 'md']:
+        (images / f'6288e32dd5ab6070dde8db8f_{size}').write_bytes(b'image')
+    (images / '6288e32dd5ab6070dde8db90_sm').write_bytes(b'image')
+
     response = await async_client.delete('/admin/alcohols/6288e32dd5ab6070dde8db8f', headers=admin_token_headers)
     assert response.status_code == 204
+    assert [image.name for image in images.iterdir()] == ['6288e32dd5ab6070dde8db90_sm']
+
+
+@mark.asyncio
+async def test_delete_alcohol_updates_list_counters(
+        async_client: AsyncClient,
+        admin_token_headers: dict[str, str],
+        override_get_db: Callable,
+        local_image_storage: Path
+):
+    db = override_get_db()
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    await db.users.update_one({'_id': user_id}, {'$set': {'wishlist_count': 3, 'favourites_count': 2}})
+
+    response = await async_client.delete('/admin/alcohols/6288e32dd5ab6070dde8db8c', headers=admin_token_headers)
+    assert response.status_code == 204
+    user = await db.users.find_one({'_id': user_id})
+    assert (user['wishlist_count'], user['favourites_count']) == (2, 1)
+    assert len((await db.user_wishlist.find_one({'user_id': user_id}))['alcohols']) == 2
+    assert len((await db.user_favourites.find_one({'user_id': user_id}))['alcohols']) == 1
 
 
 @mark.asyncio
@@ -251,6 +320,67 @@ async def test_update_alcohol_without_required_data(
     assert response.status_code == 422
 
 
+def create_image() -> bytes:
+    output = BytesIO()
+    Image.new('RGB', (1600, 1200), 'red').save(output, 'PNG')
+    return output.getvalue()
+
+
+@mark.asyncio
+async def test_create_alcohol_with_image(
+        async_client: AsyncClient,
+        admin_token_headers: dict[str, str],
+        local_image_storage: Path,
+        override_get_db: Callable
+):
+    response = await async_client.post(
+        '/admin/alcohols',
+        headers=admin_token_headers,
+        data={'payload': json.dumps(ALCOHOL_FIXTURE)},
+        files={'image': ('image.png', create_image(), 'image/png')}
+    )
+    assert response.status_code == 201
+    alcohol = await override_get_db().alcohols.find_one({'name': ALCOHOL_FIXTURE['name']})
+    images = {image.name for image in (local_image_storage / 'alcohols').iterdir()}
+    assert {f'{alcohol["_id"]}_sm', f'{alcohol["_id"]}_md'} <= images
+    with Image.open(local_image_storage / 'alcohols' / f'{alcohol["_id"]}_sm') as image:
+        assert image.size == (300, 225)
+
+
+@mark.asyncio
+async def test_update_alcohol_with_image(
+        async_client: AsyncClient,
+        admin_token_headers: dict[str, str],
+        local_image_storage: Path
+):
+    response = await async_client.put(
+        f'/admin/alcohols/{ALCOHOL_ID_FIXTURE}',
+        headers=admin_token_headers,
+        data={'payload': json.dumps({'description': 'test_description'})},
+        files={'image': ('image.png', create_image(), 'image/png')}
+    )
+    assert response.status_code == 200
+    with Image.open(local_image_storage / 'alcohols' / f'{ALCOHOL_ID_FIXTURE}_md') as image:
+        assert image.size == (800, 600)
+
+
+@mark.asyncio
+async def test_create_alcohol_with_invalid_image(
+        async_client: AsyncClient,
+        admin_token_headers: dict[str, str],
+        local_image_storage: Path,
+        override_get_db: Callable
+):
+    response = await async_client.post(
+        '/admin/alcohols',
+        headers=admin_token_headers,
+        data={'payload': json.dumps(ALCOHOL_FIXTURE)},
+        files={'image': ('image.png', b'not an image', 'image/png')}
+    )
+    assert response.status_code == 400
+    assert not await override_get_db().alcohols.find_one({'name': ALCOHOL_FIXTURE['name']})
+
+
 # --------------------------------------------alcohol_suggestions---------------------------------------------
 @mark.asyncio
 async def test_get_suggestions_with_insufficient_permissions(
@@ -277,10 +407,17 @@ async def test_delete_suggestion_with_insufficient_permissions(
 @mark.asyncio
 async def test_delete_suggestion(
         async_client: AsyncClient,
-        admin_token_headers: dict[str, str]
+        admin_token_headers: dict[str, str],
+        local_image_storage: Path
 ):
+    images = local_image_storage / 'alcohol_suggestions'
+    images.mkdir()
+    for name in ['5900699104827_1', '5900699104827_2', '3800006901502_1']:
+        (images / name).write_bytes(b'image')
+
     response = await async_client.delete(f'/admin/suggestions/{SUGGESTION_ID_FIXTURE}', headers=admin_token_headers)
     assert response.status_code == 204
+    assert [image.name for image in images.iterdir()] == ['3800006901502_1']
 
 
 @mark.asyncio
@@ -0,0 +1,86 @@
+from PIL import Image
+from io import BytesIO
+from pathlib import Path
+from bson import ObjectId
+from pytest import mark, raises
+from mongomock_motor import AsyncMongoMockDatabase
+
+from src.infrastructure.images.image_resizer import image_formats
+from src.infrastructure.images.image_storage import LocalImageStorage
+from src.infrastructure.exceptions.alcohol_exceptions import WrongFileTypeException
+from src.infrastructure.images.alcohol_images import store_alcohol_images, delete_alcohol_images
+
+ALCOHOL_ID_FIXTURE = ObjectId('6288e32dd5ab6070dde8db8f')
+
+
+def create_image(color: str, image_format: str = 'PNG') -> bytes:
+    output = BytesIO()
+    Image.new('RGB', (1600, 1200), color).save(output, image_format)
+    return output.getvalue()
+
+
+def test_image_formats_skips_unknown_formats():
+    assert image_formats('webp, gif,') == ['webp']
+    assert image_formats('') == []
+
+
+@mark.asyncio
+async def test_store_alcohol_images_resizes_source(mongodb, tmp_path: Path):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_images
+    uploaded = await store_alcohol_images(
+        collection, LocalImageStorage(tmp_path), ALCOHOL_ID_FIXTURE, 'alcohols', create_image('red'), ['webp'], True
+    )
+
+    assert sorted(uploaded) == ['md', 'md_webp', 'sm', 'sm_webp']
+    with Image.open(tmp_path / 'alcohols' / f'{ALCOHOL_ID_FIXTURE}_sm') as image:
+        assert (image.format, image.size) == ('PNG', (300, 225))
+    with Image.open(tmp_path / 'alcohols' / f'{ALCOHOL_ID_FIXTURE}_md_webp') as image:
+        assert (image.format, image.size) == ('WEBP', (800, 600))
+
+
+@mark.asyncio
+async def test_store_alcohol_images_skips_unchanged_images(mongodb, tmp_path: Path):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_images
+    storage = LocalImageStorage(tmp_path)
+    await store_alcohol_images(collection, storage, ALCOHOL_ID_FIXTURE, 'alcohols', create_image('red'), [], True)
+
+    assert await store_alcohol_images(
+        collection, storage, ALCOHOL_ID_FIXTURE, 'alcohols', create_image('red'), [], True
+    ) == []
+    assert await store_alcohol_images(
+        collection, storage, ALCOHOL_ID_FIXTURE, 'alcohols', create_image('red'), ['webp'], True
+    ) == ['sm_webp', 'md_webp']
+    assert sorted(await store_alcohol_images(
+        collection, storage, ALCOHOL_ID_FIXTURE, 'alcohols', create_image('blue', 'JPEG'), ['webp'], True
+    )) == ['md', 'md_webp', 'sm', 'sm_webp']
+
+
+@mark.asyncio
+async def test_store_alcohol_images_rejects_invalid_image(mongodb, tmp_path: Path):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_images
+    with raises(WrongFileTypeException):
+        await store_alcohol_images(
+            collection, LocalImageStorage(tmp_path), ALCOHOL_ID_FIXTURE, 'alcohols', b'not an image', [], True
+        )
+    assert not (tmp_path / 'alcohols').exists()
+
+
+@mark.asyncio
+async def test_delete_alcohol_images(mongodb, tmp_path: Path):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_images
+    storage = LocalImageStorage(tmp_path)
+    await store_alcohol_images(collection, storage, ALCOHOL_ID_FIXTURE, 'alcohols', create_image('red'), ['webp'], True)
+
+    await delete_alcohol_images(collection, storage, ALCOHOL_ID_FIXTURE, 'alcohols', ['webp'])
+    assert list((tmp_path / 'alcohols').iterdir()) == []
+    assert await collection.find_one({'_id': ALCOHOL_ID_FIXTURE}) is None
+
+
+@mark.asyncio
+async def test_local_image_storage_rejects_paths_outside_root(tmp_path: Path):
+    storage = LocalImageStorage(tmp_path / 'images')
+    with raises(ValueError):
+        await storage.upload(BytesIO(b'image'), 'alcohols', '../../escaped', overwrite=True)
+    with raises(ValueError):
+        await storage.delete('../escaped')
+    assert not (tmp_path / 'escaped').exists()
@@ -1,4 +1,5 @@
 from pytest import mark
+from pathlib import Path
 from httpx import AsyncClient
 
 from src.tests.response_fixtures.alcohol_suggestions import SUGGESTION_POST_FIXTURE, \
@@ -52,3 +53,51 @@ async def test_create_suggestion_with_no_description(
 ):
     response = await async_client.post('/suggestions', headers=user_token_headers, json=SUGGESTION_POST_FIXTURE_NO_DESC)
     assert response.status_code == 201
+
+
+@mark.asyncio
+async def test_upload_suggestion_image(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        local_image_storage: Path
+):
+    response = await async_client.post(
+        '/suggestions/image',
+        headers=user_token_headers,
+        data={'image_name': '5900699104827_1'},
+        files={'file': ('image.png', b'image', 'image/png')}
+    )
+    assert response.status_code == 201
+    assert (local_image_storage / 'alcohol_suggestions' / '5900699104827_1').read_bytes() == b'image'
+
+
+@mark.asyncio
+async def test_upload_suggestion_image_with_path_in_name(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        local_image_storage: Path
+):
+    response = await async_client.post(
+        '/suggestions/image',
+        headers=user_token_headers,
+        data={'image_name': '../5900699104827_1'},
+        files={'file': ('image.png', b'image', 'image/png')}
+    )
+    assert response.status_code == 400
+    assert not (local_image_storage / '5900699104827_1').exists()
+
+
+@mark.asyncio
+async def test_upload_suggestion_image_with_wrong_type(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        local_image_storage: Path
+):
+    response = await async_client.post(
+        '/suggestions/image',
+        headers=user_token_headers,
+        data={'image_name': '5900699104827_1'},
+        files={'file': ('image.gif', b'image', 'image/gif')}
+    )
+    assert response.status_code == 400
+    assert not (local_image_storage / 'alcohol_suggestions').exists()
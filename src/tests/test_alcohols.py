@@ -1,5 +1,7 @@
 from pytest import mark
+from bson import ObjectId
 from httpx import AsyncClient
+from pytest_asyncio import fixture
 
 from src.tests.response_fixtures.alcohol_filters_fixtures import ALCOHOL_FILTER_FIXTURE, ALCOHOL_FILTER_FIXTURE_KIND_ALL
 
@@ -157,6 +159,155 @@ async def test_search_alcohols(
     assert response['alcohols'][0] == ALCOHOL_FIXTURE_2
 
 
+@mark.asyncio
+async def test_search_alcohols_with_cursor(async_client: AsyncClient):
+    names = []
+    totals = []
+    cursor = ''
+    while cursor is not None:
+        response = await async_client.post(f'/alcohols?limit=2&cursor={cursor}')
+        assert response.status_code == 200
+        response = response.json()
+        names.extend(alcohol['name'] for alcohol in response['alcohols'])
+        totals.append(response['page_info']['total'])
+        cursor = response['page_info']['next_cursor']
+    assert names == [
+        'Absolut Vodka', 'Havana Cub Anejo 3 Anos Blanco', 'Jameson', 'Jameson Caskmates Stout Edition', 'Kupnik Pigwa'
+    ]
+    assert totals == [5, None, None]
+
+
+@mark.asyncio
+async def test_search_alcohols_with_invalid_cursor(async_client: AsyncClient):
+    response = await async_client.post('/alcohols?limit=2&cursor=invalid')
+    assert response.status_code == 400
+    assert response.json() == {'detail': 'Nieprawidłowy kursor.'}
+
+
+@mark.asyncio
+@mark.parametrize('sort_value', [{'$regex': '.*'}, ['a'], True, 1.5])
+async def test_search_alcohols_with_cursor_of_wrong_sort_value(async_client: AsyncClient, sort_value):
+    from src.infrastructure.common.cursor_utils import encode_cursor
+
+    cursor = encode_cursor(sort_value, ObjectId())
+    response = await async_client.post(f'/alcohols?limit=2&cursor={cursor}')
+    assert response.status_code == 400
+    assert response.json() == {'detail': 'Nieprawidłowy kursor.'}
+
+
+@mark.asyncio
+@mark.parametrize('limit', [0, -1])
+async def test_search_alcohols_with_cursor_and_non_positive_limit(async_client: AsyncClient, limit: int):
+    response = await async_client.post(f'/alcohols?limit={limit}&cursor=')
+    assert response.status_code == 400
+    assert response.json() == {'detail': 'Limit musi być większy od zera.'}
+
+
+@fixture
+def local_search_backend():
+    from src.main import app
+    from src.infrastructure.search.search_backend import search_backend, LocalSearchBackend
+    from src.infrastructure.search.local_search_index import local_search_index
+
+    local_search_index.invalidate()
+    app.dependency_overrides[search_backend] = lambda: LocalSearchBackend(local_search_index, 300)
+    yield
+    app.dependency_overrides.pop(search_backend)
+
+
+@mark.asyncio
+@mark.parametrize('phrase', ['jameson', 'jamesom', 'jam'])
+async def test_search_alcohols_by_phrase_locally(async_client: AsyncClient, local_search_backend, phrase: str):
+    response = await async_client.post(f'/alcohols?limit=10&offset=0&phrase={phrase}')
+    assert response.status_code == 200
+    response = response.json()
+    assert response['page_info']['total'] == 2
+    assert [alcohol['name'] for alcohol in response['alcohols']] == ['Jameson', 'Jameson Caskmates Stout Edition']
+
+
+@mark.asyncio
+async def test_search_alcohols_by_phrase_locally_ranks_by_boost(async_client: AsyncClient, local_search_backend):
+    response = await async_client.post('/alcohols?limit=1&offset=0&phrase=wódka')
+    assert response.status_code == 200
+    response = response.json()
+    assert response['page_info']['total'] == 2
+    assert [alcohol['name'] for alcohol in response['alcohols']] == ['Absolut Vodka']
+
+
+@mark.asyncio
+async def test_search_alcohols_by_phrase_locally_with_filters(async_client: AsyncClient, local_search_backend):
+    response = await async_client.post('/alcohols?limit=10&offset=0&phrase=wódka', json={'kind': 'likier'})
+    assert response.status_code == 200
+    response = response.json()
+    assert response['page_info']['total'] == 1
+    assert [alcohol['name'] for alcohol in response['alcohols']] == ['Kupnik Pigwa']
+
+
+@mark.asyncio
+async def test_search_alcohols_by_phrase_locally_with_cursor(async_client: AsyncClient, local_search_backend):
+    response = await async_client.post('/alcohols?limit=1&cursor=&phrase=jameson')
+    response = response.json()
+    assert response['page_info']['total'] == 2
+    assert response['alcohols'][0]['name'] == 'Jameson'
+
+    response = await async_client.post(
+        f'/alcohols?limit=1&cursor={response["page_info"]["next_cursor"]}&phrase=jameson'
+    )
+    response = response.json()
+    assert response['page_info'] == {'limit': 1, 'next_cursor': None, 'total': None}
+    assert response['alcohols'][0]['name'] == 'Jameson Caskmates Stout Edition'
+
+
+@mark.asyncio
+async def test_search_alcohols_by_phrase_locally_loads_index_once(
+        async_client: AsyncClient,
+        local_search_backend,
+        monkeypatch
+):
+    from asyncio import gather, sleep
+    from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+
+    loads = []
+    get_alcohols_search_fields = AlcoholDatabaseHandler.get_alcohols_search_fields
+
+    async def counting_get_alcohols_search_fields(collection, fields):
+        loads.append(fields)
+        # mongomock answers without yielding, a real query lets other requests in
+        await sleep(0)
+        return await get_alcohols_search_fields(collection, fields)
+
+    monkeypatch.setattr(AlcoholDatabaseHandler, 'get_alcohols_search_fields', counting_get_alcohols_search_fields)
+    responses = await gather(*(async_client.post('/alcohols?limit=10&offset=0&phrase=jameson') for _ in range(5)))
+    assert all(response.json()['page_info']['total'] == 2 for response in responses)
+    assert len(loads) == 1
+
+
+@mark.asyncio
+async def test_search_alcohols_by_phrase_locally_during_write(
+        async_client: AsyncClient,
+        local_search_backend,
+        monkeypatch
+):
+    from src.infrastructure.search.local_search_index import local_search_index
+    from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+
+    loads = []
+    get_alcohols_search_fields = AlcoholDatabaseHandler.get_alcohols_search_fields
+
+    async def racing_get_alcohols_search_fields(collection, fields):
+        loads.append(fields)
+        alcohols = await get_alcohols_search_fields(collection, fields)
+        if len(loads) == 1:
+            # an alcohol deleted by an admin while the index loads
+            local_search_index.remove_alcohol({'_id': ObjectId()})
+        return alcohols
+
+    monkeypatch.setattr(AlcoholDatabaseHandler, 'get_alcohols_search_fields', racing_get_alcohols_search_fields)
+    response = await async_client.post('/alcohols?limit=10&offset=0&phrase=jameson')
+    assert response.json()['page_info']['total'] == 2
+    assert len(loads) == 2
+
+
 @mark.asyncio
 async def search_alcohols_with_filters_with_empty_kind(async_client: AsyncClient):
     body = {'kind': ''}
@@ -211,6 +362,56 @@ async def test_get_alcohol_filters_kind_all(async_client: AsyncClient):
     assert response['filters'][0] == ALCOHOL_FILTER_FIXTURE_KIND_ALL
 
 
+@mark.asyncio
+async def test_get_alcohol_filters_not_modified(async_client: AsyncClient):
+    response = await async_client.get('/alcohols/filters')
+    etag = response.headers['etag']
+    response = await async_client.get('/alcohols/filters', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['etag'] == etag
+
+
+@mark.asyncio
+async def test_get_alcohol_filters_after_alcohol_update(async_client: AsyncClient):
+    from src.infrastructure.alcohol.filters_snapshot import filters_snapshot
+
+    response = await async_client.get('/alcohols/filters')
+    etag = response.headers['etag']
+    filters_snapshot.add_alcohol({'kind': 'wódka', 'country': 'Polska', 'color': ''})
+
+    response = await async_client.get('/alcohols/filters', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['etag'] != etag
+    country_filter = next(
+        _filter for _filter in response.json()['filters'][-1]['filters'] if _filter['name'] == 'country'
+    )
+    assert country_filter['values'] == ['Polska', 'Szwecja']
+
+
+@mark.asyncio
+async def test_get_alcohol_filters_builds_snapshot_once_for_concurrent_requests(
+        async_client: AsyncClient,
+        monkeypatch
+):
+    from asyncio import gather, sleep
+    from src.infrastructure.database.models.alcohol_filter import AlcoholFilterDatabaseHandler
+
+    builds = []
+    get_all_filters = AlcoholFilterDatabaseHandler.get_all_filters
+
+    async def counting_get_all_filters(collection):
+        builds.append(collection)
+        # mongomock answers without yielding, a real query lets other requests in
+        await sleep(0)
+        return await get_all_filters(collection)
+
+    monkeypatch.setattr(AlcoholFilterDatabaseHandler, 'get_all_filters', counting_get_all_filters)
+    responses = await gather(*(async_client.get('/alcohols/filters') for _ in range(5)))
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.headers['etag'] for response in responses}) == 1
+    assert len(builds) == 1
+
+
 @mark.asyncio
 async def test_get_schemas(
         async_client: AsyncClient,
@@ -308,6 +509,26 @@ async def test_search_alcohol_list_value_by_phrase(
     assert response == AROMA_FIXTURE
 
 
+@mark.asyncio
+async def test_search_alcohol_list_value_after_index_update(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str]
+):
+    from src.infrastructure.alcohol.facet_index import facet_index
+
+    url = '/alcohols/search_values?field_name=aroma&phrase=O&limit=10&offset=0'
+    response = await async_client.post(url, headers=user_token_headers)
+    assert response.json() == AROMA_FIXTURE
+
+    facet_index.add_alcohol({'aroma': ['Ostre', 'pieprz']})
+    response = await async_client.post(url, headers=user_token_headers)
+    assert response.json() == ['orzechy', 'Ostre', 'owoce']
+
+    facet_index.remove_alcohol({'aroma': ['Ostre']})
+    response = await async_client.post(url, headers=user_token_headers)
+    assert response.json() == AROMA_FIXTURE
+
+
 @mark.asyncio
 async def test_search_alcohol_list_value_by_empty_phrase(
         async_client: AsyncClient,
@@ -348,3 +569,118 @@ async def test_search_alcohol_simple_value_by_empty_phrase(
     assert response.status_code == 200
     response = response.json()
     assert response == ALL_KINDS
+
+
+@mark.asyncio
+async def test_search_values_of_unknown_field_are_not_indexed(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str]
+):
+    from src.infrastructure.alcohol.facet_index import facet_index
+
+    for field_name in ('_id', 'rate_count', 'unknown'):
+        response = await async_client.post(
+            f'/alcohols/search_values?field_name={field_name}&limit=10&offset=0', headers=user_token_headers
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+    assert facet_index._fields == {}
+
+
+@mark.asyncio
+async def test_search_values_loads_field_once_for_concurrent_requests(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        monkeypatch
+):
+    from asyncio import gather, sleep
+    from src.infrastructure.database.models.alcohol import AlcoholDatabaseHandler
+
+    loads = []
+    count_values = AlcoholDatabaseHandler.count_values
+
+    async def counting_count_values(field_name, collection):
+        loads.append(field_name)
+        # mongomock answers without yielding, a real query lets other requests in
+        await sleep(0)
+        return await count_values(field_name, collection)
+
+    monkeypatch.setattr(AlcoholDatabaseHandler, 'count_values', counting_count_values)
+    responses = await gather(*(
+        async_client.post('/alcohols/search_values?field_name=aroma&limit=10&offset=0', headers=user_token_headers)
+        for _ in range(5)
+    ))
+    assert all(response.json() == ALL_AROMAS for response in responses)
+    assert loads == ['aroma']
+
+
+@fixture
+def recommender_responses(mock_http_client: tuple[AsyncClient, list, list]):
+    from src.main import app
+    from src.infrastructure.config.app_config import get_settings
+    from src.infrastructure.recommender.recommender_client import recommender_client, RecommenderClient
+
+    http_client, responses, requests = mock_http_client
+    app.dependency_overrides[recommender_client] = lambda: RecommenderClient(
+        'http://recommender', http_client, get_settings()
+    )
+    yield responses, requests
+    app.dependency_overrides.pop(recommender_client)
+
+
+@mark.asyncio
+async def test_get_similar_alcohols_is_retried_and_cached(
+        async_client: AsyncClient,
+        recommender_responses: tuple[list, list]
+):
+    from httpx import Response
+    responses, requests = recommender_responses
+    responses.extend([Response(503), Response(200, json={'similar': ['6288e32dd5ab6070dde8db8b']})])
+    for _ in range(2):
+        response = await async_client.get('/alcohols/6288e32dd5ab6070dde8db8a/similar')
+        assert response.status_code == 200
+        assert [alcohol['id'] for alcohol in response.json()['alcohols']] == ['6288e32dd5ab6070dde8db8b']
+    assert requests == ['/recommend/alcohols/6288e32dd5ab6070dde8db8a'] * 2
+
+
+@mark.asyncio
+async def test_get_similar_alcohols_recommender_unavailable(
+        async_client: AsyncClient,
+        recommender_responses: tuple[list, list]
+):
+    from httpx import ReadTimeout
+    responses, requests = recommender_responses
+    responses.extend([ReadTimeout('timed out'), ReadTimeout('timed out')])
+    response = await async_client.get('/alcohols/6288e32dd5ab6070dde8db8a/similar')
+    assert response.status_code == 502
+    assert len(requests) == 2
+
+
+@mark.asyncio
+async def test_get_similar_alcohols_client_error_is_not_retried(
+        async_client: AsyncClient,
+        recommender_responses: tuple[list, list]
+):
+    from httpx import Response
+    responses, requests = recommender_responses
+    responses.extend([Response(404), Response(200, json={'similar': []})])
+    response = await async_client.get('/alcohols/6288e32dd5ab6070dde8db8a/similar')
+    assert response.status_code == 502
+    assert len(requests) == 1
+
+
+@mark.asyncio
+@mark.parametrize('query', ['limit=10&offset=0', 'limit=2&cursor='])
+async def test_search_alcohols_fast_json_matches_validated(async_client: AsyncClient, query: str):
+    from src.main import app
+    from src.infrastructure.config.app_config import get_settings
+
+    fast = await async_client.post(f'/alcohols?{query}')
+    app.dependency_overrides[get_settings] = lambda: get_settings().copy(update={'FAST_JSON_RESPONSES': False})
+    try:
+        validated = await async_client.post(f'/alcohols?{query}')
+    finally:
+        app.dependency_overrides.pop(get_settings)
+    assert fast.status_code == validated.status_code == 200
+    assert fast.headers['content-type'] == 'application/json'
+    assert fast.json() == validated.json()
@@ -1,5 +1,10 @@
 from pytest import mark
+from typing import Callable
 from httpx import AsyncClient
+from asyncio import sleep, gather
+from datetime import datetime, timedelta
+
+from src.infrastructure.auth.token_blacklist_cache import token_blacklist_cache
 
 TEST_PASSWORD_FIXTURE = 'TestTest1234'
 TEST_INVALID_PASSWORD_FIXTURE = 'Test'
@@ -37,6 +42,46 @@ async def test_logout(async_client: AsyncClient):
     }
     response = await async_client.post('/auth/logout', headers=headers)
     assert response.status_code == 204
+    response = await async_client.get('/me', headers={'Authorization': f'Bearer {access_token}'})
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Access token jest na czarnej liście.'
+
+
+@mark.asyncio
+async def test_token_blacklist_cache(override_get_db: Callable):
+    collection = override_get_db().tokens_blacklist
+    now = datetime.utcnow()
+    await collection.insert_one({'token_jti': 'revoked', 'expiration_date': now + timedelta(days=1)})
+    await collection.insert_one({'token_jti': 'expired', 'expiration_date': now - timedelta(days=1)})
+    # written in the local time of a host west of UTC, the token itself is still valid
+    await collection.insert_one({'token_jti': 'legacy', 'expiration_date': now - timedelta(hours=5)})
+    assert await token_blacklist_cache.is_revoked(collection, 'revoked', max_age=60)
+    assert not await token_blacklist_cache.is_revoked(collection, 'expired', max_age=60)
+    assert await token_blacklist_cache.is_revoked(collection, 'legacy', max_age=0)
+
+    # revoked by another worker, seen once the cache is older than max_age
+    await collection.insert_one({'token_jti': 'elsewhere', 'expiration_date': now + timedelta(days=1)})
+    assert not await token_blacklist_cache.is_revoked(collection, 'elsewhere', max_age=60)
+    assert await token_blacklist_cache.is_revoked(collection, 'elsewhere', max_age=0)
+
+
+@mark.asyncio
+async def test_token_blacklist_cache_refreshes_once_for_queued_requests(override_get_db: Callable, monkeypatch):
+    from src.infrastructure.database.models.token import TokenBlacklistDatabaseHandler
+
+    collection = override_get_db().tokens_blacklist
+    refreshes = []
+    get_blacklisted_tokens = TokenBlacklistDatabaseHandler.get_blacklisted_tokens
+
+    async def counting_get_blacklisted_tokens(collection, now, inserted_after):
+        refreshes.append(inserted_after)
+        # mongomock answers without yielding, a real query lets other requests in
+        await sleep(0)
+        return await get_blacklisted_tokens(collection, now, inserted_after)
+
+    monkeypatch.setattr(TokenBlacklistDatabaseHandler, 'get_blacklisted_tokens', counting_get_blacklisted_tokens)
+    await gather(*(token_blacklist_cache.is_revoked(collection, 'revoked', max_age=60) for _ in range(5)))
+    assert len(refreshes) == 1
 
 
 @mark.asyncio
@@ -122,3 +167,40 @@ async def test_register_with_existing_user(
     assert response.json() == {
         'detail': f'Taki użytkownik już istnieje.'
     }
+
+
+@mark.asyncio
+async def test_register_queues_verification_email(async_client: AsyncClient, override_get_db: Callable):
+    from src.main import app
+    from src.infrastructure.config.app_config import get_settings
+
+    settings = get_settings().copy(update={'EMAIL_HOST': 'localhost'})
+    app.dependency_overrides[get_settings] = lambda: settings
+    data = {
+        'username': 'new_user',
+        'email': 'new.user@gmail.com',
+        'password': TEST_PASSWORD_FIXTURE
+    }
+    response = await async_client.post('/auth/register', json=data)
+    app.dependency_overrides.pop(get_settings)
+    assert response.status_code == 201
+
+    email = await override_get_db().email_queue.find_one({})
+    assert email['template'] == 'verification'
+    assert email['recipients'] == ['new.user@gmail.com']
+    assert email['context']['first_name'] == 'new_user'
+    assert '/auth/verify_email/' in email['context']['url']
+
+
+@mark.asyncio
+async def test_register_without_mail_server(async_client: AsyncClient, override_get_db: Callable):
+    data = {
+        'username': 'new_user',
+        'email': 'new.user@gmail.com',
+        'password': TEST_PASSWORD_FIXTURE
+    }
+    response = await async_client.post('/auth/register', json=data)
+    assert response.status_code == 500
+    assert response.json() == {'detail': 'Błąd przy wysyłaniu maila.'}
+    assert not await override_get_db().users.find_one({'username': 'new_user'})
+    assert not await override_get_db().email_queue.count_documents({})
@@ -0,0 +1,98 @@
+from pytest import mark
+from asyncio import gather, sleep
+from pytest_asyncio import fixture
+from mongomock_motor import AsyncMongoMockDatabase
+
+from src.infrastructure.alcohol.alcohol_mappers import map_alcohols, map_alcohol_with_fields
+from src.infrastructure.database.models.alcohol_category import AlcoholCategoryDatabaseHandler
+from src.infrastructure.alcohol.category_cache import AlcoholCategoryCache, compile_category_fields
+
+
+@mark.asyncio
+async def test_category_cache_serves_categories_until_invalidated(mongodb):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_categories
+    cache = AlcoholCategoryCache()
+
+    category = await cache.get(collection, 'piwo')
+    assert category['title'] == 'piwo'
+
+    await collection.update_one({'title': 'piwo'}, {'$set': {'properties.extra': {'title': 'dodatek'}}})
+    assert 'extra' not in (await cache.get(collection, 'piwo'))['properties']
+
+    cache.invalidate()
+    assert 'extra' in (await cache.get(collection, 'piwo'))['properties']
+
+
+@mark.asyncio
+async def test_category_cache_reloads_on_unknown_title(mongodb):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_categories
+    cache = AlcoholCategoryCache()
+    await cache.get_all(collection)
+
+    await collection.insert_one({'title': 'sake', 'properties': {'kind': {'title': 'rodzaj'}}})
+    assert (await cache.get(collection, 'sake'))['title'] == 'sake'
+    assert await cache.get(collection, 'unknown') is None
+
+
+@fixture
+def category_loads(monkeypatch) -> list:
+    loads = []
+    get_all_categories = AlcoholCategoryDatabaseHandler.get_all_categories
+
+    async def counting_get_all_categories(collection):
+        loads.append(collection)
+        # mongomock answers without yielding, a real query lets other requests in
+        await sleep(0)
+        return await get_all_categories(collection)
+
+    monkeypatch.setattr(AlcoholCategoryDatabaseHandler, 'get_all_categories', counting_get_all_categories)
+    return loads
+
+
+@mark.asyncio
+async def test_category_cache_loads_once_for_concurrent_requests(mongodb, category_loads: list):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_categories
+    cache = AlcoholCategoryCache()
+
+    results = await gather(*(cache.get(collection, 'piwo') for _ in range(10)))
+    assert all(category['title'] == 'piwo' for category in results)
+    assert len(category_loads) == 1
+
+
+@mark.asyncio
+async def test_category_cache_reloads_for_unknown_titles_at_most_once_per_interval(mongodb, category_loads: list):
+    collection = AsyncMongoMockDatabase(mongodb).alcohol_categories
+    cache = AlcoholCategoryCache()
+    await cache.get_all(collection)
+
+    await gather(*(cache.get(collection, f'unknown_{number}') for number in range(10)))
+    assert await cache.get_many(collection, {'piwo', 'unknown'}) == {'piwo': await cache.get(collection, 'piwo')}
+    assert len(category_loads) == 2
+
+
+@mark.asyncio
+async def test_map_alcohols_uses_cached_categories(mongodb):
+    database = AsyncMongoMockDatabase(mongodb)
+    alcohols = await database.alcohols.find({}).to_list(None)
+    await map_alcohols([alcohol.copy() for alcohol in alcohols], database.alcohol_categories)
+
+    await database.alcohol_categories.drop()
+    mapped = await map_alcohols(alcohols, database.alcohol_categories)
+    assert len(mapped) == len(alcohols)
+    assert all('additional_properties' in alcohol for alcohol in mapped)
+
+
+def test_compile_category_fields_skips_kind():
+    category = {
+        'title': 'piwo',
+        'properties': {'kind': {'title': 'kategoria'}, 'ibu': {'title': 'IBU'}, 'srm': {'title': 'SRM'}}
+    }
+    fields = compile_category_fields(category)
+    assert fields == (('ibu', 'IBU'), ('srm', 'SRM'))
+
+    alcohol = map_alcohol_with_fields({'name': 'test', 'kind': 'piwo', 'ibu': 20}, fields)
+    assert 'ibu' not in alcohol
+    assert alcohol['additional_properties'] == [
+        {'name': 'ibu', 'display_name': 'IBU', 'value': 20},
+        {'name': 'srm', 'display_name': 'SRM', 'value': None}
+    ]
@@ -0,0 +1,117 @@
+from asyncio import gather
+from httpx import AsyncClient
+from pytest import mark, raises
+from pymongo.monitoring import PoolCreatedEvent, ConnectionCreatedEvent, ConnectionCheckedInEvent, \
+    ConnectionCheckedOutEvent, ConnectionCheckOutStartedEvent, ConnectionCheckOutFailedEvent, \
+    ConnectionCheckOutFailedReason
+
+from src.infrastructure.auth.password_hasher import PasswordHasher
+from src.infrastructure.database.pool_monitor import ConnectionPoolMonitor
+from src.infrastructure.database.database_config import get_db, connect, disconnect
+from src.infrastructure.exceptions.auth_exceptions import AuthenticationOverloadedException
+
+
+@mark.asyncio
+async def test_get_database_status(async_client: AsyncClient):
+    response = await async_client.get('/health/db')
+    assert response.status_code == 200
+    assert response.json() == {'status': 'ok'}
+
+
+@mark.asyncio
+@mark.parametrize('path', ['/health/db/pools', '/health/caches', '/health/auth', '/health/screening', '/health/mail'])
+async def test_worker_health_requires_admin(async_client: AsyncClient, user_token_headers: dict[str, str], path: str):
+    assert (await async_client.get(path)).status_code == 401
+    assert (await async_client.get(path, headers=user_token_headers)).status_code == 403
+
+
+@mark.asyncio
+async def test_get_database_health(async_client: AsyncClient, admin_token_headers: dict[str, str]):
+    from src.main import app
+    from src.infrastructure.database.database_config import get_pool_monitor
+
+    monitor = ConnectionPoolMonitor()
+    address = ('localhost', 27017)
+    app.dependency_overrides[get_pool_monitor] = lambda: monitor
+    try:
+        monitor.pool_created(PoolCreatedEvent(address, {'maxPoolSize': 10, 'minPoolSize': 2}))
+        for connection_id in (1, 2):
+            monitor.connection_created(ConnectionCreatedEvent(address, connection_id))
+        # a query in flight holds one connection while another one waits for it
+        monitor.connection_check_out_started(ConnectionCheckOutStartedEvent(address))
+        monitor.connection_checked_out(ConnectionCheckedOutEvent(address, 1))
+        monitor.connection_check_out_started(ConnectionCheckOutStartedEvent(address))
+
+        response = await async_client.get('/health/db/pools', headers=admin_token_headers)
+        assert response.status_code == 200
+        response = response.json()
+        assert response['status'] == 'ok'
+        assert response['pools'] == [{
+            'address': 'localhost:27017',
+            'max_pool_size': 10,
+            'min_pool_size': 2,
+            'open_connections': 2,
+            'in_use': 1,
+            'available': 1,
+            'waiting': 1,
+            'wait_queue_timeouts': 0,
+            'saturation': 0.1
+        }]
+
+        monitor.connection_checked_in(ConnectionCheckedInEvent(address, 1))
+        monitor.connection_check_out_failed(
+            ConnectionCheckOutFailedEvent(address, ConnectionCheckOutFailedReason.TIMEOUT)
+        )
+        pool = (await async_client.get('/health/db/pools', headers=admin_token_headers)).json()['pools'][0]
+        assert (pool['in_use'], pool['waiting'], pool['wait_queue_timeouts'], pool['saturation']) == (0, 0, 1, 0.0)
+    finally:
+        app.dependency_overrides.pop(get_pool_monitor)
+
+
+def test_get_db_requires_connecting_on_startup():
+    with raises(RuntimeError):
+        get_db()
+    connect()
+    try:
+        assert get_db().name == 'alkoholove'
+    finally:
+        disconnect()
+
+
+@mark.asyncio
+async def test_get_caches_health(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        admin_token_headers: dict[str, str]
+):
+    for _ in range(3):
+        assert (await async_client.get('/me/wishlist', headers=user_token_headers)).status_code == 200
+    response = await async_client.get('/health/caches', headers=admin_token_headers)
+    assert response.status_code == 200
+    users = next(cache for cache in response.json() if cache['name'] == 'users')
+    # the user and the admin asking for the report
+    assert users['size'] == 2
+    assert users['misses'] == 2
+    assert users['hits'] == 2
+
+
+@mark.asyncio
+async def test_get_auth_health(async_client: AsyncClient, admin_token_headers: dict[str, str]):
+    response = await async_client.get('/health/auth', headers=admin_token_headers)
+    assert response.status_code == 200
+    response = response.json()
+    assert response['logins'] >= 1
+    assert response['in_flight'] == 0
+    assert response['login_latency_max_ms'] > 0
+
+
+@mark.asyncio
+async def test_password_hasher_rejects_over_queue_limit():
+    hasher = PasswordHasher(pool_size=1, queue_limit=1)
+    try:
+        results = await gather(*(hasher.hash('JanJan123') for _ in range(3)), return_exceptions=True)
+        assert [type(result) for result in results].count(AuthenticationOverloadedException) == 1
+        assert hasher.stats().rejected == 1
+        assert await hasher.verify('JanJan123', await hasher.hash('JanJan123'))
+    finally:
+        hasher.shutdown()
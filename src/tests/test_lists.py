@@ -1,6 +1,12 @@
 from pytest import mark
+from bson import ObjectId
+from typing import Callable
 from httpx import AsyncClient
+from datetime import datetime, timedelta
+from mongomock_motor import AsyncMongoMockDatabase
 
+from src.migrations.dangling_list_alcohols import migrate
+from src.infrastructure.database.models.user_list.search_history_database_handler import SearchHistoryHandler
 from src.tests.response_fixtures.list_fixtures import WISHLIST_FIXTURE, FAVOURITES_FIXTURE, SEARCH_HISTORY_FIXTURE
 
 
@@ -63,3 +69,116 @@ async def test_get_guest_list(
     assert response['page_info']['limit'] == 10
     assert response['page_info']['offset'] == 0
     assert response['alcohols'] == FAVOURITES_FIXTURE
+
+
+@mark.asyncio
+async def test_get_wishlist_page_keeps_list_order(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str]
+):
+    await async_client.delete('/me/wishlist/6288e32dd5ab6070dde8db8a', headers=user_token_headers)
+    await async_client.post('/me/wishlist/6288e32dd5ab6070dde8db8a', headers=user_token_headers)
+    response = await async_client.get('/list/wishlist/6288e2fdd5ab6070dde8db8c?limit=2&offset=1')
+    assert response.status_code == 200
+    response = response.json()
+    assert [alcohol['id'] for alcohol in response['alcohols']] == [
+        '6288e32dd5ab6070dde8db8c', '6288e32dd5ab6070dde8db8a'
+    ]
+    assert response['page_info']['total'] == 3
+
+
+@mark.asyncio
+async def test_get_wishlist_skips_deleted_alcohols(async_client: AsyncClient, override_get_db: Callable):
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    deleted_id = ObjectId()
+    await override_get_db().user_wishlist.update_one(
+        {'user_id': user_id}, {'$push': {'alcohols': {'$each': [deleted_id], '$position': 0}}}
+    )
+    response = await async_client.get('/list/wishlist/6288e2fdd5ab6070dde8db8c')
+    assert response.status_code == 200
+    response = response.json()
+    assert response['alcohols'] == WISHLIST_FIXTURE
+    assert response['page_info']['total'] == 3
+    # reads never write, the migration removes the id
+    assert deleted_id in (await override_get_db().user_wishlist.find_one({'user_id': user_id}))['alcohols']
+
+
+@mark.asyncio
+async def test_migrate_dangling_list_alcohols(async_client: AsyncClient, override_get_db: Callable):
+    db = override_get_db()
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    deleted_ids = [ObjectId(), ObjectId()]
+    for collection in (db.user_wishlist, db.user_favourites, db.user_tags):
+        await collection.update_one({'user_id': user_id}, {'$push': {'alcohols': {'$each': deleted_ids}}})
+    await db.user_search_history.update_one({'user_id': user_id}, {'$push': {'alcohols': {
+        '$each': [{'alcohol_id': alcohol_id, 'search_date': datetime.now()} for alcohol_id in deleted_ids]
+    }}})
+
+    assert await migrate(db, batch_size=1) == 8
+    assert await migrate(db, batch_size=1) == 0
+    user = await db.users.find_one({'_id': user_id})
+    assert (user['wishlist_count'], user['favourites_count']) == (3, 2)
+    response = (await async_client.get('/list/favourites/6288e2fdd5ab6070dde8db8c')).json()
+    assert response['page_info']['total'] == 2
+    response = (await async_client.get('/list/search_history/6288e2fdd5ab6070dde8db8c')).json()
+    assert response['page_info']['total'] == 2
+
+
+@mark.asyncio
+async def test_search_history_is_capped_newest_first(mongodb):
+    db = AsyncMongoMockDatabase(mongodb)
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    alcohol_ids = [ObjectId('6288e32dd5ab6070dde8db8c'), ObjectId('6288e32dd5ab6070dde8db8a')]
+    for alcohol_id in alcohol_ids:
+        await SearchHistoryHandler.add_alcohol_to_search_history(
+            db.user_search_history, user_id, alcohol_id, max_length=2
+        )
+
+    search_history = await db.user_search_history.find_one({'user_id': user_id})
+    assert [item['alcohol_id'] for item in search_history['alcohols']] == alcohol_ids[::-1]
+    entries, total = await SearchHistoryHandler.get_user_search_history_user_id(
+        1, 1, db.user_search_history, db.alcohols, user_id
+    )
+    assert total == 2
+    assert [entry.alcohol.id for entry in entries] == [str(alcohol_ids[0])]
+
+
+@mark.asyncio
+async def test_search_history_moves_searched_again_alcohol_to_front(mongodb):
+    db = AsyncMongoMockDatabase(mongodb)
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    first, second = ObjectId('6288e32dd5ab6070dde8db8c'), ObjectId('6288e32dd5ab6070dde8db8a')
+    stored = [item['alcohol_id'] for item in (await db.user_search_history.find_one({'user_id': user_id}))['alcohols']]
+    for alcohol_id in (first, second, first):
+        await SearchHistoryHandler.add_alcohol_to_search_history(
+            db.user_search_history, user_id, alcohol_id, max_length=5
+        )
+
+    search_history = await db.user_search_history.find_one({'user_id': user_id})
+    expected = [first, second] + [alcohol_id for alcohol_id in stored if alcohol_id not in (first, second)]
+    assert [item['alcohol_id'] for item in search_history['alcohols']] == expected[:5]
+
+
+@mark.asyncio
+async def test_merge_into_search_history_keeps_newest_first(mongodb):
+    db = AsyncMongoMockDatabase(mongodb)
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    day = datetime(2022, 6, 1)
+    stored = [ObjectId() for _ in range(4)]
+    await db.user_search_history.update_one({'user_id': user_id}, {'$set': {'alcohols': [
+        {'alcohol_id': alcohol_id, 'search_date': day - timedelta(days=2 * index)}
+        for index, alcohol_id in enumerate(stored)
+    ]}})
+    search_dates = {
+        stored[2]: day + timedelta(days=1),
+        ObjectId(): day - timedelta(days=3),
+        ObjectId(): day - timedelta(days=10)
+    }
+
+    await SearchHistoryHandler.merge_into_search_history(db.user_search_history, user_id, search_dates, max_length=5)
+
+    expected = {alcohol_id: day - timedelta(days=2 * index) for index, alcohol_id in enumerate(stored)}
+    expected.update(search_dates)
+    expected = sorted(expected.items(), key=lambda item: item[1], reverse=True)[:5]
+    search_history = await db.user_search_history.find_one({'user_id': user_id})
+    assert [(item['alcohol_id'], item['search_date']) for item in search_history['alcohols']] == expected
@@ -0,0 +1,130 @@
+from time import monotonic
+from httpx import AsyncClient
+from pytest import mark, raises
+from pytest_asyncio import fixture
+from pymongo.errors import PyMongoError
+from typing import Callable, AsyncGenerator
+from asyncio import sleep, create_task, CancelledError
+
+from src.infrastructure.email.smtp_sink import SmtpSink
+from src.infrastructure.email.mail_queue import mail_queue
+from src.infrastructure.email.mail_sender import MailSender
+from src.infrastructure.config.app_config import get_settings
+
+RECIPIENTS_FIXTURE = ['adam.skorupa@gmail.com']
+CONTEXT_FIXTURE = {'url': 'http://test/auth/verify_email/00', 'first_name': 'Adam_Skorupa'}
+
+
+@fixture
+async def smtp_sink() -> AsyncGenerator:
+    sink = SmtpSink()
+    port = await sink.start()
+    sender = MailSender(get_settings().copy(update={
+        'EMAIL_HOST': '127.0.0.1', 'EMAIL_PORT': port, 'EMAIL_START_TLS': False, 'EMAIL_FROM': 'info@alkoholove.com.pl'
+    }))
+    yield sink, sender
+    await sender.close()
+    await sink.close()
+
+
+@mark.asyncio
+async def test_queued_emails_are_sent_over_one_connection(override_get_db: Callable, smtp_sink):
+    sink, sender = smtp_sink
+    db = override_get_db()
+    await mail_queue.enqueue(db.email_queue, 'verification', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+    await mail_queue.enqueue(db.email_queue, 'reset_password', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+
+    assert await mail_queue.run_once(db, sender, 10, 60, 5, 0) == 2
+    assert not await db.email_queue.count_documents({})
+    assert [message['Subject'] for message in sink.messages] == [
+        'AlkohoLove email verification', 'AlkohoLove password reset request'
+    ]
+    assert sink.messages[0]['To'] == 'adam.skorupa@gmail.com'
+    assert CONTEXT_FIXTURE['url'] in sink.messages[0].get_content()
+    assert sink.connections == 1
+    assert mail_queue.sent == 2
+
+
+@mark.asyncio
+async def test_queued_emails_are_rate_limited(override_get_db: Callable, smtp_sink):
+    _, sender = smtp_sink
+    db = override_get_db()
+    for _ in range(3):
+        await mail_queue.enqueue(db.email_queue, 'verification', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+
+    started_at = monotonic()
+    await mail_queue.run_once(db, sender, 10, 60, 5, 20)
+    assert monotonic() - started_at >= 0.1
+
+
+@mark.asyncio
+async def test_failed_email_is_retried_then_dead_lettered(override_get_db: Callable, smtp_sink):
+    sink, sender = smtp_sink
+    db = override_get_db()
+    await sink.close()
+    await mail_queue.enqueue(db.email_queue, 'delete_account', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+
+    assert await mail_queue.run_once(db, sender, 10, 60, 2, 0) == 1
+    email = await db.email_queue.find_one({})
+    assert email['attempts'] == 1
+    assert await mail_queue.run_once(db, sender, 10, 60, 2, 0) == 0
+
+    await db.email_queue.update_one({'_id': email['_id']}, {'$set': {'available_at': email['created_at']}})
+    await mail_queue.run_once(db, sender, 10, 60, 2, 0)
+    assert not await db.email_queue.count_documents({})
+    dead_letter = await db.email_queue_dead_letters.find_one({})
+    assert dead_letter['template'] == 'delete_account'
+    assert 'context' not in dead_letter
+    assert (mail_queue.failed, mail_queue.dead_lettered) == (2, 1)
+
+
+@mark.asyncio
+async def test_unrenderable_email_is_dead_lettered_without_stopping_the_batch(override_get_db: Callable, smtp_sink):
+    sink, sender = smtp_sink
+    db = override_get_db()
+    await mail_queue.enqueue(db.email_queue, 'unknown', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+    await mail_queue.enqueue(db.email_queue, 'verification', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+
+    assert await mail_queue.run_once(db, sender, 10, 60, 5, 0) == 2
+    assert not await db.email_queue.count_documents({})
+    assert (await db.email_queue_dead_letters.find_one({}))['template'] == 'unknown'
+    assert [message['Subject'] for message in sink.messages] == ['AlkohoLove email verification']
+    assert (mail_queue.sent, mail_queue.dead_lettered) == (1, 1)
+
+
+@mark.asyncio
+async def test_mail_queue_worker_survives_unexpected_errors(override_get_db: Callable, smtp_sink, monkeypatch):
+    _, sender = smtp_sink
+    db = override_get_db()
+
+    async def lost_connection(db, batch_size, lease):
+        raise PyMongoError('connection lost')
+
+    monkeypatch.setattr(mail_queue, 'claim', lost_connection)
+    settings = get_settings().copy(update={'EMAIL_QUEUE_INTERVAL': 0, 'EMAIL_RATE_LIMIT': 0})
+
+    worker = create_task(mail_queue.run(db, sender, settings))
+    await sleep(0.05)
+    assert not worker.done()
+    assert mail_queue.running
+    worker.cancel()
+    with raises(CancelledError):
+        await worker
+    assert not mail_queue.running
+
+
+@mark.asyncio
+async def test_mail_queue_health(
+        async_client: AsyncClient,
+        admin_token_headers: dict[str, str],
+        override_get_db: Callable
+):
+    await mail_queue.enqueue(override_get_db().email_queue, 'verification', RECIPIENTS_FIXTURE, CONTEXT_FIXTURE)
+
+    assert (await async_client.get('/health/mail', headers=admin_token_headers)).json() == {
+        'pending': 1,
+        'dead_letters': 0,
+        'sent': 0,
+        'failed': 0,
+        'dead_lettered': 0
+    }
@@ -1,8 +1,18 @@
-from pytest import mark
+from bson import ObjectId
+from typing import Callable
 from datetime import datetime
 from httpx import AsyncClient
+from pytest import mark, raises
+from pymongo.errors import PyMongoError
+from asyncio import sleep, create_task, CancelledError
 
+from src.infrastructure.config.app_config import get_settings
+from src.infrastructure.socials.social_graph import EmbeddedSocialGraph
+from src.infrastructure.database.models.review import ReviewDatabaseHandler
 from src.tests.response_fixtures.followers_fixtures import FOLLOWERS_FIXTURE, FOLLOWING_FIXTURE
+from src.infrastructure.user.account_deletion import (
+    schedule_account_deletion, run_account_deletion, resume_account_deletions, run_account_deletions
+)
 from src.tests.response_fixtures.list_fixtures import WISHLIST_FIXTURE, FAVOURITES_FIXTURE, SEARCH_HISTORY_FIXTURE
 
 
@@ -56,6 +66,116 @@ async def test_delete_self(
     assert response.status_code == 307
 
 
+@mark.asyncio
+async def test_delete_self_removes_account_data(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        override_get_db: Callable
+):
+    db = override_get_db()
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    alcohol_ids = [ObjectId('6288e32dd5ab6070dde8db8a'), ObjectId('6288e32dd5ab6070dde8db8b')]
+    before = {alcohol['_id']: alcohol async for alcohol in db.alcohols.find({'_id': {'$in': alcohol_ids}})}
+    response = await async_client.get('/me/delete_account/f983e96fba88ce5523e9', headers=user_token_headers)
+    assert response.status_code == 307
+    assert not await db.users.find_one({'_id': user_id})
+    assert not await db.account_deletions.find_one({'_id': user_id})
+    assert not await db.reviews.count_documents({'user_id': user_id})
+    assert not await db.user_wishlist.count_documents({'user_id': user_id})
+    assert not await db.following.count_documents({'_id': user_id})
+    async for alcohol in db.alcohols.find({'_id': {'$in': alcohol_ids}}):
+        assert alcohol['rate_count'] == before[alcohol['_id']]['rate_count'] - 1
+        assert alcohol['rate_value'] == before[alcohol['_id']]['rate_value'] - 5
+        assert alcohol['rate_5_count'] == before[alcohol['_id']]['rate_5_count'] - 1
+
+
+@mark.asyncio
+async def test_resume_account_deletion(override_get_db: Callable):
+    db = override_get_db()
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    await schedule_account_deletion(db, user_id)
+    await db.account_deletions.update_one({'_id': user_id}, {'$set': {'step': 'reviews'}})
+    await resume_account_deletions(db, EmbeddedSocialGraph(), batch_size=1, lease=60)
+    assert not await db.users.find_one({'_id': user_id})
+    assert not await db.reviews.count_documents({'user_id': user_id})
+    assert not await db.account_deletions.count_documents({})
+    # steps finished before the interruption are not run again
+    assert await db.user_wishlist.count_documents({'user_id': user_id})
+
+
+@mark.asyncio
+async def test_pending_account_deletion_locks_user_out(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        override_get_db: Callable
+):
+    await schedule_account_deletion(override_get_db(), ObjectId('6288e2fdd5ab6070dde8db8c'))
+
+    response = await async_client.get('/me', headers=user_token_headers)
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Brak dostępu. Konto jest w trakcie usuwania.'
+    response = await async_client.post('/auth/token', data={'username': 'Adam_Skorupa', 'password': 'JanJan123'})
+    assert response.status_code == 401
+
+
+@mark.asyncio
+async def test_failed_account_deletion_is_retried(override_get_db: Callable, monkeypatch):
+    db = override_get_db()
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    delete_reviews_by_ids = ReviewDatabaseHandler.delete_reviews_by_ids
+
+    async def crash(collection, review_ids):
+        monkeypatch.setattr(ReviewDatabaseHandler, 'delete_reviews_by_ids', delete_reviews_by_ids)
+        raise PyMongoError('connection lost')
+
+    monkeypatch.setattr(ReviewDatabaseHandler, 'delete_reviews_by_ids', crash)
+    await schedule_account_deletion(db, user_id)
+    assert not await run_account_deletion(db, EmbeddedSocialGraph(), user_id, batch_size=1, lease=60)
+    assert await db.users.find_one({'_id': user_id})
+
+    settings = get_settings().copy(update={'ACCOUNT_DELETION_INTERVAL': 0})
+    worker = create_task(run_account_deletions(db, EmbeddedSocialGraph(), settings))
+    await sleep(0.05)
+    worker.cancel()
+    with raises(CancelledError):
+        await worker
+    assert not await db.users.find_one({'_id': user_id})
+    assert not await db.account_deletions.count_documents({})
+
+
+@mark.asyncio
+async def test_interrupted_review_batch_removes_ratings_once(override_get_db: Callable, monkeypatch):
+    db = override_get_db()
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    alcohol_ids = [ObjectId('6288e32dd5ab6070dde8db8a'), ObjectId('6288e32dd5ab6070dde8db8b')]
+    before = {alcohol['_id']: alcohol async for alcohol in db.alcohols.find({'_id': {'$in': alcohol_ids}})}
+    change_rating = ReviewDatabaseHandler.change_rating
+
+    async def crash(collection, document_id, counters):
+        # the first alcohol of the batch is updated, the connection is lost before the second
+        monkeypatch.setattr(ReviewDatabaseHandler, 'change_rating', lost)
+        await change_rating(collection, document_id, counters)
+
+    async def lost(collection, document_id, counters):
+        monkeypatch.setattr(ReviewDatabaseHandler, 'change_rating', change_rating)
+        raise PyMongoError('connection lost')
+
+    monkeypatch.setattr(ReviewDatabaseHandler, 'change_rating', crash)
+    await schedule_account_deletion(db, user_id)
+    await db.account_deletions.update_one({'_id': user_id}, {'$set': {'step': 'reviews'}})
+    assert not await run_account_deletion(db, EmbeddedSocialGraph(), user_id, batch_size=2, lease=60)
+    batch = (await db.account_deletions.find_one({'_id': user_id}))['batch']
+    assert len(batch['ratings']) == 2 and batch['applied'] == [batch['ratings'][0]['alcohol_id']]
+    await resume_account_deletions(db, EmbeddedSocialGraph(), batch_size=2, lease=60)
+
+    assert not await db.account_deletions.count_documents({})
+    assert not await db.reviews.count_documents({'user_id': user_id})
+    async for alcohol in db.alcohols.find({'_id': {'$in': alcohol_ids}}):
+        assert alcohol['rate_count'] == before[alcohol['_id']]['rate_count'] - 1
+        assert alcohol['rate_5_count'] == before[alcohol['_id']]['rate_5_count'] - 1
+        assert alcohol.keys() == before[alcohol['_id']].keys()
+
+
 @mark.asyncio
 async def test_get_wishlist(
         async_client: AsyncClient,
@@ -275,6 +395,23 @@ async def test_delete_non_existing_user_from_following(
     assert response['detail'] == 'Nie znaleziono użytkownika.'
 
 
+@mark.asyncio
+async def test_follow_and_unfollow_with_edges(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        edge_social_graph: None
+):
+    response = await async_client.post('/me/following/6288e2fdd5ab6070dde8db8e', headers=user_token_headers)
+    assert response.status_code == 201
+    response = await async_client.post('/me/following/6288e2fdd5ab6070dde8db8e', headers=user_token_headers)
+    assert response.status_code == 400
+    response = await async_client.delete('/me/following/6288e2fdd5ab6070dde8db8d', headers=user_token_headers)
+    assert response.status_code == 204
+    response = (await async_client.get('/me/following', headers=user_token_headers)).json()
+    assert response['page_info']['total'] == 2
+    assert [user['id'] for user in response['users']] == ['6288e2fdd5ab6070dde8db8b', '6288e2fdd5ab6070dde8db8e']
+
+
 @mark.asyncio
 async def test_migrate(
         async_client: AsyncClient,
@@ -290,6 +427,52 @@ async def test_migrate(
     assert response.status_code == 200
 
 
+@mark.asyncio
+async def test_migrate_merges_with_existing_data(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str]
+):
+    data = {
+        'wishlist': ['6288e32dd5ab6070dde8db8a', '6288e32dd5ab6070dde8db8e', '6288e32dd5ab6070dde8db8e'],
+        'favourites': ['6288e32dd5ab6070dde8db8e', '6288e32dd5ab6070dde8db8a'],
+        'search_history': [
+            {'alcohol_id': '6288e32dd5ab6070dde8db8c', 'date': '2022-05-01T10:00:00'},
+            {'alcohol_id': '6288e32dd5ab6070dde8db8c', 'date': '2022-01-01T10:00:00'}
+        ],
+        'tags': [{'tag_name': 'wakacje 2021', 'alcohols': ['6288e32dd5ab6070dde8db8a', '6288e32dd5ab6070dde8db8e']}]
+    }
+    response = await async_client.post('/me/migrate', headers=user_token_headers, json=data)
+    assert response.status_code == 200
+
+    response = (await async_client.get('/me/wishlist', headers=user_token_headers)).json()
+    assert response['page_info']['total'] == 4
+    response = (await async_client.get('/me/favourites', headers=user_token_headers)).json()
+    assert response['page_info']['total'] == 3
+    response = (await async_client.get('/me/search_history', headers=user_token_headers)).json()
+    assert [entry['alcohol']['id'] for entry in response['alcohols']] == [
+        '6288e32dd5ab6070dde8db8b', '6288e32dd5ab6070dde8db8c', '6288e32dd5ab6070dde8db8a'
+    ]
+    response = (await async_client.get('/me/tags/628f9071f32df3b39ced1a3b/alcohols', headers=user_token_headers)).json()
+    assert response['page_info']['total'] == 3
+
+
+@mark.asyncio
+async def test_migrate_with_invalid_id(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str]
+):
+    data = {
+        'wishlist': ['6288e32dd5ab6070dde8db8e'],
+        'favourites': [],
+        'search_history': [],
+        'tags': [{'tag_name': 'test_tag', 'alcohols': ['invalid']}]
+    }
+    response = await async_client.post('/me/migrate', headers=user_token_headers, json=data)
+    assert response.status_code == 400
+    response = (await async_client.get('/me/wishlist', headers=user_token_headers)).json()
+    assert response['page_info']['total'] == 3
+
+
 @mark.asyncio
 async def test_mark_review_as_helpful(
         async_client: AsyncClient,
@@ -1,5 +1,15 @@
-from pytest import mark
-from httpx import AsyncClient
+from bson import ObjectId
+from typing import Callable
+from datetime import datetime
+from pytest import mark, raises
+from pytest_asyncio import fixture
+from asyncio import gather, CancelledError
+from mongomock_motor import AsyncMongoMockDatabase
+from httpx import AsyncClient, Response, ReadTimeout
+
+from src.infrastructure.database.models.review import ReviewDatabaseHandler
+from src.infrastructure.hate_speech_detection.review_screening import review_screener
+from src.infrastructure.hate_speech_detection.hate_speech_detection_client import HateSpeechDetectionClient
 
 ALCOHOL_REVIEWS_FIXTURE = [
     {
@@ -612,3 +622,150 @@ async def test_get_reported_review_by_id(
     assert response.status_code == 200
     response = response.json()
     assert response == REPORTED_REVIEWS_FIXTURE[0]
+
+
+@mark.asyncio
+async def test_parallel_ratings_keep_exact_counters(mongodb):
+    db = AsyncMongoMockDatabase(mongodb)
+    alcohol_id = ObjectId('6288e32dd5ab6070dde8db8a')
+    user_id = ObjectId('6288e2fdd5ab6070dde8db8c')
+    alcohol = await db.alcohols.find_one({'_id': alcohol_id})
+    user = await db.users.find_one({'_id': user_id})
+    ratings = [rating % 5 + 1 for rating in range(300)]
+
+    await gather(*(
+        operation
+        for rating in ratings
+        for operation in (
+            ReviewDatabaseHandler.add_rating_to_alcohol(db.alcohols, alcohol_id, rating),
+            ReviewDatabaseHandler.add_rating_to_user(db.users, user_id, rating)
+        )
+    ))
+    await gather(*(ReviewDatabaseHandler.remove_rating_from_alcohol(db.alcohols, alcohol_id, 5) for _ in range(10)))
+
+    updated_alcohol = await db.alcohols.find_one({'_id': alcohol_id})
+    rate_count = alcohol['rate_count'] + len(ratings) - 10
+    rate_value = alcohol['rate_value'] + sum(ratings) - 50
+    assert updated_alcohol['rate_count'] == rate_count
+    assert updated_alcohol['rate_value'] == rate_value
+    assert updated_alcohol['rate_5_count'] == alcohol['rate_5_count'] + ratings.count(5) - 10
+    assert updated_alcohol['avg_rating'] == rate_value / rate_count
+
+    updated_user = await db.users.find_one({'_id': user_id})
+    assert updated_user['rate_count'] == user['rate_count'] + len(ratings)
+    assert updated_user['rate_value'] == user['rate_value'] + sum(ratings)
+    assert updated_user['avg_rating'] == updated_user['rate_value'] / updated_user['rate_count']
+
+
+@mark.mongod
+@mark.asyncio
+async def test_parallel_ratings_keep_exact_counters_on_mongod(mongod_db):
+    alcohol_id = ObjectId()
+    counters = {'rate_count': 0, 'rate_value': 0} | {f'rate_{rating}_count': 0 for rating in range(1, 6)}
+    await mongod_db.alcohols.insert_one({'_id': alcohol_id, 'avg_rating': 0.0} | counters)
+    ratings = [rating % 5 + 1 for rating in range(300)]
+
+    await gather(*(
+        ReviewDatabaseHandler.add_rating_to_alcohol(mongod_db.alcohols, alcohol_id, rating) for rating in ratings
+    ))
+    await gather(*(
+        ReviewDatabaseHandler.remove_rating_from_alcohol(mongod_db.alcohols, alcohol_id, 5) for _ in range(10)
+    ))
+
+    alcohol = await mongod_db.alcohols.find_one({'_id': alcohol_id})
+    assert alcohol['rate_count'] == len(ratings) - 10
+    assert alcohol['rate_value'] == sum(ratings) - 50
+    assert alcohol['rate_5_count'] == ratings.count(5) - 10
+    assert alcohol['avg_rating'] == alcohol['rate_value'] / alcohol['rate_count']
+
+
+@fixture
+def running_review_screener(monkeypatch):
+    # reviews are only queued while the screening worker runs
+    monkeypatch.setattr(review_screener, 'running', True)
+
+
+@fixture
+def hate_speech_client(mock_http_client: tuple[AsyncClient, list, list]) -> tuple[HateSpeechDetectionClient, list]:
+    http_client, responses, _ = mock_http_client
+    return HateSpeechDetectionClient('http://detector', http_client), responses
+
+
+@mark.asyncio
+async def test_created_review_is_screened_in_background(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        admin_token_headers: dict[str, str],
+        override_get_db: Callable,
+        hate_speech_client: tuple[HateSpeechDetectionClient, list],
+        running_review_screener: None
+):
+    db = override_get_db()
+    response = await async_client.post(
+        '/me/reviews/6288e32dd5ab6070dde8db8e', json={'review': 'test', 'rating': 4}, headers=user_token_headers
+    )
+    assert response.status_code == 201
+    review = await db.reviews.find_one({'alcohol_id': ObjectId('6288e32dd5ab6070dde8db8e')})
+    assert review['report_count'] == 0
+    assert (await async_client.get('/health/screening', headers=admin_token_headers)).json()['pending'] == 1
+
+    client, responses = hate_speech_client
+    responses.append(Response(200, json=True))
+    assert await review_screener.run_once(db, client, batch_size=10, lease=60, max_attempts=3) == 1
+    assert (await db.reviews.find_one({'_id': review['_id']}))['report_count'] == 50
+    assert (await async_client.get('/health/screening', headers=admin_token_headers)).json() == {
+        'pending': 0, 'dead_letters': 0, 'screened': 1, 'flagged': 1, 'failed': 0, 'dead_lettered': 0
+    }
+
+
+@mark.asyncio
+async def test_failed_screening_is_retried_then_dead_lettered(
+        override_get_db: Callable,
+        hate_speech_client: tuple[HateSpeechDetectionClient, list],
+        running_review_screener: None
+):
+    db = override_get_db()
+    review_id = ObjectId('62964f8f12ce37ef94d3cbaa')
+    await review_screener.enqueue(db, review_id, 'Pyszniutkie polecam')
+    client, responses = hate_speech_client
+    responses.extend([Response(503), ReadTimeout('timed out')])
+
+    assert await review_screener.run_once(db, client, batch_size=10, lease=60, max_attempts=2) == 1
+    job = await db.review_screening.find_one({'_id': review_id})
+    assert job['attempts'] == 1
+    # not due until the retry delay passes
+    assert await review_screener.run_once(db, client, batch_size=10, lease=60, max_attempts=2) == 0
+
+    await db.review_screening.update_one({'_id': review_id}, {'$set': {'available_at': datetime.utcnow()}})
+    assert await review_screener.run_once(db, client, batch_size=10, lease=60, max_attempts=2) == 1
+    assert not await db.review_screening.count_documents({})
+    dead_letter = await db.review_screening_dead_letters.find_one({'review_id': review_id})
+    assert dead_letter['attempts'] == 2
+    assert (await db.reviews.find_one({'_id': review_id}))['report_count'] == 0
+
+
+@mark.asyncio
+async def test_reviews_are_not_queued_without_screening_worker(override_get_db: Callable):
+    db = override_get_db()
+    await review_screener.enqueue(db, ObjectId('62964f8f12ce37ef94d3cbaa'), 'Pyszniutkie polecam')
+    assert not await db.review_screening.count_documents({})
+
+
+@mark.asyncio
+async def test_screening_worker_survives_unexpected_errors(override_get_db: Callable, monkeypatch):
+    from src.infrastructure.config.app_config import get_settings
+
+    calls = []
+
+    async def failing_run_once(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise KeyError('review')
+        raise CancelledError
+
+    monkeypatch.setattr(review_screener, 'run_once', failing_run_once)
+    settings = get_settings().copy(update={'REVIEW_SCREENING_INTERVAL': 0})
+    with raises(CancelledError):
+        await review_screener.run(override_get_db(), None, settings)
+    assert len(calls) == 2
+    assert not review_screener.running
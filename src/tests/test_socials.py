@@ -1,6 +1,8 @@
 from pytest import mark
+from typing import Callable
 from httpx import AsyncClient
 
+from src.migrations.follow_edges import migrate
 from src.tests.response_fixtures.followers_fixtures import FOLLOWERS_FIXTURE, FOLLOWING_FIXTURE, USERS_FIXTURE
 
 
@@ -106,3 +108,77 @@ async def test_get_user_info_that_not_exists(
     assert response.status_code == 404
     response = response.json()
     assert response['detail'] == 'Nie znaleziono użytkownika.'
+
+
+@mark.asyncio
+async def test_get_followers_from_edges(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        edge_social_graph: None
+):
+    response = await async_client.get('socials/followers/6288e2fdd5ab6070dde8db8c', headers=user_token_headers)
+    assert response.status_code == 200
+    response = response.json()
+    assert response['page_info']['total'] == 2
+    assert response['users'] == FOLLOWERS_FIXTURE
+
+
+@mark.asyncio
+async def test_get_followers_from_edges_by_cursor(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        edge_social_graph: None
+):
+    url = 'socials/followers/6288e2fdd5ab6070dde8db8b?limit=1&cursor='
+    response = (await async_client.get(url, headers=user_token_headers)).json()
+    assert response['page_info']['total'] == 3
+    user_ids = [user['id'] for user in response['users']]
+    while response['page_info']['next_cursor']:
+        response = await async_client.get(url + response['page_info']['next_cursor'], headers=user_token_headers)
+        response = response.json()
+        assert response['page_info']['total'] is None
+        user_ids.extend(user['id'] for user in response['users'])
+    assert user_ids == ['6288e2fdd5ab6070dde8db8c', '6288e2fdd5ab6070dde8db8d', '6288e2fdd5ab6070dde8db8e']
+
+
+@mark.asyncio
+async def test_get_followers_with_cursor_carrying_sort_value(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str]
+):
+    from bson import ObjectId
+    from src.infrastructure.common.cursor_utils import encode_cursor
+
+    cursor = encode_cursor({'$gt': ''}, ObjectId())
+    response = await async_client.get(
+        f'socials/followers/6288e2fdd5ab6070dde8db8b?limit=1&cursor={cursor}', headers=user_token_headers
+    )
+    assert response.status_code == 400
+    assert response.json() == {'detail': 'Nieprawidłowy kursor.'}
+
+
+@mark.asyncio
+async def test_search_following_from_edges(
+        async_client: AsyncClient,
+        user_token_headers: dict[str, str],
+        edge_social_graph: None
+):
+    response = await async_client.get(
+        'socials/search?search_type=following&phrase=Dar', headers=user_token_headers
+    )
+    assert response.status_code == 200
+    response = response.json()
+    assert response['page_info']['total'] == 1
+    assert [user['id'] for user in response['users']] == ['6288e2fdd5ab6070dde8db8d']
+
+
+@mark.asyncio
+async def test_migrate_follow_edges(override_get_db: Callable):
+    db = override_get_db()
+    expected = {
+        (edge['follower_id'], edge['followee_id']) async for edge in db.follows.find()
+    }
+    await db.follows.drop()
+    assert await migrate(db, batch_size=2) == len(expected)
+    assert await migrate(db, batch_size=2) == 0
+    assert {(edge['follower_id'], edge['followee_id']) async for edge in db.follows.find()} == expected